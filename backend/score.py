@@ -38,6 +38,7 @@ from dotenv import load_dotenv
 # Task 6: Package Management API imports
 from src.package_manager import PackageManager
 from src.package_versioning import PackageVersionManager, ChangeType
+from src.package_templates import MortgagePackageTemplates
 from src.entities.document_package import PackageCategory, PackageStatus
 load_dotenv(override=True)
 
@@ -122,6 +123,11 @@ if is_gemini_enabled:
 
 app.add_api_route("/health", health([healthy_condition, healthy]))
 
+@app.on_event("startup")
+async def warmup_caches():
+    """Populate template caches before the first request is served"""
+    MortgagePackageTemplates.warmup()
+
 
 
 @app.post("/url/scan")
@@ -1,6 +1,7 @@
 import logging
 import os
 import time
+from typing import Optional
 from neo4j.exceptions import TransientError
 from langchain_neo4j import Neo4jGraph
 from src.shared.common_fn import create_gcs_bucket_folder_name_hashed, delete_uploaded_local_file, load_embedding_model
@@ -675,6 +676,23 @@ class graphDBdataAccess:
             logging.error(f"Error retrieving package node: {str(e)}")
             raise Exception(f"Failed to retrieve package node: {str(e)}")
     
+    def get_package_current_version(self, package_id: str) -> Optional[str]:
+        """Retrieve only the current version of a DocumentPackage node"""
+        try:
+            query = """
+            MATCH (p:DocumentPackage {package_id: $package_id})
+            RETURN p.version as version
+            """
+            
+            params = {"package_id": package_id}
+            result = self.graph.query(query, params, session_params={"database": self.graph._database})
+            
+            return result[0].get("version") if result else None
+            
+        except Exception as e:
+            logging.error(f"Error retrieving package version: {str(e)}")
+            raise Exception(f"Failed to retrieve package version: {str(e)}")
+    
     def update_package_node(self, package_id: str, package_data: dict) -> bool:
         """Update a DocumentPackage node in Neo4j"""
         try:
@@ -2021,6 +2039,9 @@ class graphDBdataAccess:
             MATCH (p:DocumentPackage {package_id: $package_id})
             CREATE (v:PackageVersion {
                 version: $version,
+                major: $major,
+                minor: $minor,
+                patch: $patch,
                 change_type: $change_type,
                 changes: $changes,
                 created_at: $created_at,
@@ -2031,15 +2052,7 @@ class graphDBdataAccess:
             RETURN v.version as version
             """
             
-            params = {
-                "package_id": package_id,
-                "version": version_data.get("version"),
-                "change_type": version_data.get("change_type"),
-                "changes": json.dumps(version_data.get("changes", [])),
-                "created_at": version_data.get("created_at").isoformat() if version_data.get("created_at") else None,
-                "created_by": version_data.get("created_by"),
-                "metadata": json.dumps(version_data.get("metadata", {}))
-            }
+            params = self._version_record_params(package_id, version_data)
             
             result = self.graph.query(query, params, session_params={"database": self.graph._database})
             return len(result) > 0
@@ -2048,6 +2061,66 @@ class graphDBdataAccess:
             logging.error(f"Error creating version record: {str(e)}")
             raise Exception(f"Failed to create version record: {str(e)}")
     
+    def create_version_with_snapshot(self, package_id: str, version_data: dict, snapshot_data: bytes,
+                                     snapshot_created_at: str = None) -> bool:
+        """Create a version record and its package snapshot in a single query
+        
+        snapshot_data is the already encoded snapshot payload, stored as-is.
+        """
+        try:
+            logging.info(f"Creating version record with snapshot: {package_id} v{version_data.get('version', 'unknown')}")
+            
+            query = """
+            MATCH (p:DocumentPackage {package_id: $package_id})
+            CREATE (v:PackageVersion {
+                version: $version,
+                major: $major,
+                minor: $minor,
+                patch: $patch,
+                change_type: $change_type,
+                changes: $changes,
+                created_at: $created_at,
+                created_by: $created_by,
+                metadata: $metadata
+            })
+            CREATE (p)-[:VERSION_OF]->(v)
+            CREATE (s:PackageSnapshot {
+                package_id: $package_id,
+                version: $version,
+                snapshot_data: $snapshot_data,
+                created_at: $snapshot_created_at
+            })
+            CREATE (v)-[:SNAPSHOT]->(s)
+            RETURN v.version as version
+            """
+            
+            params = self._version_record_params(package_id, version_data)
+            params["snapshot_data"] = bytes(snapshot_data)
+            params["snapshot_created_at"] = snapshot_created_at
+            
+            result = self.graph.query(query, params, session_params={"database": self.graph._database})
+            return len(result) > 0
+            
+        except Exception as e:
+            logging.error(f"Error creating version record with snapshot: {str(e)}")
+            raise Exception(f"Failed to create version record with snapshot: {str(e)}")
+    
+    def _version_record_params(self, package_id: str, version_data: dict) -> dict:
+        """Build query parameters for a PackageVersion node"""
+        created_at = version_data.get("created_at")
+        return {
+            "package_id": package_id,
+            "version": version_data.get("version"),
+            "major": version_data.get("major"),
+            "minor": version_data.get("minor"),
+            "patch": version_data.get("patch"),
+            "change_type": version_data.get("change_type"),
+            "changes": json.dumps(version_data.get("changes", [])),
+            "created_at": created_at.isoformat() if hasattr(created_at, "isoformat") else created_at,
+            "created_by": version_data.get("created_by"),
+            "metadata": json.dumps(version_data.get("metadata", {}))
+        }
+    
     def get_version_history(self, package_id: str) -> list:
         """Get version history for a package"""
         try:
@@ -2061,7 +2134,9 @@ class graphDBdataAccess:
                    v.created_at as created_at,
                    v.created_by as created_by,
                    v.metadata as metadata
-            ORDER BY v.created_at DESC
+            ORDER BY coalesce(v.major, toInteger(split(v.version, '.')[0])) DESC,
+                     coalesce(v.minor, toInteger(split(v.version, '.')[1])) DESC,
+                     coalesce(v.patch, toInteger(split(v.version, '.')[2])) DESC
             """
             
             params = {"package_id": package_id}
@@ -2082,8 +2157,12 @@ class graphDBdataAccess:
 
     # Package Snapshot Methods
     
-    def create_package_snapshot(self, package_id: str, version: str, snapshot_data: dict) -> bool:
-        """Create a package snapshot for rollback"""
+    def create_package_snapshot(self, package_id: str, version: str, snapshot_data, created_at: str = None) -> bool:
+        """Create a package snapshot for rollback
+        
+        snapshot_data is either a snapshot dict, stored as JSON, or an already
+        encoded bytes payload, stored as-is.
+        """
         try:
             logging.info(f"Creating package snapshot: {package_id} v{version}")
             
@@ -2099,11 +2178,17 @@ class graphDBdataAccess:
             RETURN s
             """
             
+            if isinstance(snapshot_data, (bytes, bytearray)):
+                payload = bytes(snapshot_data)
+            else:
+                payload = json.dumps(snapshot_data)
+                created_at = created_at or snapshot_data.get("snapshot_created")
+            
             params = {
                 "package_id": package_id,
                 "version": version,
-                "snapshot_data": json.dumps(snapshot_data),
-                "created_at": snapshot_data.get("snapshot_created")
+                "snapshot_data": payload,
+                "created_at": created_at
             }
             
             result = self.graph.query(query, params, session_params={"database": self.graph._database})
@@ -2113,8 +2198,12 @@ class graphDBdataAccess:
             logging.error(f"Error creating package snapshot: {str(e)}")
             raise Exception(f"Failed to create package snapshot: {str(e)}")
     
-    def get_package_snapshot(self, package_id: str, version: str) -> dict:
-        """Get package snapshot for a specific version"""
+    def get_package_snapshot(self, package_id: str, version: str):
+        """Get package snapshot for a specific version
+        
+        JSON snapshots are returned as dicts; binary snapshots are returned as
+        bytes for the caller to decode.
+        """
         try:
             logging.info(f"Retrieving package snapshot: {package_id} v{version}")
             
@@ -2128,9 +2217,10 @@ class graphDBdataAccess:
             result = self.graph.query(query, params, session_params={"database": self.graph._database})
             
             if result:
-                snapshot = result[0]
-                snapshot["snapshot_data"] = json.loads(snapshot.get("snapshot_data", "{}"))
-                return snapshot["snapshot_data"]
+                snapshot_data = result[0].get("snapshot_data", "{}")
+                if isinstance(snapshot_data, str):
+                    return json.loads(snapshot_data)
+                return snapshot_data
             
             return None
             
@@ -2138,6 +2228,38 @@ class graphDBdataAccess:
             logging.error(f"Error retrieving package snapshot: {str(e)}")
             raise Exception(f"Failed to retrieve package snapshot: {str(e)}")
 
+    def get_package_snapshots(self, package_id: str, versions: list) -> dict:
+        """Get package snapshots for several versions in a single query
+        
+        Returns a dict of version to snapshot, in the same form as
+        get_package_snapshot; versions without a snapshot are omitted.
+        """
+        try:
+            logging.info(f"Retrieving package snapshots: {package_id} {versions}")
+            
+            query = """
+            MATCH (p:DocumentPackage {package_id: $package_id})-[:VERSION_OF]->(v:PackageVersion)-[:SNAPSHOT]->(s:PackageSnapshot)
+            WHERE v.version IN $versions
+            RETURN v.version as version,
+                   s.snapshot_data as snapshot_data
+            """
+            
+            params = {"package_id": package_id, "versions": list(versions)}
+            result = self.graph.query(query, params, session_params={"database": self.graph._database})
+            
+            snapshots = {}
+            for record in result:
+                snapshot_data = record.get("snapshot_data", "{}")
+                if isinstance(snapshot_data, str):
+                    snapshot_data = json.loads(snapshot_data)
+                snapshots.setdefault(record["version"], snapshot_data)
+            
+            return snapshots
+            
+        except Exception as e:
+            logging.error(f"Error retrieving package snapshots: {str(e)}")
+            raise Exception(f"Failed to retrieve package snapshots: {str(e)}")
+
     # Package Schema Validation and Migration
     
     def validate_package_schema(self) -> dict:
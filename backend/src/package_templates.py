@@ -1,285 +1,472 @@
 # Task 3: Package Templates Implementation
 # This file contains pre-defined templates for mortgage categories
 
-from typing import Dict, Any, List, Optional
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 from src.entities.document_package import PackageCategory
-import copy
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+# Template summaries are static, so build them once at import time and keep
+# them read-only; callers get plain dict copies.
+_AVAILABLE_TEMPLATES = tuple(
+    MappingProxyType(info) for info in (
+        {
+            "category": "NQM",
+            "template_name": "Non-QM Standard Template",
+            "description": "Guidelines and matrix for non-QM loans"
+        },
+        {
+            "category": "RTL",
+            "template_name": "Rental/Investment Property Template",
+            "description": "Rehab and investment property guidelines"
+        },
+        {
+            "category": "SBC",
+            "template_name": "Small Balance Commercial Template",
+            "description": "Commercial property guidelines"
+        },
+        {
+            "category": "CONV",
+            "template_name": "Conventional Mortgage Template",
+            "description": "Standard conventional mortgage guidelines"
+        }
+    )
+)
+
+
+# Templates whose required sections are exactly their expected chapters
+# share a single definition for both lists.
+_NQM_CHAPTERS = (
+    "Borrower Eligibility",
+    "Income Documentation",
+    "Asset Requirements",
+    "Property Standards",
+    "Credit Analysis"
+)
+
+_RTL_CHAPTERS = (
+    "Rehab Requirements",
+    "Draw Schedule",
+    "Inspection Process",
+    "Completion Standards",
+    "Investment Property Analysis"
+)
+
+
+# Error raised for categories without a template; the category list is fixed
+_VALID_CATEGORY_VALUES = tuple(c.value for c in PackageCategory)
+_NO_TEMPLATE_ERROR = (
+    "No template found for category {}. "
+    f"Valid categories: {list(_VALID_CATEGORY_VALUES)}"
+)
+
+# Validation rules, shared by every validate_template call
+_TEMPLATE_REQUIRED_FIELDS = ("category", "template_name", "documents")
+_DOCUMENT_REQUIRED_FIELDS = ("document_type", "document_name")
+_RELATIONSHIP_REQUIRED_FIELDS = ("from_document", "to_document", "relationship_type")
+_DOCUMENT_TYPES = ("guidelines", "matrix", "policy", "checklist")
+_VALID_DOCUMENT_TYPES = frozenset(_DOCUMENT_TYPES)
+_INVALID_DOCUMENT_TYPE_ERROR = f"Invalid document_type. Must be one of: {list(_DOCUMENT_TYPES)}"
+
+
+# Investor- and state-specific customization blocks, published directly so
+# applying them does not require loading the owning template
+_NQM_INVESTOR_CUSTOMIZATIONS = {
+    "additional_sections": ["Investor Guidelines", "Special Instructions"],
+    "entity_types": ["INVESTOR_REQUIREMENT"]
+}
+
+_NQM_STATE_CUSTOMIZATIONS = {
+    "additional_sections": ["State Regulations", "Disclosure Requirements"],
+    "entity_types": ["STATE_REQUIREMENT", "DISCLOSURE"]
+}
+
+_INVESTOR_CUSTOMIZATIONS: Dict[PackageCategory, Dict[str, Any]] = {
+    PackageCategory.NQM: _NQM_INVESTOR_CUSTOMIZATIONS
+}
+
+_STATE_CUSTOMIZATIONS: Dict[PackageCategory, Dict[str, Any]] = {
+    PackageCategory.NQM: _NQM_STATE_CUSTOMIZATIONS
+}
+
+
+def _clone_template(value: Any) -> Any:
+    """Copy a template tree made only of dicts, lists and immutable scalars.
+    
+    Templates have no cycles or custom objects, so this avoids the memo and
+    reflection overhead of copy.deepcopy.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {key: _clone_template(item) for key, item in value.items()}
+    if value_type is list:
+        return [_clone_template(item) for item in value]
+    return value
+
+
+def _extend_unique(items: List[Any], additions: List[Any]) -> None:
+    """Append additions to items in order, skipping values already present"""
+    seen = set(items)
+    for item in additions:
+        if item not in seen:
+            seen.add(item)
+            items.append(item)
+
+
+def _dumps_json(value: Any) -> bytes:
+    """Serialize value to UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _compile_package_builder(template: Dict[str, Any]) -> Callable[[str, str], Dict[str, Any]]:
+    """Generate a package configuration builder with the template inlined.
+    
+    The template's documents and relationships are emitted as literal
+    displays, so each call builds fresh containers directly instead of
+    walking and cloning the cached template.
+    """
+    source = (
+        "def build_package(package_name, tenant_id):\n"
+        "    return {\n"
+        "        'package_name': package_name,\n"
+        "        'tenant_id': tenant_id,\n"
+        f"        'category': {template['category']!r},\n"
+        f"        'template': {template['template_name']!r},\n"
+        f"        'documents': {template['documents']!r},\n"
+        f"        'relationships': {template['relationships']!r},\n"
+        "    }\n"
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<package builder {template['category']}>", "exec"), namespace)
+    builder: Callable[[str, str], Dict[str, Any]] = namespace["build_package"]
+    return builder
+
+
+class _CachedTemplate:
+    """Class attribute that builds a category template on first access"""
+    
+    def __init__(self, category: PackageCategory):
+        self.category = category
+    
+    def __get__(self, instance: Any, owner: Any) -> Optional[Dict[str, Any]]:
+        return MortgagePackageTemplates._load_template(self.category)
 
 
 class MortgagePackageTemplates:
     """Pre-defined templates for mortgage categories"""
     
+    # Templates are built lazily so workers only pay for the categories they use
+    NQM_TEMPLATE: ClassVar[_CachedTemplate] = _CachedTemplate(PackageCategory.NQM)
+    RTL_TEMPLATE: ClassVar[_CachedTemplate] = _CachedTemplate(PackageCategory.RTL)
+    SBC_TEMPLATE: ClassVar[_CachedTemplate] = _CachedTemplate(PackageCategory.SBC)
+    CONV_TEMPLATE: ClassVar[_CachedTemplate] = _CachedTemplate(PackageCategory.CONV)
+    
     # NQM Template - Non-QM Standard Template
-    NQM_TEMPLATE = {
-        "category": "NQM",
-        "template_name": "Non-QM Standard Template",
-        "documents": [
-            {
-                "document_type": "guidelines",
-                "document_name": "NQM Guidelines",
-                "expected_structure": {
-                    "chapters": [
-                        "Borrower Eligibility", 
-                        "Income Documentation", 
-                        "Asset Requirements", 
-                        "Property Standards", 
-                        "Credit Analysis"
+    @staticmethod
+    def _nqm_template() -> Dict[str, Any]:
+        """Build the NQM template"""
+        return {
+            "category": "NQM",
+            "template_name": "Non-QM Standard Template",
+            "documents": [
+                {
+                    "document_type": "guidelines",
+                    "document_name": "NQM Guidelines",
+                    "expected_structure": {
+                        "chapters": list(_NQM_CHAPTERS),
+                        "navigation_depth": 4
+                    },
+                    "required_sections": list(_NQM_CHAPTERS),
+                    "optional_sections": [
+                        "Foreign National Requirements",
+                        "Specialty Programs",
+                        "Exception Guidelines"
                     ],
-                    "navigation_depth": 4
-                },
-                "required_sections": [
-                    "Borrower Eligibility",
-                    "Income Documentation", 
-                    "Asset Requirements",
-                    "Property Standards",
-                    "Credit Analysis"
-                ],
-                "optional_sections": [
-                    "Foreign National Requirements",
-                    "Specialty Programs",
-                    "Exception Guidelines"
-                ],
-                "chunking_strategy": "hierarchical",
-                "entity_types": [
-                    "LOAN_PROGRAM", 
-                    "BORROWER_TYPE", 
-                    "REQUIREMENT", 
-                    "NUMERIC_THRESHOLD",
-                    "POLICY_RULE"
-                ],
-                "decision_trees": ["eligibility", "documentation", "property"],
-                "quality_thresholds": {
-                    "navigation_accuracy": 0.95,
-                    "decision_completeness": 1.0,
-                    "entity_coverage": 0.90
+                    "chunking_strategy": "hierarchical",
+                    "entity_types": [
+                        "LOAN_PROGRAM", 
+                        "BORROWER_TYPE", 
+                        "REQUIREMENT", 
+                        "NUMERIC_THRESHOLD",
+                        "POLICY_RULE"
+                    ],
+                    "decision_trees": ["eligibility", "documentation", "property"],
+                    "quality_thresholds": {
+                        "navigation_accuracy": 0.95,
+                        "decision_completeness": 1.0,
+                        "entity_coverage": 0.90
+                    },
+                    "validation_schema": {
+                        "required_entities": ["LOAN_PROGRAM", "BORROWER_TYPE"],
+                        "minimum_sections": 5
+                    }
                 },
-                "validation_schema": {
-                    "required_entities": ["LOAN_PROGRAM", "BORROWER_TYPE"],
-                    "minimum_sections": 5
-                }
-            },
-            {
-                "document_type": "matrix",
-                "document_name": "NQM Matrix",
-                "matrix_configuration": {
-                    "matrix_types": ["qualification", "pricing", "ltv_matrix"],
-                    "dimensions": ["fico_score", "ltv_ratio", "dti_ratio"],
-                    "expected_structure": {
-                        "matrix_count": 3,
-                        "dimension_ranges": {
-                            "fico_score": [580, 850],
-                            "ltv_ratio": [0.1, 0.95],
-                            "dti_ratio": [0.1, 0.50]
+                {
+                    "document_type": "matrix",
+                    "document_name": "NQM Matrix",
+                    "matrix_configuration": {
+                        "matrix_types": ["qualification", "pricing", "ltv_matrix"],
+                        "dimensions": ["fico_score", "ltv_ratio", "dti_ratio"],
+                        "expected_structure": {
+                            "matrix_count": 3,
+                            "dimension_ranges": {
+                                "fico_score": [580, 850],
+                                "ltv_ratio": [0.1, 0.95],
+                                "dti_ratio": [0.1, 0.50]
+                            }
                         }
+                    },
+                    "chunking_strategy": "matrix_aware",
+                    "entity_types": ["MATRIX_VALUE", "THRESHOLD", "CONDITION"],
+                    "quality_thresholds": {
+                        "matrix_completeness": 1.0,
+                        "value_accuracy": 0.99
                     }
-                },
-                "chunking_strategy": "matrix_aware",
-                "entity_types": ["MATRIX_VALUE", "THRESHOLD", "CONDITION"],
-                "quality_thresholds": {
-                    "matrix_completeness": 1.0,
-                    "value_accuracy": 0.99
                 }
-            }
-        ],
-        "relationships": [
-            {
-                "from_document": "guidelines",
-                "to_document": "matrix",
-                "relationship_type": "ELABORATES",
-                "metadata": {
-                    "connection_type": "policy_to_matrix",
-                    "sections": ["eligibility", "qualification"]
-                }
-            },
-            {
-                "from_document": "guidelines",
-                "to_document": "matrix", 
-                "relationship_type": "DETERMINES",
-                "metadata": {
-                    "connection_type": "criteria_to_pricing",
-                    "sections": ["credit_analysis", "pricing"]
+            ],
+            "relationships": [
+                {
+                    "from_document": "guidelines",
+                    "to_document": "matrix",
+                    "relationship_type": "ELABORATES",
+                    "metadata": {
+                        "connection_type": "policy_to_matrix",
+                        "sections": ["eligibility", "qualification"]
+                    }
+                },
+                {
+                    "from_document": "guidelines",
+                    "to_document": "matrix", 
+                    "relationship_type": "DETERMINES",
+                    "metadata": {
+                        "connection_type": "criteria_to_pricing",
+                        "sections": ["credit_analysis", "pricing"]
+                    }
                 }
-            }
-        ],
-        "customizations": {
-            "investor_specific": {
-                "additional_sections": ["Investor Guidelines", "Special Instructions"],
-                "entity_types": ["INVESTOR_REQUIREMENT"]
-            },
-            "state_specific": {
-                "additional_sections": ["State Regulations", "Disclosure Requirements"],
-                "entity_types": ["STATE_REQUIREMENT", "DISCLOSURE"]
+            ],
+            "customizations": {
+                "investor_specific": _NQM_INVESTOR_CUSTOMIZATIONS,
+                "state_specific": _NQM_STATE_CUSTOMIZATIONS
             }
         }
-    }
     
     # RTL Template - Rental/Investment Property Template
-    RTL_TEMPLATE = {
-        "category": "RTL",
-        "template_name": "Rental/Investment Property Template",
-        "documents": [
-            {
-                "document_type": "guidelines",
-                "document_name": "RTL Guidelines",
-                "expected_structure": {
-                    "chapters": [
-                        "Rehab Requirements",
-                        "Draw Schedule", 
-                        "Inspection Process",
-                        "Completion Standards",
-                        "Investment Property Analysis"
+    @staticmethod
+    def _rtl_template() -> Dict[str, Any]:
+        """Build the RTL template"""
+        return {
+            "category": "RTL",
+            "template_name": "Rental/Investment Property Template",
+            "documents": [
+                {
+                    "document_type": "guidelines",
+                    "document_name": "RTL Guidelines",
+                    "expected_structure": {
+                        "chapters": list(_RTL_CHAPTERS),
+                        "navigation_depth": 3
+                    },
+                    "required_sections": list(_RTL_CHAPTERS),
+                    "optional_sections": [
+                        "Environmental Considerations",
+                        "Specialty Property Types"
                     ],
-                    "navigation_depth": 3
+                    "chunking_strategy": "hierarchical",
+                    "entity_types": [
+                        "PROPERTY_TYPE", 
+                        "REHAB_REQUIREMENT", 
+                        "INSPECTION_MILESTONE",
+                        "COMPLETION_STANDARD"
+                    ],
+                    "decision_trees": ["rehab_eligibility", "draw_approval", "completion_verification"],
+                    "quality_thresholds": {
+                        "navigation_accuracy": 0.90,
+                        "decision_completeness": 0.95,
+                        "entity_coverage": 0.85
+                    }
                 },
-                "required_sections": [
-                    "Rehab Requirements",
-                    "Draw Schedule", 
-                    "Inspection Process",
-                    "Completion Standards",
-                    "Investment Property Analysis"
-                ],
-                "optional_sections": [
-                    "Environmental Considerations",
-                    "Specialty Property Types"
-                ],
-                "chunking_strategy": "hierarchical",
-                "entity_types": [
-                    "PROPERTY_TYPE", 
-                    "REHAB_REQUIREMENT", 
-                    "INSPECTION_MILESTONE",
-                    "COMPLETION_STANDARD"
-                ],
-                "decision_trees": ["rehab_eligibility", "draw_approval", "completion_verification"],
-                "quality_thresholds": {
-                    "navigation_accuracy": 0.90,
-                    "decision_completeness": 0.95,
-                    "entity_coverage": 0.85
-                }
-            },
-            {
-                "document_type": "matrix",
-                "document_name": "RTL Matrix",
-                "matrix_configuration": {
-                    "matrix_types": ["rehab_cost", "arv_matrix", "rental_income"],
-                    "dimensions": ["property_value", "rehab_percentage", "rental_yield"],
-                    "expected_structure": {
-                        "matrix_count": 3,
-                        "dimension_ranges": {
-                            "property_value": [50000, 2000000],
-                            "rehab_percentage": [0.1, 0.5],
-                            "rental_yield": [0.05, 0.15]
+                {
+                    "document_type": "matrix",
+                    "document_name": "RTL Matrix",
+                    "matrix_configuration": {
+                        "matrix_types": ["rehab_cost", "arv_matrix", "rental_income"],
+                        "dimensions": ["property_value", "rehab_percentage", "rental_yield"],
+                        "expected_structure": {
+                            "matrix_count": 3,
+                            "dimension_ranges": {
+                                "property_value": [50000, 2000000],
+                                "rehab_percentage": [0.1, 0.5],
+                                "rental_yield": [0.05, 0.15]
+                            }
                         }
+                    },
+                    "chunking_strategy": "matrix_aware",
+                    "entity_types": ["MATRIX_VALUE", "PROPERTY_VALUE", "REHAB_COST"]
+                }
+            ],
+            "relationships": [
+                {
+                    "from_document": "guidelines",
+                    "to_document": "matrix",
+                    "relationship_type": "DEFINES",
+                    "metadata": {
+                        "connection_type": "requirements_to_matrix",
+                        "sections": ["rehab_requirements", "rehab_cost"]
                     }
-                },
-                "chunking_strategy": "matrix_aware",
-                "entity_types": ["MATRIX_VALUE", "PROPERTY_VALUE", "REHAB_COST"]
-            }
-        ],
-        "relationships": [
-            {
-                "from_document": "guidelines",
-                "to_document": "matrix",
-                "relationship_type": "DEFINES",
-                "metadata": {
-                    "connection_type": "requirements_to_matrix",
-                    "sections": ["rehab_requirements", "rehab_cost"]
                 }
-            }
-        ]
-    }
+            ]
+        }
     
     # SBC Template - Small Balance Commercial Template  
-    SBC_TEMPLATE = {
-        "category": "SBC",
-        "template_name": "Small Balance Commercial Template",
-        "documents": [
-            {
-                "document_type": "guidelines",
-                "document_name": "SBC Guidelines",
-                "expected_structure": {
-                    "chapters": [
+    @staticmethod
+    def _sbc_template() -> Dict[str, Any]:
+        """Build the SBC template"""
+        return {
+            "category": "SBC",
+            "template_name": "Small Balance Commercial Template",
+            "documents": [
+                {
+                    "document_type": "guidelines",
+                    "document_name": "SBC Guidelines",
+                    "expected_structure": {
+                        "chapters": [
+                            "Property Requirements",
+                            "Income Analysis",
+                            "Debt Service Coverage", 
+                            "Environmental Review",
+                            "Commercial Underwriting"
+                        ],
+                        "navigation_depth": 3
+                    },
+                    "required_sections": [
                         "Property Requirements",
                         "Income Analysis",
-                        "Debt Service Coverage", 
-                        "Environmental Review",
-                        "Commercial Underwriting"
+                        "Debt Service Coverage",
+                        "Environmental Review"
                     ],
-                    "navigation_depth": 3
-                },
-                "required_sections": [
-                    "Property Requirements",
-                    "Income Analysis",
-                    "Debt Service Coverage",
-                    "Environmental Review"
-                ],
-                "optional_sections": [
-                    "Special Use Properties",
-                    "Multi-Tenant Considerations"
-                ],
-                "chunking_strategy": "hierarchical",
-                "entity_types": [
-                    "COMMERCIAL_PROPERTY", 
-                    "INCOME_SOURCE", 
-                    "ENVIRONMENTAL_FACTOR",
-                    "DEBT_SERVICE_RATIO"
-                ],
-                "decision_trees": ["property_eligibility", "income_verification", "environmental_assessment"],
-                "quality_thresholds": {
-                    "navigation_accuracy": 0.90,
-                    "decision_completeness": 0.90,
-                    "entity_coverage": 0.85
+                    "optional_sections": [
+                        "Special Use Properties",
+                        "Multi-Tenant Considerations"
+                    ],
+                    "chunking_strategy": "hierarchical",
+                    "entity_types": [
+                        "COMMERCIAL_PROPERTY", 
+                        "INCOME_SOURCE", 
+                        "ENVIRONMENTAL_FACTOR",
+                        "DEBT_SERVICE_RATIO"
+                    ],
+                    "decision_trees": ["property_eligibility", "income_verification", "environmental_assessment"],
+                    "quality_thresholds": {
+                        "navigation_accuracy": 0.90,
+                        "decision_completeness": 0.90,
+                        "entity_coverage": 0.85
+                    }
                 }
-            }
-        ],
-        "relationships": []
-    }
+            ],
+            "relationships": []
+        }
     
     # CONV Template - Conventional Mortgage Template
-    CONV_TEMPLATE = {
-        "category": "CONV", 
-        "template_name": "Conventional Mortgage Template",
-        "documents": [
-            {
-                "document_type": "guidelines",
-                "document_name": "Conventional Guidelines",
-                "expected_structure": {
-                    "chapters": [
+    @staticmethod
+    def _conv_template() -> Dict[str, Any]:
+        """Build the CONV template"""
+        return {
+            "category": "CONV", 
+            "template_name": "Conventional Mortgage Template",
+            "documents": [
+                {
+                    "document_type": "guidelines",
+                    "document_name": "Conventional Guidelines",
+                    "expected_structure": {
+                        "chapters": [
+                            "Standard Eligibility",
+                            "Income Requirements", 
+                            "Credit Standards",
+                            "Property Requirements",
+                            "Standard Underwriting"
+                        ],
+                        "navigation_depth": 3
+                    },
+                    "required_sections": [
                         "Standard Eligibility",
                         "Income Requirements", 
                         "Credit Standards",
-                        "Property Requirements",
-                        "Standard Underwriting"
+                        "Property Requirements"
                     ],
-                    "navigation_depth": 3
-                },
-                "required_sections": [
-                    "Standard Eligibility",
-                    "Income Requirements", 
-                    "Credit Standards",
-                    "Property Requirements"
-                ],
-                "optional_sections": [
-                    "First-Time Buyer Programs",
-                    "Special Circumstances"
-                ],
-                "chunking_strategy": "hierarchical",
-                "entity_types": [
-                    "BORROWER_TYPE", 
-                    "INCOME_TYPE", 
-                    "CREDIT_REQUIREMENT",
-                    "PROPERTY_STANDARD"
-                ],
-                "decision_trees": ["standard_eligibility", "income_verification", "credit_assessment"],
-                "quality_thresholds": {
-                    "navigation_accuracy": 0.95,
-                    "decision_completeness": 0.95,
-                    "entity_coverage": 0.90
+                    "optional_sections": [
+                        "First-Time Buyer Programs",
+                        "Special Circumstances"
+                    ],
+                    "chunking_strategy": "hierarchical",
+                    "entity_types": [
+                        "BORROWER_TYPE", 
+                        "INCOME_TYPE", 
+                        "CREDIT_REQUIREMENT",
+                        "PROPERTY_STANDARD"
+                    ],
+                    "decision_trees": ["standard_eligibility", "income_verification", "credit_assessment"],
+                    "quality_thresholds": {
+                        "navigation_accuracy": 0.95,
+                        "decision_completeness": 0.95,
+                        "entity_coverage": 0.90
+                    }
                 }
-            }
-        ],
-        "relationships": []
+            ],
+            "relationships": []
+        }
+    
+    # Customization key -> (document field, default factory, merge operation)
+    _DOCUMENT_CUSTOMIZATIONS: ClassVar[Dict[str, Tuple[str, Callable[[], Any], Callable[[Any, Any], None]]]] = {
+        "additional_sections": ("optional_sections", list, _extend_unique),
+        "additional_entity_types": ("entity_types", list, _extend_unique),
+        "quality_thresholds": ("quality_thresholds", dict, dict.update),
     }
     
+    # Customization key -> per-category customization blocks it pulls in
+    _SCOPED_CUSTOMIZATIONS: ClassVar[Tuple[Tuple[str, Dict[PackageCategory, Dict[str, Any]]], ...]] = (
+        ("investor_name", _INVESTOR_CUSTOMIZATIONS),
+        ("state", _STATE_CUSTOMIZATIONS),
+    )
+    
+    # Category -> template factory, populated once after the class body
+    _TEMPLATE_FACTORIES: ClassVar[Dict[PackageCategory, Callable[[], Dict[str, Any]]]] = {}
+    
+    # Templates built so far, keyed by category
+    _TEMPLATE_CACHE: ClassVar[Dict[PackageCategory, Dict[str, Any]]] = {}
+    
+    # Pre-serialized JSON for each template, keyed by category
+    _TEMPLATE_JSON: ClassVar[Dict[PackageCategory, bytes]] = {}
+    
+    # Generated package configuration builders, keyed by category
+    _PACKAGE_BUILDERS: ClassVar[Dict[PackageCategory, Callable[[str, str], Dict[str, Any]]]] = {}
+    
+    @staticmethod
+    def _load_template(category: PackageCategory) -> Optional[Dict[str, Any]]:
+        """Return the shared template for category, building it on first use
+        
+        Args:
+            category: Package category enum
+            
+        Returns:
+            Cached template configuration, or None if category not supported
+        """
+        template = MortgagePackageTemplates._TEMPLATE_CACHE.get(category)
+        if template is None:
+            factory = MortgagePackageTemplates._TEMPLATE_FACTORIES.get(category)
+            if factory is None:
+                return None
+            template = factory()
+            MortgagePackageTemplates._TEMPLATE_CACHE[category] = template
+        return template
+    
     @staticmethod
     def get_template(category: PackageCategory) -> Dict[str, Any]:
         """Get template configuration for category
@@ -293,26 +480,67 @@ class MortgagePackageTemplates:
         Raises:
             ValueError: If category not supported
         """
-        templates = {
-            PackageCategory.NQM: MortgagePackageTemplates.NQM_TEMPLATE,
-            PackageCategory.RTL: MortgagePackageTemplates.RTL_TEMPLATE,
-            PackageCategory.SBC: MortgagePackageTemplates.SBC_TEMPLATE,
-            PackageCategory.CONV: MortgagePackageTemplates.CONV_TEMPLATE
-        }
-        
-        template = templates.get(category)
+        template = MortgagePackageTemplates._load_template(category)
         if not template:
-            valid_categories = [c.value for c in PackageCategory]
-            raise ValueError(f"No template found for category {category}. Valid categories: {valid_categories}")
+            raise ValueError(_NO_TEMPLATE_ERROR.format(category))
         
         # Return deep copy to prevent template modification
-        return copy.deepcopy(template)
+        return _clone_template(template)
+    
+    @staticmethod
+    def get_template_json(category: PackageCategory) -> bytes:
+        """Get template configuration for category as serialized JSON
+        
+        The bytes are built once per category and can be returned directly
+        as a response body, skipping the copy and encoding done for
+        get_template.
+        
+        Args:
+            category: Package category enum
+            
+        Returns:
+            UTF-8 encoded JSON of the template configuration
+            
+        Raises:
+            ValueError: If category not supported
+        """
+        blob = MortgagePackageTemplates._TEMPLATE_JSON.get(category)
+        if blob is None:
+            template = MortgagePackageTemplates._load_template(category)
+            if not template:
+                raise ValueError(_NO_TEMPLATE_ERROR.format(category))
+            blob = _dumps_json(template)
+            MortgagePackageTemplates._TEMPLATE_JSON[category] = blob
+        return blob
+    
+    @staticmethod
+    def _get_package_builder(category: PackageCategory) -> Callable[[str, str], Dict[str, Any]]:
+        """Return the generated package builder for category, creating it on first use
+        
+        Args:
+            category: Package category enum
+            
+        Returns:
+            Function taking (package_name, tenant_id) and returning a fresh
+            package configuration
+            
+        Raises:
+            ValueError: If category not supported
+        """
+        builder = MortgagePackageTemplates._PACKAGE_BUILDERS.get(category)
+        if builder is None:
+            template = MortgagePackageTemplates._load_template(category)
+            if not template:
+                raise ValueError(_NO_TEMPLATE_ERROR.format(category))
+            builder = _compile_package_builder(template)
+            MortgagePackageTemplates._PACKAGE_BUILDERS[category] = builder
+        return builder
     
     @staticmethod
     def create_package_from_template(category: PackageCategory, 
                                    package_name: str,
                                    tenant_id: str,
-                                   customizations: Dict[str, Any] = None) -> Dict[str, Any]:
+                                   customizations: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Create package configuration from template with customizations
         
         Args:
@@ -327,17 +555,9 @@ class MortgagePackageTemplates:
         Raises:
             ValueError: If template not found or customizations invalid
         """
-        template = MortgagePackageTemplates.get_template(category)
-        
         # Create package configuration
-        package_config = {
-            "package_name": package_name,
-            "tenant_id": tenant_id,
-            "category": category.value,
-            "template": template["template_name"],
-            "documents": template["documents"],
-            "relationships": template["relationships"]
-        }
+        build_package = MortgagePackageTemplates._get_package_builder(category)
+        package_config = build_package(package_name, tenant_id)
         
         # Apply customizations if provided
         if customizations:
@@ -359,86 +579,73 @@ class MortgagePackageTemplates:
         Returns:
             Modified package configuration
         """
-        # Apply additional sections to documents
-        if "additional_sections" in customizations:
-            for doc in package_config["documents"]:
-                if "optional_sections" not in doc:
-                    doc["optional_sections"] = []
-                doc["optional_sections"].extend(customizations["additional_sections"])
-        
-        # Apply additional entity types
-        if "additional_entity_types" in customizations:
-            for doc in package_config["documents"]:
-                if "entity_types" not in doc:
-                    doc["entity_types"] = []
-                doc["entity_types"].extend(customizations["additional_entity_types"])
+        documents = package_config["documents"]
+        document_handlers = MortgagePackageTemplates._DOCUMENT_CUSTOMIZATIONS
+        category: Optional[PackageCategory] = None
         
-        # Apply custom quality thresholds
-        if "quality_thresholds" in customizations:
-            for doc in package_config["documents"]:
-                if "quality_thresholds" not in doc:
-                    doc["quality_thresholds"] = {}
-                doc["quality_thresholds"].update(customizations["quality_thresholds"])
-        
-        # Apply investor-specific customizations
-        if "investor_name" in customizations:
-            package_config["investor_name"] = customizations["investor_name"]
+        # Investor- and state-specific blocks are queued behind the caller's
+        # customizations and applied in order, without recursion
+        pending = deque([customizations])
+        while pending:
+            packet = pending.popleft()
             
-            # Add investor-specific sections if available in template
-            template = MortgagePackageTemplates.get_template(
-                PackageCategory(package_config["category"])
-            )
-            if "customizations" in template and "investor_specific" in template["customizations"]:
-                investor_custom = template["customizations"]["investor_specific"]
-                package_config = MortgagePackageTemplates._apply_customizations(
-                    package_config, investor_custom
-                )
-        
-        # Apply state-specific customizations
-        if "state" in customizations:
-            package_config["state"] = customizations["state"]
+            # Apply document-level customizations in a single pass over documents
+            document_updates = []
+            for key, value in packet.items():
+                handler = document_handlers.get(key)
+                if handler is not None:
+                    document_updates.append((*handler, value))
+            if document_updates:
+                for doc in documents:
+                    for field, factory, update, value in document_updates:
+                        if field not in doc:
+                            doc[field] = factory()
+                        update(doc[field], value)
             
-            # Add state-specific sections if available in template
-            template = MortgagePackageTemplates.get_template(
-                PackageCategory(package_config["category"])
-            )
-            if "customizations" in template and "state_specific" in template["customizations"]:
-                state_custom = template["customizations"]["state_specific"]
-                package_config = MortgagePackageTemplates._apply_customizations(
-                    package_config, state_custom
-                )
+            # Queue investor- and state-specific customizations
+            for key, category_customizations in MortgagePackageTemplates._SCOPED_CUSTOMIZATIONS:
+                if key not in packet:
+                    continue
+                package_config[key] = packet[key]
+                
+                # Add scope-specific sections if the category defines them
+                if category is None:
+                    category = PackageCategory(package_config["category"])
+                scoped_custom = category_customizations.get(category)
+                if scoped_custom is not None:
+                    pending.append(scoped_custom)
         
         return package_config
     
+    @staticmethod
+    def warmup() -> None:
+        """Build every cached template artifact up front
+        
+        Called at server startup so the first request for each category does
+        not pay for building its template, JSON blob and package builder.
+        Each template is validated first, so a broken template fails startup
+        instead of the first request for its category.
+        
+        Raises:
+            ValueError: If a category template fails validation
+        """
+        for category in PackageCategory:
+            template = MortgagePackageTemplates._load_template(category)
+            if template is not None:
+                errors = MortgagePackageTemplates.validate_template(template)
+                if errors:
+                    raise ValueError(f"Template {category.value} is invalid: {errors}")
+            MortgagePackageTemplates.get_template_json(category)
+            MortgagePackageTemplates._get_package_builder(category)
+    
     @staticmethod
     def get_available_templates() -> List[Dict[str, str]]:
         """Get list of available templates
         
         Returns:
-            List of template info dictionaries
+            List of template info dicts
         """
-        return [
-            {
-                "category": "NQM",
-                "template_name": "Non-QM Standard Template",
-                "description": "Guidelines and matrix for non-QM loans"
-            },
-            {
-                "category": "RTL", 
-                "template_name": "Rental/Investment Property Template",
-                "description": "Rehab and investment property guidelines"
-            },
-            {
-                "category": "SBC",
-                "template_name": "Small Balance Commercial Template", 
-                "description": "Commercial property guidelines"
-            },
-            {
-                "category": "CONV",
-                "template_name": "Conventional Mortgage Template",
-                "description": "Standard conventional mortgage guidelines"
-            }
-        ]
+        return [dict(info) for info in _AVAILABLE_TEMPLATES]
     
     @staticmethod
     def validate_template(template: Dict[str, Any]) -> List[str]:
@@ -450,57 +657,64 @@ class MortgagePackageTemplates:
         Returns:
             List of validation errors (empty if valid)
         """
-        errors = []
+        errors: List[str] = []
         
         # Check required template fields
-        required_fields = ["category", "template_name", "documents"]
-        for field in required_fields:
+        for field in _TEMPLATE_REQUIRED_FIELDS:
             if field not in template:
                 errors.append(f"Missing required field: {field}")
         
-        # Validate documents
-        if "documents" in template:
-            if not template["documents"]:
+        # Nothing below can be checked meaningfully without documents
+        documents = template.get("documents")
+        if not documents:
+            if "documents" in template:
                 errors.append("Template must contain at least one document")
-            
-            for i, doc in enumerate(template["documents"]):
-                doc_errors = MortgagePackageTemplates._validate_document_template(doc, f"documents[{i}]")
-                errors.extend(doc_errors)
+            return errors
+        
+        # Validate documents
+        validate_document = MortgagePackageTemplates._validate_document_template
+        for i, doc in enumerate(documents):
+            errors.extend(validate_document(doc, f"documents[{i}]"))
         
         # Validate relationships if present
         if "relationships" in template:
+            validate_relationship = MortgagePackageTemplates._validate_relationship_template
             for i, rel in enumerate(template["relationships"]):
-                rel_errors = MortgagePackageTemplates._validate_relationship_template(rel, f"relationships[{i}]")
-                errors.extend(rel_errors)
+                errors.extend(validate_relationship(rel, f"relationships[{i}]"))
         
         return errors
     
     @staticmethod
     def _validate_document_template(doc: Dict[str, Any], prefix: str) -> List[str]:
         """Validate document template structure"""
-        errors = []
+        errors: List[str] = []
         
-        required_fields = ["document_type", "document_name"]
-        for field in required_fields:
+        for field in _DOCUMENT_REQUIRED_FIELDS:
             if field not in doc:
                 errors.append(f"{prefix}: Missing required field: {field}")
         
         # Validate document type
-        if "document_type" in doc:
-            valid_types = ["guidelines", "matrix", "policy", "checklist"]
-            if doc["document_type"] not in valid_types:
-                errors.append(f"{prefix}: Invalid document_type. Must be one of: {valid_types}")
+        document_type = doc.get("document_type")
+        if document_type is not None and document_type not in _VALID_DOCUMENT_TYPES:
+            errors.append(f"{prefix}: {_INVALID_DOCUMENT_TYPE_ERROR}")
         
         return errors
     
     @staticmethod 
     def _validate_relationship_template(rel: Dict[str, Any], prefix: str) -> List[str]:
         """Validate relationship template structure"""
-        errors = []
+        errors: List[str] = []
         
-        required_fields = ["from_document", "to_document", "relationship_type"]
-        for field in required_fields:
+        for field in _RELATIONSHIP_REQUIRED_FIELDS:
             if field not in rel:
                 errors.append(f"{prefix}: Missing required field: {field}")
         
-        return errors
\ No newline at end of file
+        return errors
+
+
+MortgagePackageTemplates._TEMPLATE_FACTORIES = {
+    PackageCategory.NQM: MortgagePackageTemplates._nqm_template,
+    PackageCategory.RTL: MortgagePackageTemplates._rtl_template,
+    PackageCategory.SBC: MortgagePackageTemplates._sbc_template,
+    PackageCategory.CONV: MortgagePackageTemplates._conv_template
+}
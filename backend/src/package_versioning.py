@@ -1,15 +1,128 @@
 # Task 4: Package Versioning Implementation
 # This file implements semantic versioning for document packages
 
-from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, Tuple, Union
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 import json
 import logging
-import copy
+import sys
 from src.entities.document_package import DocumentPackage, DocumentDefinition, PackageRelationship
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize value to UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_json_default).encode('utf-8')
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON bytes or text, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize the non-JSON types orjson handles natively"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+    """Encode a package snapshot for storage
+    
+    Snapshots are packed with MessagePack when it is installed, which is
+    considerably smaller and faster to parse than JSON; otherwise they are
+    stored as UTF-8 JSON. _decode_snapshot accepts either form.
+    """
+    if msgpack is not None:
+        return msgpack.packb(snapshot, use_bin_type=True)
+    return _dumps(snapshot)
+
+
+def _decode_snapshot(payload: Union[bytes, bytearray, str, Dict[str, Any]],
+                     fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """Decode a stored package snapshot
+    
+    Handles MessagePack and JSON payloads, legacy JSON strings, and snapshots
+    that were already decoded by the database layer. When fields is given,
+    only those top-level keys are returned.
+    """
+    if isinstance(payload, dict):
+        snapshot = payload
+    elif isinstance(payload, str):
+        snapshot = _loads(payload)
+    else:
+        payload = bytes(payload)
+        if payload[:1] == b'{':
+            snapshot = _loads(payload)
+        elif msgpack is None:
+            raise ValueError("Snapshot is MessagePack encoded but msgpack is not installed")
+        elif fields is not None:
+            return _unpack_snapshot_fields(payload, fields)
+        else:
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    
+    if fields is None:
+        return snapshot
+    return {key: snapshot[key] for key in fields if key in snapshot}
+
+
+def _unpack_snapshot_fields(payload: bytes, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Unpack selected top-level keys of a MessagePack snapshot
+    
+    Values of other keys are skipped without being turned into Python objects.
+    """
+    unpacker = msgpack.Unpacker(raw=False, strict_map_key=False, max_buffer_size=len(payload))
+    unpacker.feed(payload)
+    
+    snapshot = {}
+    for _ in range(unpacker.read_map_header()):
+        key = unpacker.unpack()
+        if key in fields:
+            snapshot[key] = unpacker.unpack()
+        else:
+            unpacker.skip()
+    return snapshot
+
+
+@lru_cache(maxsize=4096)
+def _parse_version(version: str) -> Optional[Tuple[int, int, int]]:
+    """Parse a MAJOR.MINOR.PATCH version string, returning None if it is invalid
+    
+    Results are cached, as the same version strings are parsed repeatedly
+    while sorting and validating version history.
+    """
+    parts = version.split('.')
+    if len(parts) != 3:
+        return None
+    
+    try:
+        major, minor, patch = map(int, parts)
+    except ValueError:
+        return None
+    
+    if major < 0 or minor < 0 or patch < 0:
+        return None
+    return major, minor, patch
+
 
 class ChangeType(Enum):
     """Types of version changes"""
@@ -30,18 +143,28 @@ class VersionRecord:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        result = asdict(self)
-        result['change_type'] = self.change_type.value
-        result['created_at'] = self.created_at.isoformat()
-        return result
+        # Built directly rather than via asdict(), which deep-copies every
+        # nested container; top-level containers are still copied
+        return {
+            'version': self.version,
+            'change_type': self.change_type.value,
+            'changes': list(self.changes),
+            'created_at': self.created_at.isoformat(),
+            'created_by': self.created_by,
+            'metadata': dict(self.metadata)
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'VersionRecord':
         """Create from dictionary"""
-        data = data.copy()
-        data['change_type'] = ChangeType(data['change_type'])
-        data['created_at'] = datetime.fromisoformat(data['created_at'])
-        return cls(**data)
+        return cls(
+            version=data['version'],
+            change_type=ChangeType(data['change_type']),
+            changes=data['changes'],
+            created_at=datetime.fromisoformat(data['created_at']),
+            created_by=data['created_by'],
+            metadata=data['metadata']
+        )
 
 
 @dataclass
@@ -57,20 +180,37 @@ class VersionDiff:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        return asdict(self)
+        return {
+            'from_version': self.from_version,
+            'to_version': self.to_version,
+            'added_documents': list(self.added_documents),
+            'removed_documents': list(self.removed_documents),
+            'modified_documents': list(self.modified_documents),
+            'structural_changes': list(self.structural_changes),
+            'relationship_changes': list(self.relationship_changes)
+        }
     
     def has_changes(self) -> bool:
         """Check if there are any changes between versions"""
-        return (bool(self.added_documents) or 
-                bool(self.removed_documents) or 
-                bool(self.modified_documents) or 
-                bool(self.structural_changes) or
-                bool(self.relationship_changes))
+        return any((self.added_documents, self.removed_documents, self.modified_documents,
+                    self.structural_changes, self.relationship_changes))
 
 
 class PackageVersionManager:
     """Manages package versioning and history"""
     
+    # Snapshot fields read by diff_versions
+    DIFF_SNAPSHOT_FIELDS = ('category', 'status', 'documents', 'relationships')
+    
+    # Document fields compared by _compare_documents
+    _DOCUMENT_SCALAR_FIELDS = ('document_name', 'document_type', 'chunking_strategy')
+    _DOCUMENT_LIST_FIELDS = ('required_sections', 'optional_sections', 'entity_types')
+    _DOCUMENT_COMPLEX_FIELDS = ('expected_structure', 'matrix_configuration', 'validation_schema', 'quality_thresholds')
+    
+    # Snapshot fields checked by _detect_structural_changes, as (key, label)
+    _STRUCTURAL_FIELDS = (('category', 'Category'), ('status', 'Status'))
+    _COUNTED_FIELDS = (('documents', 'Document count'), ('relationships', 'Relationship count'))
+    
     def __init__(self, graph_db=None):
         """Initialize version manager with database connection"""
         self.graph_db = graph_db
@@ -103,8 +243,8 @@ class PackageVersionManager:
             # Calculate new version
             new_version = self._calculate_new_version(current_version, change_type)
             
-            # Create package snapshot for current state
-            package_snapshot = self._create_package_snapshot(package)
+            # Create encoded package snapshot for current state
+            snapshot_payload, snapshot_created = self._create_package_snapshot_bytes(package)
             
             # Create version record
             version_record = VersionRecord(
@@ -123,8 +263,7 @@ class PackageVersionManager:
             )
             
             # Store version record and snapshot
-            self._store_version_record(package.package_id, version_record)
-            self._store_package_snapshot(package.package_id, new_version, package_snapshot)
+            self._store_version_with_snapshot(package.package_id, version_record, snapshot_payload, snapshot_created)
             
             # Update package version
             previous_version = package.version
@@ -153,12 +292,10 @@ class PackageVersionManager:
         try:
             self.logger.info(f"Retrieving version history for package {package_id}")
             
+            # Records come back ordered by version number (newest first)
             history_data = self._retrieve_version_history(package_id)
             history = [self._deserialize_version_record(record) for record in history_data]
             
-            # Sort by version number (newest first)
-            history.sort(key=lambda x: self._version_to_tuple(x.version), reverse=True)
-            
             self.logger.info(f"Found {len(history)} versions for package {package_id}")
             return history
             
@@ -212,14 +349,14 @@ class PackageVersionManager:
             if not package_snapshot:
                 raise ValueError(f"No snapshot found for version {target_version}")
             
-            # Load current package to get current version
-            current_package = self._load_current_package(package_id)
-            if not current_package:
+            # Load current version of the package
+            current_version = self._load_current_version(package_id)
+            if not current_version:
                 raise ValueError(f"Current package {package_id} not found")
             
             # Create new version for rollback (MAJOR change since it's potentially breaking)
             rollback_changes = [f"Rollback to version {target_version}"]
-            rollback_version = self._calculate_new_version(current_package.version, ChangeType.MAJOR)
+            rollback_version = self._calculate_new_version(current_version, ChangeType.MAJOR)
             
             # Restore package from snapshot
             restored_package = self._restore_package_from_snapshot(package_snapshot)
@@ -234,16 +371,18 @@ class PackageVersionManager:
                 created_at=datetime.now(),
                 created_by=created_by or 'system',
                 metadata={
-                    "previous_version": current_package.version,
+                    "previous_version": current_version,
                     "package_id": package_id,
                     "rollback_target": target_version,
                     "operation": "rollback"
                 }
             )
             
-            # Store rollback version
-            self._store_version_record(package_id, rollback_record)
-            self._store_package_snapshot(package_id, rollback_version, self._create_package_snapshot(restored_package))
+            # Store rollback version; the target snapshot already describes the
+            # restored package, so it is stored again rather than re-serialized
+            snapshot_created = datetime.now().isoformat()
+            snapshot_payload = _encode_snapshot(dict(package_snapshot, snapshot_created=snapshot_created))
+            self._store_version_with_snapshot(package_id, rollback_record, snapshot_payload, snapshot_created)
             
             self.logger.info(f"Successfully rolled back package {package_id} to version {target_version} (new version: {rollback_version})")
             return restored_package
@@ -270,9 +409,10 @@ class PackageVersionManager:
         try:
             self.logger.info(f"Comparing versions {v1} and {v2} for package {package_id}")
             
-            # Get package snapshots for both versions
-            snapshot1 = self._retrieve_package_snapshot(package_id, v1)
-            snapshot2 = self._retrieve_package_snapshot(package_id, v2)
+            # Get package snapshots for both versions in one query, decoding only the compared fields
+            snapshots = self._retrieve_package_snapshots(package_id, (v1, v2), self.DIFF_SNAPSHOT_FIELDS)
+            snapshot1 = snapshots.get(v1)
+            snapshot2 = snapshots.get(v2)
             
             if not snapshot1:
                 raise ValueError(f"Version {v1} not found for package {package_id}")
@@ -283,12 +423,12 @@ class PackageVersionManager:
             docs1 = {doc['document_id']: doc for doc in snapshot1.get('documents', [])}
             docs2 = {doc['document_id']: doc for doc in snapshot2.get('documents', [])}
             
-            added_documents = list(set(docs2.keys()) - set(docs1.keys()))
-            removed_documents = list(set(docs1.keys()) - set(docs2.keys()))
+            added_documents = list(docs2.keys() - docs1.keys())
+            removed_documents = list(docs1.keys() - docs2.keys())
             
             # Find modified documents with details
             modified_documents = []
-            for doc_id in set(docs1.keys()) & set(docs2.keys()):
+            for doc_id in docs1.keys() & docs2.keys():
                 doc_diff = self._compare_documents(docs1[doc_id], docs2[doc_id])
                 if doc_diff:
                     modified_documents.append({
@@ -298,8 +438,8 @@ class PackageVersionManager:
                     })
             
             # Compare relationships
-            rels1 = {self._relationship_key(rel): rel for rel in snapshot1.get('relationships', [])}
-            rels2 = {self._relationship_key(rel): rel for rel in snapshot2.get('relationships', [])}
+            rels1 = {rel.get('_key') or self._relationship_key(rel): rel for rel in snapshot1.get('relationships', [])}
+            rels2 = {rel.get('_key') or self._relationship_key(rel): rel for rel in snapshot2.get('relationships', [])}
             
             relationship_changes = []
             added_rels = set(rels2.keys()) - set(rels1.keys())
@@ -346,17 +486,15 @@ class PackageVersionManager:
             if not history:
                 return ["No version history found"]
             
-            # Sort by version number for validation
-            history.sort(key=lambda x: self._version_to_tuple(x.version))
+            # Sort by version number for validation; history is already newest
+            # first, which the sort handles as a single descending run
+            versions = sorted((self._version_to_tuple(record.version), record.version) for record in history)
             
             # Check for gaps or inconsistencies
-            for i in range(1, len(history)):
-                current_version = self._version_to_tuple(history[i].version)
-                previous_version = self._version_to_tuple(history[i-1].version)
-                
+            for (previous_version, previous), (current_version, current) in zip(versions, versions[1:]):
                 # Check if version increment is valid
                 if not self._is_valid_version_increment(previous_version, current_version):
-                    issues.append(f"Invalid version increment from {history[i-1].version} to {history[i].version}")
+                    issues.append(f"Invalid version increment from {previous} to {current}")
             
             return issues
             
@@ -368,7 +506,7 @@ class PackageVersionManager:
     
     def _calculate_new_version(self, current: str, change_type: ChangeType) -> str:
         """Calculate new version based on change type"""
-        major, minor, patch = map(int, current.split('.'))
+        major, minor, patch = self._version_to_tuple(current)
         
         if change_type == ChangeType.MAJOR:
             return f"{major + 1}.0.0"
@@ -380,19 +518,16 @@ class PackageVersionManager:
     def _is_valid_version(self, version: str) -> bool:
         """Validate version format (semantic versioning)"""
         try:
-            parts = version.split('.')
-            if len(parts) != 3:
-                return False
-            
-            major, minor, patch = map(int, parts)
-            return major >= 0 and minor >= 0 and patch >= 0
-            
-        except (ValueError, TypeError):
+            return _parse_version(version) is not None
+        except (AttributeError, TypeError):
             return False
     
     def _version_to_tuple(self, version: str) -> tuple:
         """Convert version string to tuple for comparison"""
-        return tuple(map(int, version.split('.')))
+        parsed = _parse_version(version)
+        if parsed is None:
+            return tuple(map(int, version.split('.')))
+        return parsed
     
     def _is_valid_version_increment(self, prev_version: tuple, current_version: tuple) -> bool:
         """Check if version increment is valid"""
@@ -430,14 +565,67 @@ class PackageVersionManager:
             "status": package.status.value,
             "created_by": package.created_by,
             "template_type": package.template_type,
-            "documents": [self._serialize_document(doc) for doc in package.documents],
-            "relationships": [self._serialize_relationship(rel) for rel in package.relationships],
+            "documents": list(map(self._serialize_document, package.documents)),
+            "relationships": list(map(self._serialize_relationship, package.relationships)),
             "template_mappings": package.template_mappings,
             "validation_rules": package.validation_rules,
             "snapshot_created": datetime.now().isoformat()
         }
     
-    def _serialize_document(self, doc: DocumentDefinition) -> Dict[str, Any]:
+    def _create_package_snapshot_bytes(self, package: DocumentPackage) -> Tuple[bytes, str]:
+        """Create encoded snapshot of package state
+        
+        Produces the same payload as encoding _create_package_snapshot, but with
+        MessagePack each document and relationship is packed as it is serialized
+        instead of first collecting them into a snapshot dict.
+        
+        Returns:
+            Tuple of (encoded snapshot, snapshot creation timestamp)
+        """
+        if msgpack is None:
+            snapshot = self._create_package_snapshot(package)
+            return _encode_snapshot(snapshot), snapshot["snapshot_created"]
+        
+        snapshot_created = datetime.now().isoformat()
+        packer = msgpack.Packer(use_bin_type=True, autoreset=False)
+        
+        packer.pack_map_header(12)
+        for key, value in (
+            ("package_id", package.package_id),
+            ("package_name", package.package_name),
+            ("tenant_id", package.tenant_id),
+            ("category", package.category.value),
+            ("status", package.status.value),
+            ("created_by", package.created_by),
+            ("template_type", package.template_type)
+        ):
+            packer.pack(key)
+            packer.pack(value)
+        
+        packer.pack("documents")
+        packer.pack_array_header(len(package.documents))
+        serialize_document = self._serialize_document
+        for doc in package.documents:
+            packer.pack(serialize_document(doc))
+        
+        packer.pack("relationships")
+        packer.pack_array_header(len(package.relationships))
+        serialize_relationship = self._serialize_relationship
+        for rel in package.relationships:
+            packer.pack(serialize_relationship(rel))
+        
+        for key, value in (
+            ("template_mappings", package.template_mappings),
+            ("validation_rules", package.validation_rules),
+            ("snapshot_created", snapshot_created)
+        ):
+            packer.pack(key)
+            packer.pack(value)
+        
+        return packer.bytes(), snapshot_created
+    
+    @staticmethod
+    def _serialize_document(doc: DocumentDefinition) -> Dict[str, Any]:
         """Serialize document to dictionary"""
         return {
             "document_id": doc.document_id,
@@ -453,17 +641,24 @@ class PackageVersionManager:
             "quality_thresholds": doc.quality_thresholds
         }
     
-    def _serialize_relationship(self, rel: PackageRelationship) -> Dict[str, Any]:
+    @staticmethod
+    def _serialize_relationship(rel: PackageRelationship) -> Dict[str, Any]:
         """Serialize relationship to dictionary"""
         return {
             "from_document": rel.from_document,
             "to_document": rel.to_document,
             "relationship_type": rel.relationship_type,
-            "metadata": rel.metadata
+            "metadata": rel.metadata,
+            # Precomputed _relationship_key, so diffs need not rebuild it
+            "_key": f"{rel.from_document}->{rel.to_document}:{rel.relationship_type}"
         }
     
     def _restore_package_from_snapshot(self, snapshot: Dict[str, Any]) -> DocumentPackage:
-        """Restore package from snapshot"""
+        """Restore package from snapshot
+        
+        Categorical strings repeated across documents and relationships are
+        interned so a restored package holds one copy of each value.
+        """
         from src.entities.document_package import PackageCategory, PackageStatus
         
         # Restore documents
@@ -471,12 +666,12 @@ class PackageVersionManager:
         for doc_data in snapshot.get('documents', []):
             doc = DocumentDefinition(
                 document_id=doc_data['document_id'],
-                document_type=doc_data['document_type'],
+                document_type=sys.intern(doc_data['document_type']),
                 document_name=doc_data['document_name'],
                 expected_structure=doc_data.get('expected_structure', {}),
                 required_sections=doc_data.get('required_sections', []),
                 optional_sections=doc_data.get('optional_sections', []),
-                chunking_strategy=doc_data.get('chunking_strategy', 'hierarchical'),
+                chunking_strategy=sys.intern(doc_data.get('chunking_strategy', 'hierarchical')),
                 entity_types=doc_data.get('entity_types', []),
                 matrix_configuration=doc_data.get('matrix_configuration'),
                 validation_schema=doc_data.get('validation_schema', {}),
@@ -490,7 +685,7 @@ class PackageVersionManager:
             rel = PackageRelationship(
                 from_document=rel_data['from_document'],
                 to_document=rel_data['to_document'],
-                relationship_type=rel_data['relationship_type'],
+                relationship_type=sys.intern(rel_data['relationship_type']),
                 metadata=rel_data.get('metadata', {})
             )
             relationships.append(rel)
@@ -519,20 +714,30 @@ class PackageVersionManager:
     
     def _compare_documents(self, doc1: Dict[str, Any], doc2: Dict[str, Any]) -> List[str]:
         """Compare two document configurations"""
+        # Most documents are unchanged between versions
+        if doc1 == doc2:
+            return []
+        
         changes = []
         
         # Compare basic fields
-        for field in ['document_name', 'document_type', 'chunking_strategy']:
-            if doc1.get(field) != doc2.get(field):
-                changes.append(f"{field} changed from '{doc1.get(field)}' to '{doc2.get(field)}'")
+        for field in self._DOCUMENT_SCALAR_FIELDS:
+            value1 = doc1.get(field)
+            value2 = doc2.get(field)
+            if value1 != value2:
+                changes.append(f"{field} changed from '{value1}' to '{value2}'")
         
         # Compare lists
-        for field in ['required_sections', 'optional_sections', 'entity_types']:
-            list1 = set(doc1.get(field, []))
-            list2 = set(doc2.get(field, []))
+        for field in self._DOCUMENT_LIST_FIELDS:
+            list1 = doc1.get(field, ())
+            list2 = doc2.get(field, ())
+            if list1 == list2:
+                continue
             
-            added = list2 - list1
-            removed = list1 - list2
+            set1 = frozenset(list1)
+            set2 = frozenset(list2)
+            added = set2 - set1
+            removed = set1 - set2
             
             if added:
                 changes.append(f"Added {field}: {list(added)}")
@@ -540,39 +745,33 @@ class PackageVersionManager:
                 changes.append(f"Removed {field}: {list(removed)}")
         
         # Compare complex objects
-        for field in ['expected_structure', 'matrix_configuration', 'validation_schema', 'quality_thresholds']:
+        for field in self._DOCUMENT_COMPLEX_FIELDS:
             if doc1.get(field) != doc2.get(field):
                 changes.append(f"{field} modified")
         
         return changes
     
     def _relationship_key(self, rel: Dict[str, Any]) -> str:
-        """Create unique key for relationship"""
+        """Create unique key for relationship (snapshots without a stored _key)"""
         return f"{rel['from_document']}->{rel['to_document']}:{rel['relationship_type']}"
     
     def _detect_structural_changes(self, snapshot1: Dict, snapshot2: Dict) -> List[str]:
         """Detect structural changes between snapshots"""
         changes = []
         
-        # Check category change
-        if snapshot1.get('category') != snapshot2.get('category'):
-            changes.append(f"Category changed from {snapshot1.get('category')} to {snapshot2.get('category')}")
-        
-        # Check status change
-        if snapshot1.get('status') != snapshot2.get('status'):
-            changes.append(f"Status changed from {snapshot1.get('status')} to {snapshot2.get('status')}")
-        
-        # Check document count
-        doc_count1 = len(snapshot1.get('documents', []))
-        doc_count2 = len(snapshot2.get('documents', []))
-        if doc_count1 != doc_count2:
-            changes.append(f"Document count changed from {doc_count1} to {doc_count2}")
+        # Check category and status changes
+        for key, label in self._STRUCTURAL_FIELDS:
+            value1 = snapshot1.get(key)
+            value2 = snapshot2.get(key)
+            if value1 != value2:
+                changes.append(f"{label} changed from {value1} to {value2}")
         
-        # Check relationship count
-        rel_count1 = len(snapshot1.get('relationships', []))
-        rel_count2 = len(snapshot2.get('relationships', []))
-        if rel_count1 != rel_count2:
-            changes.append(f"Relationship count changed from {rel_count1} to {rel_count2}")
+        # Check document and relationship counts
+        for key, label in self._COUNTED_FIELDS:
+            count1 = len(snapshot1.get(key, ()))
+            count2 = len(snapshot2.get(key, ()))
+            if count1 != count2:
+                changes.append(f"{label} changed from {count1} to {count2}")
         
         return changes
     
@@ -581,16 +780,35 @@ class PackageVersionManager:
     def _store_version_record(self, package_id: str, record: VersionRecord) -> None:
         """Store version record in database"""
         try:
-            version_data = record.to_dict()
-            self.graph_db.create_version_record(package_id, version_data)
+            self.graph_db.create_version_record(package_id, self._version_record_data(record))
         except Exception as e:
             self.logger.error(f"Failed to store version record: {str(e)}")
             raise
     
+    def _store_version_with_snapshot(self, package_id: str, record: VersionRecord,
+                                     snapshot_payload: bytes, snapshot_created: str) -> None:
+        """Store version record and its encoded package snapshot in one database write"""
+        try:
+            self.graph_db.create_version_with_snapshot(
+                package_id, self._version_record_data(record), snapshot_payload, snapshot_created
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to store version with snapshot: {str(e)}")
+            raise
+    
+    def _version_record_data(self, record: VersionRecord) -> Dict[str, Any]:
+        """Serialize version record for storage"""
+        version_data = record.to_dict()
+        # Numeric parts let the database order history by version
+        version_data["major"], version_data["minor"], version_data["patch"] = self._version_to_tuple(record.version)
+        return version_data
+    
     def _store_package_snapshot(self, package_id: str, version: str, snapshot: Dict[str, Any]) -> None:
         """Store package snapshot in database"""
         try:
-            self.graph_db.create_package_snapshot(package_id, version, snapshot)
+            self.graph_db.create_package_snapshot(
+                package_id, version, _encode_snapshot(snapshot), snapshot.get("snapshot_created")
+            )
         except Exception as e:
             self.logger.error(f"Failed to store package snapshot: {str(e)}")
             raise
@@ -603,24 +821,40 @@ class PackageVersionManager:
             self.logger.error(f"Failed to retrieve version history: {str(e)}")
             return []
     
-    def _retrieve_package_snapshot(self, package_id: str, version: str) -> Optional[Dict[str, Any]]:
-        """Retrieve package snapshot from database"""
+    def _retrieve_package_snapshot(self, package_id: str, version: str,
+                                   fields: Optional[Tuple[str, ...]] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve package snapshot from database, optionally only the given top-level fields"""
         try:
-            return self.graph_db.get_package_snapshot(package_id, version)
+            payload = self.graph_db.get_package_snapshot(package_id, version)
+            return _decode_snapshot(payload, fields) if payload is not None else None
         except Exception as e:
             self.logger.error(f"Failed to retrieve package snapshot: {str(e)}")
             return None
     
-    def _load_current_package(self, package_id: str) -> Optional[DocumentPackage]:
-        """Load current package from database"""
+    def _retrieve_package_snapshots(self, package_id: str, versions: Tuple[str, ...],
+                                    fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Dict[str, Any]]:
+        """Retrieve package snapshots for several versions from database
+        
+        Returns:
+            Dict of version to snapshot; versions without a snapshot are omitted
+        """
+        try:
+            payloads = self.graph_db.get_package_snapshots(package_id, list(versions))
+            return {
+                version: _decode_snapshot(payload, fields)
+                for version, payload in payloads.items()
+                if payload is not None
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve package snapshots: {str(e)}")
+            return {}
+    
+    def _load_current_version(self, package_id: str) -> Optional[str]:
+        """Load current package version from database"""
         try:
-            # Use PackageManager to load the package
-            from src.package_manager import PackageManager
-            
-            package_manager = PackageManager(self.graph_db)
-            return package_manager.load_package(package_id)
+            return self.graph_db.get_package_current_version(package_id)
         except Exception as e:
-            self.logger.error(f"Failed to load current package: {str(e)}")
+            self.logger.error(f"Failed to load current package version: {str(e)}")
             return None
     
     def _deserialize_version_record(self, data: Dict[str, Any]) -> VersionRecord:
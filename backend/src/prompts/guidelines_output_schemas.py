@@ -0,0 +1,145 @@
+# Structured output schemas for the guidelines prompt templates
+# Pydantic models mirroring the JSON each template asks the LLM to return,
+# for use with native structured output (llm.with_structured_output)
+
+from typing import Dict, List, Literal, Optional, Type
+
+from pydantic import BaseModel, Field
+
+from src.prompts.guidelines_prompts import PromptType
+
+
+class NavigationSection(BaseModel):
+    """A document section and its subsections"""
+    section_id: str
+    section_number: str
+    title: str
+    level: int
+    page_reference: Optional[int] = None
+    children: List["NavigationSection"] = Field(default_factory=list)
+
+
+class CrossReference(BaseModel):
+    """A reference from one section to another"""
+    from_section: str
+    to_section: str
+    reference_type: str
+
+
+class NavigationStructure(BaseModel):
+    """Hierarchical navigation structure of a mortgage document"""
+    root_sections: List[NavigationSection]
+    cross_references: List[CrossReference] = Field(default_factory=list)
+
+
+class DecisionNode(BaseModel):
+    """A decision condition; LEAF nodes carry the final outcome"""
+    condition: str
+    outcome_type: Literal["BRANCH", "LEAF"]
+    final_outcome: Optional[Literal["APPROVE", "DECLINE", "REFER"]] = None
+    next_conditions: List["DecisionNode"] = Field(default_factory=list)
+
+
+class DecisionTree(BaseModel):
+    """A decision tree from its entry point to its outcomes"""
+    tree_id: str
+    root_condition: str
+    branches: List[DecisionNode]
+
+
+class DecisionTrees(BaseModel):
+    """Decision trees extracted from mortgage content"""
+    decision_trees: List[DecisionTree]
+
+
+class ExtractedEntity(BaseModel):
+    """A mortgage-specific entity with its navigation context"""
+    entity_id: str
+    entity_type: str
+    value: str
+    normalized_value: Optional[str] = None
+    unit: Optional[str] = None
+    confidence: float = Field(ge=0.0, le=1.0)
+    navigation_path: str
+    source_chunk_id: Optional[str] = None
+    related_entities: List[str] = Field(default_factory=list)
+    validation_rules: List[str] = Field(default_factory=list)
+
+
+class EntityExtraction(BaseModel):
+    """Entities extracted from mortgage content"""
+    extracted_entities: List[ExtractedEntity]
+
+
+class EntityRelationship(BaseModel):
+    """A relationship between two extracted entities"""
+    relationship_id: str
+    relationship_type: str
+    source_entity_id: str
+    target_entity_id: str
+    relationship_strength: float = Field(ge=0.0, le=1.0)
+    conditions: List[str] = Field(default_factory=list)
+    navigation_context: Optional[str] = None
+
+
+class RelationshipExtraction(BaseModel):
+    """Relationships extracted between entities and decision elements"""
+    entity_relationships: List[EntityRelationship]
+
+
+class ValidationResult(BaseModel):
+    """Outcome of one validation check"""
+    validation_type: str
+    status: Literal["PASS", "FAIL", "WARNING"]
+    quality_score: float = Field(ge=0.0, le=1.0)
+    issues: List[str] = Field(default_factory=list)
+    suggestions: List[str] = Field(default_factory=list)
+
+
+class ValidationReport(BaseModel):
+    """Validation results for extracted document information"""
+    validation_results: List[ValidationResult]
+    overall_quality_score: float = Field(ge=0.0, le=1.0)
+    completeness_percentage: float = Field(ge=0.0, le=100.0)
+
+
+class QualityDimension(BaseModel):
+    """Assessment of one quality dimension"""
+    score: float = Field(ge=0.0, le=1.0)
+    criteria: str
+    strengths: List[str] = Field(default_factory=list)
+    improvements: List[str] = Field(default_factory=list)
+    recommendations: List[str] = Field(default_factory=list)
+
+
+class OverallQuality(BaseModel):
+    """Overall quality rating"""
+    score: float = Field(ge=0.0, le=1.0)
+    rating: str
+    summary: str
+
+
+class QualityAssessment(BaseModel):
+    """Quality scores per dimension, e.g. accuracy or completeness"""
+    dimensions: Dict[str, QualityDimension]
+    overall_quality: OverallQuality
+
+
+class QualityReport(BaseModel):
+    """Quality assessment of mortgage document processing results"""
+    quality_assessment: QualityAssessment
+
+
+OUTPUT_SCHEMAS: Dict[PromptType, Type[BaseModel]] = {
+    PromptType.NAVIGATION: NavigationStructure,
+    PromptType.DECISION_TREE: DecisionTrees,
+    PromptType.ENTITY_EXTRACTION: EntityExtraction,
+    PromptType.RELATIONSHIP: RelationshipExtraction,
+    PromptType.VALIDATION: ValidationReport,
+    PromptType.QUALITY_ASSESSMENT: QualityReport,
+}
+
+
+def get_output_schema(prompt_type: PromptType) -> Type[BaseModel]:
+    """Get the structured output schema for a prompt type"""
+    return OUTPUT_SCHEMAS[prompt_type]
@@ -1,10 +1,15 @@
 # Task 16: Enhanced Processing Prompts Implementation
 # Specialized prompts for mortgage document processing with domain expertise
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Mapping, Sequence, Iterable
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+from string import Formatter
+from types import MappingProxyType
 import json
+import re
 from datetime import datetime
 
 # Import existing entities and models
@@ -14,6 +19,45 @@ from src.entities.navigation_models import (
     QualityRating
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Rough characters per token when tiktoken is not installed
+_CHARS_PER_TOKEN = 4
+
+
+# Shared immutable defaults for optional template fields, so templates that
+# leave them unset don't each allocate an empty list or dict
+_EMPTY: Tuple[str, ...] = ()
+_EMPTY_MAPPING: Mapping[str, str] = MappingProxyType({})
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    """Tokenizer used for template token counts"""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens in text, estimating from its length without tiktoken"""
+    if tiktoken is not None:
+        return len(_token_encoding().encode(text))
+    return len(text) // _CHARS_PER_TOKEN
+
+
+def _dumps_json(value: Any) -> str:
+    """Serialize prompt inputs to JSON text, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
 
 class PromptType(Enum):
     """Types of prompts for different processing stages"""
@@ -34,7 +78,48 @@ class MortgageCategory(Enum):
     UNIVERSAL = "UNIVERSAL"  # Common patterns across all categories
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _category_suffix(category: MortgageCategory) -> str:
+    """Template key suffix for a mortgage category, e.g. "nqm" for NQM"""
+    return category.value.lower()
+
+
+class _PlaceholderDict(dict):
+    """Format mapping that leaves placeholders without a value in place"""
+    
+    def __missing__(self, key: str) -> str:
+        return f"{{{key}}}"
+
+
+def _split_static_prefix(compiled: str) -> Tuple[str, str]:
+    """Split a format string at its first placeholder
+    
+    Returns:
+        Tuple of (literal text before the first placeholder, format string
+        for the rest)
+    """
+    prefix = []
+    for literal, field_name, _, _ in Formatter().parse(compiled):
+        prefix.append(literal)
+        if field_name is not None:
+            static = "".join(prefix)
+            # Every brace before the first placeholder is escaped (doubled)
+            offset = len(static.replace("{", "{{").replace("}", "}}"))
+            return static, compiled[offset:]
+    
+    # No placeholders: the whole template is static
+    return "".join(prefix), ""
+
+
+# The "Return ... JSON format:" line and the example object that follows it
+_OUTPUT_EXAMPLE = re.compile(r"^Return [^\n]*:\n\{\{\n.*?^\}\}\n", re.MULTILINE | re.DOTALL)
+
+# Replaces the example object when the output schema is passed to the LLM
+# as a structured output definition
+_STRUCTURED_OUTPUT_INSTRUCTION = "Return the result in the provided output schema.\n"
+
+
+@dataclass(slots=True)
 class PromptTemplate:
     """Template for generating specialized prompts"""
     template_id: str
@@ -42,45 +127,140 @@ class PromptTemplate:
     mortgage_category: MortgageCategory
     base_template: str
     context_variables: List[str] = field(default_factory=list)
-    domain_specific_instructions: Dict[str, str] = field(default_factory=dict)
-    examples: List[str] = field(default_factory=list)
-    validation_criteria: List[str] = field(default_factory=list)
-    performance_hints: List[str] = field(default_factory=list)
+    domain_specific_instructions: Mapping[str, str] = field(default_factory=lambda: _EMPTY_MAPPING)
+    examples: Sequence[str] = field(default_factory=lambda: _EMPTY)
+    validation_criteria: Sequence[str] = field(default_factory=lambda: _EMPTY)
+    _static_prefix: str = field(init=False, repr=False, compare=False)
+    _compiled: str = field(init=False, repr=False, compare=False)
+    _static_suffix: str = field(init=False, repr=False, compare=False)
+    _structured_prefix: str = field(init=False, repr=False, compare=False)
+    _system_prompt: str = field(init=False, repr=False, compare=False)
+    _prefix_token_count: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Compile base_template into a format string once: every brace is
+        # escaped, then only the context variable placeholders are reopened,
+        # so the rest of the template (JSON examples) is copied verbatim
+        compiled = self.base_template.replace("{", "{{").replace("}", "}}")
+        for var in self.context_variables:
+            compiled = compiled.replace(f"{{{{{var}}}}}", f"{{{var}}}")
+        
+        # Text before the first placeholder is identical for every prompt
+        self._static_prefix, self._compiled = _split_static_prefix(compiled)
+        
+        # Instructions, examples and validation criteria do not depend on
+        # the context, so that part of the prompt is built once
+        self._static_suffix = self._build_static_suffix()
+        
+        # With native structured output the schema is sent separately, so the
+        # JSON example in the instructions is dropped
+        self._structured_prefix = _OUTPUT_EXAMPLE.sub(
+            _STRUCTURED_OUTPUT_INSTRUCTION, self._static_prefix, count=1
+        )
+        
+        # Templates list their inputs last, so everything before the line of
+        # the first placeholder is the instruction text
+        instructions = self._static_prefix[:self._static_prefix.rfind("\n") + 1]
+        self._system_prompt = instructions.strip() + self._static_suffix
+    
+    @property
+    def prefix_token_count(self) -> int:
+        """Token length of the static prefix, counted on first use
+        
+        Not counted at construction: loading the tiktoken encoding can
+        download its BPE file, which must not happen on import.
+        """
+        if self._prefix_token_count is None:
+            self._prefix_token_count = _count_tokens(self._static_prefix)
+        return self._prefix_token_count
     
     def generate_prompt(self, context: Dict[str, Any]) -> str:
         """Generate a complete prompt from template and context"""
-        prompt = self.base_template
+        # One join allocates the final prompt once, rather than copying the
+        # body into intermediate strings for each concatenation
+        return "".join((self._static_prefix, self._format_body(context), self._static_suffix))
+    
+    def generate_structured_prompt(self, context: Dict[str, Any]) -> str:
+        """Generate the prompt without its JSON output example
         
-        # Replace context variables
-        for var in self.context_variables:
-            if var in context:
-                prompt = prompt.replace(f"{{{var}}}", str(context[var]))
+        For use with native structured output, where the output schema
+        (see guidelines_output_schemas) is passed to the LLM instead.
+        """
+        return "".join((self._structured_prefix, self._format_body(context), self._static_suffix))
+    
+    def generate_prompts_batch(self, contexts: Iterable[Dict[str, Any]]) -> List[str]:
+        """Generate one prompt per context, resolving the template parts once"""
+        # Only context variable placeholders are open in the compiled body,
+        # so other keys in a context are ignored by format_map
+        prefix, fmt, suffix = self._static_prefix, self._compiled.format_map, self._static_suffix
+        join = "".join
+        return [join((prefix, fmt(_PlaceholderDict(context)), suffix)) for context in contexts]
+    
+    def generate_prompt_blocks(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate the prompt as Anthropic content blocks
+        
+        The context-independent prefix of the template is a separate block
+        marked for prompt caching; joining the block texts gives the same
+        prompt as generate_prompt.
+        """
+        blocks = []
+        if self._static_prefix:
+            blocks.append({
+                "type": "text",
+                "text": self._static_prefix,
+                "cache_control": {"type": "ephemeral"}
+            })
+        blocks.append({"type": "text", "text": self._generate_dynamic(context)})
+        return blocks
+    
+    def generate_messages(self, inputs: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Generate chat messages with the inputs passed as data
+        
+        The system message holds the template instructions and is the same on
+        every call; the context variables are sent as a JSON user message
+        instead of being formatted into the prompt.
+        """
+        payload = {var: inputs[var] for var in self.context_variables if var in inputs}
+        return [
+            {"role": "system", "content": self._system_prompt},
+            {"role": "user", "content": _dumps_json(payload)}
+        ]
+    
+    def _generate_dynamic(self, context: Dict[str, Any]) -> str:
+        """Generate the part of the prompt from the first placeholder on"""
+        return self._format_body(context) + self._static_suffix
+    
+    def _format_body(self, context: Dict[str, Any]) -> str:
+        """Substitute context variables into the compiled template body"""
+        # Substitute context variables in a single pass
+        values = _PlaceholderDict(
+            (var, context[var]) for var in self.context_variables if var in context
+        )
+        return self._compiled.format_map(values)
+    
+    def _build_static_suffix(self) -> str:
+        """Build the instructions, examples and validation sections"""
+        parts = []
         
         # Add domain-specific instructions
         if self.domain_specific_instructions:
-            instructions = "\n\nDomain-Specific Instructions:\n"
-            for key, instruction in self.domain_specific_instructions.items():
-                instructions += f"- {key}: {instruction}\n"
-            prompt += instructions
+            parts.append("\n\nDomain-Specific Instructions:\n")
+            parts.extend(f"- {key}: {instruction}\n" for key, instruction in self.domain_specific_instructions.items())
         
         # Add examples if available
         if self.examples:
-            examples_section = "\n\nExamples:\n"
-            for i, example in enumerate(self.examples, 1):
-                examples_section += f"{i}. {example}\n"
-            prompt += examples_section
+            parts.append("\n\nExamples:\n")
+            parts.extend(f"{i}. {example}\n" for i, example in enumerate(self.examples, 1))
         
         # Add validation criteria
         if self.validation_criteria:
-            validation_section = "\n\nValidation Criteria:\n"
-            for criterion in self.validation_criteria:
-                validation_section += f"- {criterion}\n"
-            prompt += validation_section
+            parts.append("\n\nValidation Criteria:\n")
+            parts.extend(f"- {criterion}\n" for criterion in self.validation_criteria)
         
-        return prompt
+        return "".join(parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class PromptContext:
     """Context information for prompt generation"""
     document_type: str
@@ -92,7 +272,7 @@ class PromptContext:
     processing_hints: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PromptMetrics:
     """Metrics for prompt performance and optimization"""
     prompt_id: str
@@ -108,11 +288,26 @@ class PromptMetrics:
 class GuidelinesPromptEngine:
     """Engine for generating specialized mortgage document processing prompts"""
     
+    # Upper bound on tracked prompt metrics; least recently updated entries
+    # are evicted first
+    MAX_TRACKED_METRICS = 10_000
+    
+    # Shortest prefix, in tokens, that Anthropic prompt caching will cache
+    MIN_CACHEABLE_TOKENS = 1024
+    
     def __init__(self):
         self.templates: Dict[str, PromptTemplate] = {}
-        self.metrics: Dict[str, PromptMetrics] = {}
+        self.metrics: "OrderedDict[str, PromptMetrics]" = OrderedDict()
+        # Shared template bodies, by module name; templates for different
+        # mortgage categories reuse one module so their prompts start with
+        # an identical, cacheable prefix
+        self.module_registry: Dict[str, str] = {}
         self._initialize_templates()
     
+    def _register_module(self, name: str, text: str) -> str:
+        """Register a shared template body, returning the registered text"""
+        return self.module_registry.setdefault(name, text)
+    
     def _initialize_templates(self):
         """Initialize all prompt templates"""
         # Navigation extraction templates
@@ -132,6 +327,14 @@ class GuidelinesPromptEngine:
         
         # Quality assessment templates
         self._create_quality_templates()
+        
+        # Navigation template per mortgage category, falling back to the
+        # universal template for categories without a specialized one
+        universal_nav = self.templates["nav_universal"]
+        self._nav_by_category: Dict[MortgageCategory, PromptTemplate] = {
+            category: self.templates.get(f"nav_{_category_suffix(category)}", universal_nav)
+            for category in MortgageCategory
+        }
     
     def _create_navigation_templates(self):
         """Create navigation extraction prompt templates"""
@@ -141,12 +344,9 @@ class GuidelinesPromptEngine:
             template_id="nav_universal",
             prompt_type=PromptType.NAVIGATION,
             mortgage_category=MortgageCategory.UNIVERSAL,
-            base_template="""
+            base_template=self._register_module("navigation", """
 Extract the hierarchical navigation structure from this mortgage document.
 
-Document Type: {document_type}
-Content: {content}
-
 Extract the following navigation elements:
 1. Main sections and subsections with proper hierarchy
 2. Section numbers and titles
@@ -183,7 +383,10 @@ Return the navigation structure as a JSON object with the following format:
         }}
     ]
 }}
-""",
+
+Document Type: {document_type}
+Content: {content}
+"""),
             context_variables=["document_type", "content"],
             domain_specific_instructions={
                 "mortgage_focus": "Pay special attention to loan programs, borrower requirements, and approval criteria sections",
@@ -204,7 +407,7 @@ Return the navigation structure as a JSON object with the following format:
             template_id="nav_nqm",
             prompt_type=PromptType.NAVIGATION,
             mortgage_category=MortgageCategory.NQM,
-            base_template=universal_nav.base_template,
+            base_template=self.module_registry["navigation"],
             context_variables=["document_type", "content"],
             domain_specific_instructions={
                 "nqm_focus": "Focus on Non-QM specific sections: Bank Statement programs, Asset Depletion, P&L programs",
@@ -227,12 +430,9 @@ Return the navigation structure as a JSON object with the following format:
             template_id="decision_universal",
             prompt_type=PromptType.DECISION_TREE,
             mortgage_category=MortgageCategory.UNIVERSAL,
-            base_template="""
+            base_template=self._register_module("decision_tree", """
 Extract complete decision trees from this mortgage content with mandatory outcomes.
 
-Content: {content}
-Navigation Context: {navigation_context}
-
 Extract decision trees that include:
 1. ROOT nodes: Entry points to decision processes
 2. BRANCH nodes: Decision points with specific conditions
@@ -278,7 +478,10 @@ Return decision trees in JSON format:
 }}
 
 CRITICAL: Every decision path MUST end with one of: APPROVE, DECLINE, or REFER.
-""",
+
+Content: {content}
+Navigation Context: {navigation_context}
+"""),
             context_variables=["content", "navigation_context"],
             domain_specific_instructions={
                 "completeness_requirement": "Every decision tree must have complete paths with guaranteed outcomes",
@@ -301,12 +504,9 @@ CRITICAL: Every decision path MUST end with one of: APPROVE, DECLINE, or REFER.
             template_id="entity_universal", 
             prompt_type=PromptType.ENTITY_EXTRACTION,
             mortgage_category=MortgageCategory.UNIVERSAL,
-            base_template="""
+            base_template=self._register_module("entity_extraction", """
 Extract mortgage-specific entities from this content with navigation context preservation.
 
-Content: {content}
-Navigation Context: {navigation_context}
-
 Extract the following entity types:
 1. LOAN_PROGRAM: Specific loan programs (FHA, VA, USDA, Conventional, etc.)
 2. BORROWER_TYPE: Borrower classifications (first-time buyer, investor, etc.)
@@ -343,7 +543,10 @@ Return entities in JSON format:
         }}
     ]
 }}
-""",
+
+Content: {content}
+Navigation Context: {navigation_context}
+"""),
             context_variables=["content", "navigation_context"],
             domain_specific_instructions={
                 "domain_vocabulary": "Use mortgage industry standard terminology and classifications",
@@ -366,13 +569,9 @@ Return entities in JSON format:
             template_id="relationship_universal",
             prompt_type=PromptType.RELATIONSHIP,
             mortgage_category=MortgageCategory.UNIVERSAL,
-            base_template="""
+            base_template=self._register_module("relationship", """
 Extract relationships between entities and decision elements in this mortgage content.
 
-Content: {content}
-Extracted Entities: {extracted_entities}
-Navigation Context: {navigation_context}
-
 Identify the following relationship types:
 1. ENTITY_DEPENDENCY: Entities that depend on other entities
 2. DECISION_DEPENDENCY: Entities that influence decision outcomes
@@ -401,7 +600,11 @@ Return relationships in JSON format:
         }}
     ]
 }}
-""",
+
+Content: {content}
+Extracted Entities: {extracted_entities}
+Navigation Context: {navigation_context}
+"""),
             context_variables=["content", "extracted_entities", "navigation_context"],
             validation_criteria=[
                 "All referenced entities must exist",
@@ -419,13 +622,9 @@ Return relationships in JSON format:
             template_id="validation_universal",
             prompt_type=PromptType.VALIDATION,
             mortgage_category=MortgageCategory.UNIVERSAL,
-            base_template="""
+            base_template=self._register_module("validation", """
 Validate the completeness and consistency of extracted mortgage document information.
 
-Extracted Data: {extracted_data}
-Navigation Structure: {navigation_structure}
-Decision Trees: {decision_trees}
-
 Validate the following aspects:
 1. Navigation structure completeness and consistency
 2. Decision tree completeness (all paths end with outcomes)
@@ -461,7 +660,11 @@ Return validation results in JSON format:
     "overall_quality_score": 0.87,
     "completeness_percentage": 92.5
 }}
-""",
+
+Extracted Data: {extracted_data}
+Navigation Structure: {navigation_structure}
+Decision Trees: {decision_trees}
+"""),
             context_variables=["extracted_data", "navigation_structure", "decision_trees"],
             validation_criteria=[
                 "All validation checks must have status and quality score",
@@ -478,12 +681,9 @@ Return validation results in JSON format:
             template_id="quality_universal",
             prompt_type=PromptType.QUALITY_ASSESSMENT,
             mortgage_category=MortgageCategory.UNIVERSAL,
-            base_template="""
+            base_template=self._register_module("quality_assessment", """
 Assess the quality of mortgage document processing results.
 
-Processing Results: {processing_results}
-Expected Standards: {quality_standards}
-
 Assess quality across these dimensions:
 1. Accuracy: Correctness of extracted information
 2. Completeness: Coverage of all required information
@@ -515,7 +715,10 @@ Return quality assessment in JSON format:
         }}
     }}
 }}
-""",
+
+Processing Results: {processing_results}
+Expected Standards: {quality_standards}
+"""),
             context_variables=["processing_results", "quality_standards"],
             validation_criteria=[
                 "All quality scores must be between 0.0 and 1.0",
@@ -531,11 +734,7 @@ Return quality assessment in JSON format:
         context: PromptContext
     ) -> str:
         """Generate navigation extraction prompt"""
-        template_key = f"nav_{context.mortgage_category.value.lower()}"
-        if template_key not in self.templates:
-            template_key = "nav_universal"
-        
-        template = self.templates[template_key]
+        template = self._nav_by_category[context.mortgage_category]
         prompt_context = {
             "document_type": context.document_type,
             "content": content
@@ -573,6 +772,13 @@ Return quality assessment in JSON format:
         
         return template.generate_prompt(prompt_context)
     
+    def generate_entity_prompts_batch(self, pairs: Iterable[Tuple[str, str]]) -> List[str]:
+        """Generate entity extraction prompts for (content, navigation_context) pairs"""
+        return self.templates["entity_universal"].generate_prompts_batch(
+            {"content": content, "navigation_context": navigation_context}
+            for content, navigation_context in pairs
+        )
+    
     def generate_relationship_prompt(
         self, 
         content: str, 
@@ -584,7 +790,7 @@ Return quality assessment in JSON format:
         template = self.templates["relationship_universal"]
         prompt_context = {
             "content": content,
-            "extracted_entities": json.dumps(extracted_entities),
+            "extracted_entities": _dumps_json(extracted_entities),
             "navigation_context": navigation_context
         }
         
@@ -599,9 +805,9 @@ Return quality assessment in JSON format:
         """Generate validation prompt for completeness checking"""
         template = self.templates["validation_universal"]
         prompt_context = {
-            "extracted_data": json.dumps(extracted_data),
-            "navigation_structure": json.dumps(navigation_structure),
-            "decision_trees": json.dumps(decision_trees)
+            "extracted_data": _dumps_json(extracted_data),
+            "navigation_structure": _dumps_json(navigation_structure),
+            "decision_trees": _dumps_json(decision_trees)
         }
         
         return template.generate_prompt(prompt_context)
@@ -614,29 +820,81 @@ Return quality assessment in JSON format:
         """Generate quality assessment prompt"""
         template = self.templates["quality_universal"]
         prompt_context = {
-            "processing_results": json.dumps(processing_results),
-            "quality_standards": json.dumps(quality_standards)
+            "processing_results": _dumps_json(processing_results),
+            "quality_standards": _dumps_json(quality_standards)
         }
         
         return template.generate_prompt(prompt_context)
     
+    def generate_structured_prompt(self, template_id: str, inputs: Dict[str, Any]) -> str:
+        """Generate a prompt for structured output, without the JSON example
+        
+        Pair with the schema for the template's prompt type, e.g.
+        llm.with_structured_output(get_output_schema(template.prompt_type)).
+        """
+        return self.templates[template_id].generate_structured_prompt(inputs)
+    
+    def should_cache(self, template_id: str) -> bool:
+        """Whether a template's static prefix is long enough to cache"""
+        return self.templates[template_id].prefix_token_count >= self.MIN_CACHEABLE_TOKENS
+    
+    def generate_relationship_messages(
+        self, 
+        content: str, 
+        extracted_entities: List[str], 
+        navigation_context: str, 
+        context: PromptContext
+    ) -> List[Dict[str, str]]:
+        """Generate relationship extraction messages with a static system prompt"""
+        return self.templates["relationship_universal"].generate_messages({
+            "content": content,
+            "extracted_entities": extracted_entities,
+            "navigation_context": navigation_context
+        })
+    
+    def generate_validation_messages(
+        self, 
+        extracted_data: Dict[str, Any], 
+        navigation_structure: Dict[str, Any], 
+        decision_trees: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """Generate validation messages with a static system prompt"""
+        return self.templates["validation_universal"].generate_messages({
+            "extracted_data": extracted_data,
+            "navigation_structure": navigation_structure,
+            "decision_trees": decision_trees
+        })
+    
+    def generate_quality_messages(
+        self, 
+        processing_results: Dict[str, Any], 
+        quality_standards: Dict[str, float]
+    ) -> List[Dict[str, str]]:
+        """Generate quality assessment messages with a static system prompt"""
+        return self.templates["quality_universal"].generate_messages({
+            "processing_results": processing_results,
+            "quality_standards": quality_standards
+        })
+    
     def optimize_prompts(self, metrics: Dict[str, PromptMetrics]) -> Dict[str, str]:
         """Optimize prompts based on performance metrics"""
         optimizations = {}
         
         for prompt_id, metric in metrics.items():
-            if metric.output_quality_score < 0.8:
-                suggestions = []
-                
-                if metric.extraction_accuracy < 0.85:
-                    suggestions.append("Add more specific domain examples")
-                    suggestions.append("Enhance validation criteria")
-                
-                if metric.consistency_score < 0.8:
-                    suggestions.append("Improve logical flow instructions")
-                    suggestions.append("Add consistency validation checks")
-                
-                optimizations[prompt_id] = suggestions
+            if metric.output_quality_score >= 0.8:
+                continue
+            
+            suggestions = []
+            
+            if metric.extraction_accuracy < 0.85:
+                suggestions.append("Add more specific domain examples")
+                suggestions.append("Enhance validation criteria")
+            
+            if metric.consistency_score < 0.8:
+                suggestions.append("Improve logical flow instructions")
+                suggestions.append("Add consistency validation checks")
+            
+            optimizations[prompt_id] = suggestions
         
         return optimizations
     
@@ -667,40 +925,51 @@ Return quality assessment in JSON format:
             metric.execution_time_ms = execution_time
             metric.output_quality_score = quality_score
             metric.extraction_accuracy = accuracy
+            self.metrics.move_to_end(prompt_id)
+        
+        if len(self.metrics) > self.MAX_TRACKED_METRICS:
+            self.metrics.popitem(last=False)
+
+
+# Shared engine for the convenience functions; templates are immutable after
+# initialization, so one instance serves every call
+_ENGINE = GuidelinesPromptEngine()
+
+
+@lru_cache(maxsize=16)
+def _to_category(mortgage_category: str) -> MortgageCategory:
+    """Coerce a category name to MortgageCategory, caching the enum lookup"""
+    return MortgageCategory(mortgage_category)
 
 
 # Convenience functions for easy integration
 def create_navigation_prompt(content: str, document_type: str, mortgage_category: str = "UNIVERSAL") -> str:
     """Create navigation extraction prompt"""
-    engine = GuidelinesPromptEngine()
     context = PromptContext(
         document_type=document_type,
-        mortgage_category=MortgageCategory(mortgage_category)
+        mortgage_category=_to_category(mortgage_category)
     )
-    return engine.generate_navigation_prompt(content, context)
+    return _ENGINE.generate_navigation_prompt(content, context)
 
 
 def create_decision_prompt(content: str, navigation_context: str) -> str:
     """Create decision tree extraction prompt with outcome guarantees"""
-    engine = GuidelinesPromptEngine()
     context = PromptContext(
         document_type="guidelines",
         mortgage_category=MortgageCategory.UNIVERSAL
     )
-    return engine.generate_decision_prompt(content, navigation_context, context)
+    return _ENGINE.generate_decision_prompt(content, navigation_context, context)
 
 
 def create_entity_prompt(content: str, navigation_context: str) -> str:
     """Create entity extraction prompt with domain expertise"""
-    engine = GuidelinesPromptEngine()
     context = PromptContext(
         document_type="guidelines",
         mortgage_category=MortgageCategory.UNIVERSAL
     )
-    return engine.generate_entity_prompt(content, navigation_context, context)
+    return _ENGINE.generate_entity_prompt(content, navigation_context, context)
 
 
 def create_validation_prompt(extracted_data: Dict[str, Any], navigation_structure: Dict[str, Any], decision_trees: List[Dict[str, Any]]) -> str:
     """Create validation prompt for quality checking"""
-    engine = GuidelinesPromptEngine()
-    return engine.generate_validation_prompt(extracted_data, navigation_structure, decision_trees)
\ No newline at end of file
+    return _ENGINE.generate_validation_prompt(extracted_data, navigation_structure, decision_trees)
\ No newline at end of file
@@ -1,13 +1,20 @@
 # Task 8: Semantic Chunker Implementation
 # This file implements hierarchy-aware semantic chunking using NavigationExtractor output
 
-from typing import List, Dict, Any, Optional, Tuple, Union
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from collections import Counter, defaultdict
+from bisect import bisect_right
 from enum import Enum
+from itertools import combinations
+from operator import itemgetter, le
 import logging
 from datetime import datetime
 import hashlib
+import json
 import re
+import sys
+import threading
 from pathlib import Path
 
 # Import navigation extractor components
@@ -18,6 +25,250 @@ from .navigation_extractor import (
     DocumentFormat
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: with hyperscan installed (x86-64 with SSSE3), language
+# classification of ASCII content runs on a compiled hyperscan database
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+# Precompiled patterns for the per-node chunking helpers
+_HEADING_RE = re.compile(r'^\d+\..*|^[A-Z]+\..*|^#+\s')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+_DECISION_SPLIT_RE = re.compile(r'(?=\b(?:If|When|Unless|Provided that)\b)', re.IGNORECASE)
+_DECISION_LANGUAGE_PATTERN = (
+    r'\b(?:if|when|unless|provided that|approve|decline|refer|must|shall|should|may|cannot)\b'
+)
+_MATRIX_LANGUAGE_PATTERN = r'\b(?:matrix|table|grid|row|column|cell)\b|\|.*\||^\s*[-+]{3,}'
+_REFERENCE_LANGUAGE_PATTERN = (
+    r'\bsee\s+(section|chapter|appendix)\b|\brefer\s+to\b|\bas\s+defined\s+in\b|\baccording\s+to\b'
+)
+_DECISION_LANGUAGE_RE = re.compile(_DECISION_LANGUAGE_PATTERN, re.IGNORECASE)
+_MATRIX_LANGUAGE_RE = re.compile(_MATRIX_LANGUAGE_PATTERN, re.IGNORECASE | re.MULTILINE)
+_REFERENCE_LANGUAGE_RE = re.compile(_REFERENCE_LANGUAGE_PATTERN, re.IGNORECASE)
+# Language kinds in hyperscan pattern ID order, with their patterns
+_LANGUAGE_KINDS = ('decision', 'matrix', 'reference')
+_LANGUAGE_RES = {
+    'decision': _DECISION_LANGUAGE_RE,
+    'matrix': _MATRIX_LANGUAGE_RE,
+    'reference': _REFERENCE_LANGUAGE_RE
+}
+# Named groups for scanning lowercased content for several kinds of language
+# at once, with the kinds each group signals. "refer to" is both decision and
+# reference language, so it has a group of its own. Word groups share one
+# leading \b; table rows only consume their first pipe so words inside a row
+# are still seen by the other groups. Table borders are checked line by line
+# afterwards (_has_table_border), which keeps MULTILINE off the scans
+_LANGUAGE_WORD_GROUPS = (
+    ('refer_to', r'refer\s+to\b', ('decision', 'reference')),
+    ('decision', r'(?:if|when|unless|provided that|approve|decline|refer|must|shall|should|may|cannot)\b',
+     ('decision',)),
+    ('matrix', r'(?:matrix|table|grid|row|column|cell)\b', ('matrix',)),
+    ('reference', r'(?:see\s+(?:section|chapter|appendix)|as\s+defined\s+in|according\s+to)\b',
+     ('reference',))
+)
+_LANGUAGE_TABLE_GROUP = ('table', r'\|(?=.*\|)', ('matrix',))
+_LANGUAGE_GROUP_KINDS = {
+    name: kinds for name, _, kinds in _LANGUAGE_WORD_GROUPS + (_LANGUAGE_TABLE_GROUP,)
+}
+
+
+def _compile_language_scan(kinds: frozenset) -> re.Pattern:
+    """Compile one scan over the language groups signalling any of kinds"""
+    words = '|'.join(
+        f'(?P<{name}>{pattern})' for name, pattern, group_kinds in _LANGUAGE_WORD_GROUPS
+        if kinds.intersection(group_kinds)
+    )
+    alternatives = [rf'\b(?:{words})'] if words else []
+    name, pattern, group_kinds = _LANGUAGE_TABLE_GROUP
+    if kinds.intersection(group_kinds):
+        alternatives.append(f'(?P<{name}>{pattern})')
+    return re.compile('|'.join(alternatives))
+
+
+# A scan for every non-empty set of kinds still to be found
+_LANGUAGE_SCANS = {
+    frozenset(kinds): _compile_language_scan(frozenset(kinds))
+    for size in range(1, len(_LANGUAGE_KINDS) + 1)
+    for kinds in combinations(_LANGUAGE_KINDS, size)
+}
+# Every table border contains two adjacent border characters
+_MATRIX_BORDER_PAIRS = ('--', '++', '-+', '+-')
+# Decision outcomes, which also end complete matrix rows
+_DECISION_OUTCOMES = ('approve', 'decline', 'refer')
+_DECISION_OUTCOME_RE = re.compile(r'approve|decline|refer', re.IGNORECASE)
+
+
+def _pack_ranges(sizes: List[int], limit: int) -> List[Tuple[int, int]]:
+    """Greedily pack consecutive pieces into groups of at most limit
+    
+    A piece starts a new group when adding it would exceed limit; a single
+    piece larger than limit forms its own group.
+    
+    Returns:
+        List of (start, end) index ranges into sizes
+    """
+    ranges = []
+    start = 0
+    current_size = 0
+    for index, size in enumerate(sizes):
+        if current_size + size > limit and index > start:
+            ranges.append((start, index))
+            start = index
+            current_size = size
+        else:
+            current_size += size
+    
+    if start < len(sizes):
+        ranges.append((start, len(sizes)))
+    
+    return ranges
+
+
+
+def _has_table_border(content: str) -> bool:
+    """Check if a line of content starts with a table border like '---' or '+-+'
+    
+    Same as searching ^\\s*[-+]{3,} in MULTILINE mode, without a regex
+    anchoring at every newline.
+    """
+    if not any(pair in content for pair in _MATRIX_BORDER_PAIRS):
+        return False
+    
+    # Split on newlines only: ^ does not match after other line breaks
+    for line in content.split('\n'):
+        head = line.lstrip()[:3]
+        if len(head) == 3 and not head.strip('-+'):
+            return True
+    return False
+
+
+def _compile_language_database():
+    """Compile the language patterns into a hyperscan database
+    
+    Returns None when hyperscan is not installed or cannot compile for this
+    platform.
+    """
+    if hyperscan is None:
+        return None
+    
+    patterns = (_DECISION_LANGUAGE_PATTERN, _MATRIX_LANGUAGE_PATTERN, _REFERENCE_LANGUAGE_PATTERN)
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode('ascii') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            # Each pattern only needs reporting once
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+        )
+    except hyperscan.error:
+        return None
+    return database
+
+
+_LANGUAGE_DATABASE = _compile_language_database()
+
+# Hyperscan scratch space must not be shared between concurrent scans
+_hyperscan_local = threading.local()
+
+
+def _scan_language(content: str,
+                   kinds: Tuple[str, ...] = _LANGUAGE_KINDS,
+                   stop_on_decision: bool = False) -> Dict[str, bool]:
+    """Flag decision, matrix and reference language with hyperscan
+    
+    Only for ASCII content, where hyperscan's word boundaries and case
+    folding agree with the re patterns. The scan stops once all of kinds
+    have been seen, or at the first decision language if stop_on_decision.
+    """
+    found = [False] * len(_LANGUAGE_KINDS)
+    wanted = [_LANGUAGE_KINDS.index(kind) for kind in kinds]
+    
+    def on_match(pattern_id, start, end, flags, context):
+        found[pattern_id] = True
+        # A true return stops the scan
+        return (stop_on_decision and pattern_id == 0) or all(found[i] for i in wanted)
+    
+    scratch = getattr(_hyperscan_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hyperscan_local.scratch = hyperscan.Scratch(_LANGUAGE_DATABASE)
+    try:
+        _LANGUAGE_DATABASE.scan(content.encode('ascii'), match_event_handler=on_match, scratch=scratch)
+    except hyperscan.ScanTerminated:
+        pass
+    return dict(zip(_LANGUAGE_KINDS, found))
+
+
+def _classify_language(content: str,
+                       kinds: Tuple[str, ...] = _LANGUAGE_KINDS,
+                       stop_on_decision: bool = False) -> Dict[str, bool]:
+    """Flag decision, matrix and reference language in content
+    
+    The one classifier behind _determine_chunk_type and the
+    _contains_*_language checks; each flag matches searching the kind's
+    IGNORECASE pattern. Only the flags for kinds are meaningful. The scan
+    stops once all of kinds have been seen, or at the first decision
+    language if stop_on_decision.
+    """
+    if not content.isascii():
+        # Regex case folding goes beyond str.lower() outside ASCII (e.g. 'ı'
+        # and 'ſ' match 'i' and 's'), so the original patterns are used
+        return {kind: _LANGUAGE_RES[kind].search(content) is not None for kind in kinds}
+    
+    if _LANGUAGE_DATABASE is not None:
+        return _scan_language(content, kinds, stop_on_decision)
+    
+    # Each search only looks for the kinds not seen yet, so a kind costs at
+    # most one match however often it occurs (e.g. every pipe of a table)
+    flags = dict.fromkeys(kinds, False)
+    lowered = content.lower()
+    remaining = frozenset(kinds)
+    position = 0
+    while remaining:
+        match = _LANGUAGE_SCANS[remaining].search(lowered, position)
+        if match is None:
+            break
+        found = _LANGUAGE_GROUP_KINDS[match.lastgroup]
+        for kind in found:
+            flags[kind] = True
+        if stop_on_decision and flags.get('decision'):
+            return flags
+        remaining = remaining.difference(found)
+        position = match.end()
+    
+    if 'matrix' in remaining:
+        flags['matrix'] = _has_table_border(content)
+    return flags
+
+
+def _substring_finder(keys: Iterable[str]) -> Callable[[str], Iterable[str]]:
+    """Build a function returning the keys that occur in a text
+    
+    With pyahocorasick installed, all keys are found in a single scan of the
+    text; otherwise each key is checked with a substring search.
+    """
+    keys = list(keys)
+    if ahocorasick is None or len(keys) < 2:
+        return lambda text: [key for key in keys if key in text]
+    
+    automaton = ahocorasick.Automaton()
+    for key in keys:
+        automaton.add_word(key, key)
+    automaton.make_automaton()
+    return lambda text: {key for _, key in automaton.iter(text)}
+
 
 class ChunkType(Enum):
     """Types of semantic chunks"""
@@ -29,7 +280,7 @@ class ChunkType(Enum):
     SUMMARY = "summary"        # Section summaries
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkContext:
     """Context information for a semantic chunk"""
     navigation_path: List[str]              # Full navigation breadcrumb
@@ -44,9 +295,22 @@ class ChunkContext:
     def __post_init__(self):
         if self.related_chunks is None:
             self.related_chunks = []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization"""
+        return {
+            'navigation_path': list(self.navigation_path),
+            'parent_section': self.parent_section,
+            'section_number': self.section_number,
+            'hierarchy_level': self.hierarchy_level,
+            'document_type': self.document_type,
+            'decision_context': self.decision_context,
+            'related_chunks': list(self.related_chunks),
+            'quality_score': self.quality_score
+        }
 
 
-@dataclass 
+@dataclass(slots=True)
 class SemanticChunk:
     """A hierarchy-aware semantic chunk"""
     chunk_id: str
@@ -59,6 +323,7 @@ class SemanticChunk:
     token_count: int = 0                    # Estimated token count
     overlap_with: List[str] = None          # Overlapping chunk IDs
     metadata: Dict[str, Any] = None         # Additional metadata
+    _content_lower: Optional[Tuple[str, str]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.overlap_with is None:
@@ -66,15 +331,33 @@ class SemanticChunk:
         if self.metadata is None:
             self.metadata = {}
     
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content, computed on first use and kept until content changes"""
+        cached = self._content_lower
+        if cached is None or cached[0] is not self.content:
+            cached = self._content_lower = (self.content, self.content.lower())
+        return cached[1]
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        result = asdict(self)
-        result['chunk_type'] = self.chunk_type.value
-        result['context'] = asdict(self.context)
-        return result
+        # Built field by field: asdict deep-copies every nested value, which
+        # dominates serialization time for large chunking results
+        return {
+            'chunk_id': self.chunk_id,
+            'content': self.content,
+            'chunk_type': self.chunk_type.value,
+            'context': self.context.to_dict(),
+            'node_id': self.node_id,
+            'start_position': self.start_position,
+            'end_position': self.end_position,
+            'token_count': self.token_count,
+            'overlap_with': list(self.overlap_with),
+            'metadata': dict(self.metadata)
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkingResult:
     """Result of semantic chunking operation"""
     chunks: List[SemanticChunk]
@@ -91,6 +374,14 @@ class ChunkingResult:
             'quality_metrics': self.quality_metrics
         }
 
+    def to_bytes(self) -> bytes:
+        """Serialize to UTF-8 JSON bytes, the same document as to_dict()"""
+        if orjson is not None:
+            # orjson encodes the dataclasses and ChunkType natively, so the
+            # intermediate dict tree from to_dict is never built
+            return orjson.dumps(self)
+        return json.dumps(self.to_dict(), ensure_ascii=False).encode('utf-8')
+
 
 class SemanticChunker:
     """Creates hierarchy-aware semantic chunks from navigation structures"""
@@ -145,40 +436,59 @@ class SemanticChunker:
             # Initialize chunking state
             chunks = []
             chunk_relationships = []
+            chunk_ids_by_node = defaultdict(list)
             
             # Create content mapping from navigation nodes
             content_map = self._map_content_to_nodes(navigation_structure, document_content)
             
+            # Navigation path of every node, built once and shared by all
+            # chunks of the node
+            navigation_paths = self._build_navigation_paths(navigation_structure)
+            
+            # Every node except the root, filtered once for chunking and
+            # the processed-node count
+            root_id = navigation_structure.root_node.node_id
+            non_root_items = [
+                (node_id, node) for node_id, node in navigation_structure.nodes.items()
+                if node_id != root_id
+            ]
+            
             # Process each navigation node
-            for node_id, node in navigation_structure.nodes.items():
-                if node_id == navigation_structure.root_node.node_id:
-                    continue  # Skip root node
-                
+            for node_id, node in non_root_items:
                 # Get content for this node
                 node_content = content_map.get(node_id, node.content)
                 if not node_content or len(node_content.strip()) < 10:
                     continue  # Skip empty or trivial content
                 
-                # Create chunks for this node
-                node_chunks = self._create_node_chunks(
+                # Stream chunks for this node into the result, indexing them
+                # for overlap detection and linking consecutive chunks as
+                # they are created
+                node_chunk_ids = chunk_ids_by_node[node.node_id]
+                first_chunk_id = None
+                previous_chunk_id = None
+                for i, chunk in enumerate(self._iter_node_chunks(
                     node, 
                     node_content, 
                     navigation_structure,
-                    document_type
-                )
-                
-                chunks.extend(node_chunks)
+                    document_type,
+                    navigation_paths
+                )):
+                    chunks.append(chunk)
+                    node_chunk_ids.append(chunk.chunk_id)
+                    if previous_chunk_id is None:
+                        first_chunk_id = chunk.chunk_id
+                    else:
+                        chunk_relationships.append(
+                            self._sequential_relationship(previous_chunk_id, chunk.chunk_id, node, i - 1)
+                        )
+                    previous_chunk_id = chunk.chunk_id
                 
-                # Create relationships for node chunks
-                node_relationships = self._create_node_relationships(
-                    node_chunks, 
-                    node, 
-                    navigation_structure
+                chunk_relationships.extend(
+                    self._create_parent_child_relationships(first_chunk_id, node, navigation_structure)
                 )
-                chunk_relationships.extend(node_relationships)
             
             # Post-process chunks
-            chunks = self._post_process_chunks(chunks, navigation_structure)
+            chunks = self._post_process_chunks(chunks, navigation_structure, chunk_ids_by_node)
             
             # Create cross-chunk relationships
             cross_relationships = self._create_cross_chunk_relationships(chunks)
@@ -187,6 +497,9 @@ class SemanticChunker:
             # Calculate quality metrics
             quality_metrics = self._calculate_quality_metrics(chunks, navigation_structure)
             
+            # Chunk type histogram from the counts of the metrics pass
+            type_counts = quality_metrics.get('chunk_type_distribution', {})
+            
             # Create metadata
             chunking_metadata = {
                 'processing_time': (datetime.now() - start_time).total_seconds(),
@@ -194,8 +507,8 @@ class SemanticChunker:
                 'document_type': document_type,
                 'total_chunks': len(chunks),
                 'average_chunk_size': sum(len(c.content) for c in chunks) / len(chunks) if chunks else 0,
-                'navigation_nodes_processed': len([n for n in navigation_structure.nodes.values() if n.node_id != navigation_structure.root_node.node_id]),
-                'chunk_types': {chunk_type.value: len([c for c in chunks if c.chunk_type == chunk_type]) for chunk_type in ChunkType}
+                'navigation_nodes_processed': len(non_root_items),
+                'chunk_types': {chunk_type.value: type_counts.get(chunk_type.value, 0) for chunk_type in ChunkType}
             }
             
             result = ChunkingResult(
@@ -232,30 +545,36 @@ class SemanticChunker:
     
     def add_hierarchical_context(self, 
                                chunk: SemanticChunk, 
-                               navigation_structure: NavigationStructure) -> SemanticChunk:
+                               navigation_structure: NavigationStructure,
+                               navigation_paths: Optional[Dict[str, Tuple[str, ...]]] = None) -> SemanticChunk:
         """Add hierarchical context to a chunk
         
         Args:
             chunk: SemanticChunk to enhance
             navigation_structure: Navigation structure for context
+            navigation_paths: Precomputed navigation paths by node ID, as
+                returned by _build_navigation_paths
             
         Returns:
             Enhanced SemanticChunk with hierarchical context
         """
         try:
-            if not chunk.node_id or chunk.node_id not in navigation_structure.nodes:
+            nodes = navigation_structure.nodes
+            if not chunk.node_id or chunk.node_id not in nodes:
                 return chunk
             
-            node = navigation_structure.nodes[chunk.node_id]
+            node = nodes[chunk.node_id]
             
-            # Build navigation path
-            navigation_path = self._build_navigation_path(node, navigation_structure)
+            # Build navigation path, unless it was precomputed
+            navigation_path = navigation_paths.get(chunk.node_id) if navigation_paths else None
+            if navigation_path is None:
+                navigation_path = self._build_navigation_path(node, navigation_structure)
             
             # Find parent section
             parent_section = None
-            if node.parent_id and node.parent_id in navigation_structure.nodes:
-                parent_node = navigation_structure.nodes[node.parent_id]
-                parent_section = parent_node.title
+            parent_id = node.parent_id
+            if parent_id and parent_id in nodes:
+                parent_section = sys.intern(nodes[parent_id].title)
             
             # Calculate hierarchy level
             hierarchy_level = len(navigation_path) - 1
@@ -266,14 +585,15 @@ class SemanticChunker:
                 decision_context = f"Decision node: {node.decision_type or 'conditional'}"
             
             # Update chunk context
-            chunk.context.navigation_path = navigation_path
-            chunk.context.parent_section = parent_section
-            chunk.context.section_number = node.section_number
-            chunk.context.hierarchy_level = hierarchy_level
-            chunk.context.decision_context = decision_context
+            context = chunk.context
+            context.navigation_path = list(navigation_path)
+            context.parent_section = parent_section
+            context.section_number = sys.intern(node.section_number) if node.section_number else node.section_number
+            context.hierarchy_level = hierarchy_level
+            context.decision_context = decision_context
             
             # Calculate quality score
-            chunk.context.quality_score = self._calculate_chunk_quality(chunk, node)
+            context.quality_score = self._calculate_chunk_quality(chunk, node)
             
             return chunk
             
@@ -289,8 +609,15 @@ class SemanticChunker:
                           navigation_structure: NavigationStructure,
                           document_type: str) -> List[SemanticChunk]:
         """Create chunks for a single navigation node"""
-        chunks = []
-        
+        return list(self._iter_node_chunks(node, content, navigation_structure, document_type))
+    
+    def _iter_node_chunks(self, 
+                          node: NavigationNode,
+                          content: str, 
+                          navigation_structure: NavigationStructure,
+                          document_type: str,
+                          navigation_paths: Optional[Dict[str, Tuple[str, ...]]] = None) -> Iterator[SemanticChunk]:
+        """Yield the chunks for a single navigation node as they are created"""
         # Determine chunk type based on node characteristics
         chunk_type = self._determine_chunk_type(node, content, document_type)
         
@@ -300,9 +627,21 @@ class SemanticChunker:
         # Split content into chunks if needed
         content_chunks = self._split_content_intelligently(clean_content, node, chunk_type)
         
+        # Bound once for the per-chunk loop
+        document_type = sys.intern(document_type)
+        chars_per_token = self.chars_per_token
+        add_hierarchical_context = self.add_hierarchical_context
+        node_id = node.node_id
+        chunk_id_prefix = self._chunk_id_prefix(node)
+        base_metadata = {
+            'source_node_title': node.title,
+            'source_node_level': node.level.value
+        }
+        total_chunks = len(content_chunks)
+        
         for i, chunk_content in enumerate(content_chunks):
             # Generate chunk ID
-            chunk_id = self._generate_chunk_id(node, i)
+            chunk_id = f"{chunk_id_prefix}{i:03d}"
             
             # Create initial context
             context = ChunkContext(
@@ -316,22 +655,17 @@ class SemanticChunker:
                 content=chunk_content,
                 chunk_type=chunk_type,
                 context=context,
-                node_id=node.node_id,
-                token_count=len(chunk_content) // self.chars_per_token,
+                node_id=node_id,
+                token_count=len(chunk_content) // chars_per_token,
                 metadata={
-                    'source_node_title': node.title,
-                    'source_node_level': node.level.value,
+                    **base_metadata,
                     'chunk_index': i,
-                    'total_chunks_for_node': len(content_chunks)
+                    'total_chunks_for_node': total_chunks
                 }
             )
             
             # Add hierarchical context
-            chunk = self.add_hierarchical_context(chunk, navigation_structure)
-            
-            chunks.append(chunk)
-        
-        return chunks
+            yield add_hierarchical_context(chunk, navigation_structure, navigation_paths)
     
     def _map_content_to_nodes(self, 
                             navigation_structure: NavigationStructure,
@@ -339,25 +673,26 @@ class SemanticChunker:
         """Map document content to navigation nodes"""
         content_map = {}
         
+        # Document lines and heading line indices, computed on first use
+        lines = None
+        heading_lines = None
+        
         # Simple approach: use existing node content or extract based on line numbers
         for node_id, node in navigation_structure.nodes.items():
             if node.content:
                 content_map[node_id] = node.content
             elif node.metadata.get('line_number'):
+                if lines is None:
+                    lines = document_content.split('\n')
+                    heading_lines = [i for i, line in enumerate(lines) if self._is_heading_line(line)]
+                
                 # Extract content around the line number
-                lines = document_content.split('\n')
                 line_num = node.metadata['line_number'] - 1  # Convert to 0-based
                 
                 # Extract content from this line to next heading or end
                 start_line = max(0, line_num)
-                end_line = len(lines)
-                
-                # Find next heading to determine end
-                for i in range(start_line + 1, len(lines)):
-                    line = lines[i].strip()
-                    if self._is_heading_line(line):
-                        end_line = i
-                        break
+                next_heading = bisect_right(heading_lines, start_line)
+                end_line = heading_lines[next_heading] if next_heading < len(heading_lines) else len(lines)
                 
                 # Extract content
                 section_content = '\n'.join(lines[start_line:end_line])
@@ -372,15 +707,20 @@ class SemanticChunker:
         """Determine the type of chunk based on node and content characteristics"""
         
         # Check for decision indicators
-        if (node.metadata.get('decision_indicator') or 
-            node.decision_type or 
-            self._contains_decision_language(content)):
+        if node.metadata.get('decision_indicator') or node.decision_type:
             return ChunkType.DECISION
         
+        # Decision language outranks everything else, so the scan can stop
+        # at the first decision word
+        language = _classify_language(content, stop_on_decision=True)
+        if language['decision']:
+            return ChunkType.DECISION
+        if language['matrix']:
+            return ChunkType.MATRIX
+        has_reference = language['reference']
+        
         # Check for matrix content
-        if (document_type == "matrix" or 
-            "matrix" in node.title.lower() or
-            self._contains_matrix_language(content)):
+        if document_type == "matrix" or "matrix" in node.title.lower():
             return ChunkType.MATRIX
         
         # Check for headers (short content, title-like)
@@ -390,7 +730,7 @@ class SemanticChunker:
             return ChunkType.HEADER
         
         # Check for references
-        if self._contains_reference_language(content):
+        if has_reference:
             return ChunkType.REFERENCE
         
         # Default to content
@@ -425,27 +765,11 @@ class SemanticChunker:
     
     def _split_decision_content(self, content: str) -> List[str]:
         """Split decision content by logical decision units"""
-        chunks = []
-        
-        # Split by decision keywords
-        decision_patterns = [
-            r'(?=\bIf\b)',
-            r'(?=\bWhen\b)', 
-            r'(?=\bUnless\b)',
-            r'(?=\bProvided that\b)'
-        ]
-        
-        for pattern in decision_patterns:
-            parts = re.split(pattern, content, flags=re.IGNORECASE)
-            if len(parts) > 1:
-                # First part might be introduction
-                if parts[0].strip():
-                    chunks.append(parts[0].strip())
-                # Rest are decision units
-                for part in parts[1:]:
-                    if part.strip():
-                        chunks.append(part.strip())
-                return chunks
+        # Split before every decision keyword in one pass; the first part
+        # might be an introduction, the rest are decision units
+        parts = _DECISION_SPLIT_RE.split(content)
+        if len(parts) > 1:
+            return [part.strip() for part in parts if part.strip()]
         
         # Fallback to paragraph splitting
         return self._split_by_paragraphs(content)
@@ -456,18 +780,23 @@ class SemanticChunker:
         lines = content.split('\n')
         chunks = []
         current_chunk = []
+        # Length of the current chunk joined with newlines, kept as a running
+        # total so the text is only joined once the chunk is complete
+        current_size = -1
         
         for line in lines:
             current_chunk.append(line)
+            current_size += len(line) + 1
             
             # Check if this completes a logical unit
-            chunk_text = '\n'.join(current_chunk)
-            if (len(chunk_text) >= self.target_chunk_size or
+            if (current_size >= self.target_chunk_size or
                 self._is_matrix_row_complete(line)):
                 
-                if len(chunk_text.strip()) > 0:
-                    chunks.append(chunk_text.strip())
+                chunk_text = '\n'.join(current_chunk).strip()
+                if chunk_text:
+                    chunks.append(chunk_text)
                 current_chunk = []
+                current_size = -1
         
         # Add remaining content
         if current_chunk:
@@ -479,27 +808,11 @@ class SemanticChunker:
     
     def _split_by_paragraphs(self, content: str) -> List[str]:
         """Split content by paragraphs with intelligent sizing"""
-        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-        
-        chunks = []
-        current_chunk = []
-        current_size = 0
-        
-        for paragraph in paragraphs:
-            para_size = len(paragraph)
-            
-            # If adding this paragraph exceeds target size, finalize current chunk
-            if current_size + para_size > self.target_chunk_size and current_chunk:
-                chunks.append('\n\n'.join(current_chunk))
-                current_chunk = [paragraph]
-                current_size = para_size
-            else:
-                current_chunk.append(paragraph)
-                current_size += para_size
+        paragraphs = [p for p in (p.strip() for p in content.split('\n\n')) if p]
         
-        # Add remaining chunk
-        if current_chunk:
-            chunks.append('\n\n'.join(current_chunk))
+        # Pack paragraphs up to the target size, joining each group once
+        ranges = _pack_ranges([len(p) for p in paragraphs], self.target_chunk_size)
+        chunks = ['\n\n'.join(paragraphs[start:end]) for start, end in ranges]
         
         return chunks if chunks else [content]
     
@@ -534,61 +847,45 @@ class SemanticChunker:
     
     def _split_oversized_chunk(self, chunk: str) -> List[str]:
         """Split an oversized chunk while preserving sentence boundaries"""
-        sentences = re.split(r'(?<=[.!?])\s+', chunk)
-        
-        chunks = []
-        current_chunk = []
-        current_size = 0
-        
-        for sentence in sentences:
-            sentence_size = len(sentence)
-            
-            if current_size + sentence_size > self.max_chunk_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [sentence]
-                current_size = sentence_size
-            else:
-                current_chunk.append(sentence)
-                current_size += sentence_size
-        
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
+        sentences = _SENTENCE_END_RE.split(chunk)
         
-        return chunks
+        ranges = _pack_ranges([len(s) for s in sentences], self.max_chunk_size)
+        return [' '.join(sentences[start:end]) for start, end in ranges]
     
-    def _create_node_relationships(self, 
-                                 chunks: List[SemanticChunk],
+    def _sequential_relationship(self, 
+                                 from_chunk_id: str,
+                                 to_chunk_id: str,
                                  node: NavigationNode,
-                                 navigation_structure: NavigationStructure) -> List[Dict[str, Any]]:
-        """Create relationships for chunks within a node"""
-        relationships = []
-        
-        # Sequential relationships between chunks in same node
-        for i in range(len(chunks) - 1):
-            relationships.append({
-                'from_chunk': chunks[i].chunk_id,
-                'to_chunk': chunks[i + 1].chunk_id,
-                'relationship_type': 'SEQUENTIAL',
+                                 sequence_index: int) -> Dict[str, Any]:
+        """Create the relationship between consecutive chunks of a node"""
+        return {
+            'from_chunk': from_chunk_id,
+            'to_chunk': to_chunk_id,
+            'relationship_type': 'SEQUENTIAL',
+            'metadata': {
+                'source_node': node.node_id,
+                'sequence_index': sequence_index
+            }
+        }
+    
+    def _create_parent_child_relationships(self, 
+                                           first_chunk_id: Optional[str],
+                                           node: NavigationNode,
+                                           navigation_structure: NavigationStructure) -> List[Dict[str, Any]]:
+        """Create relationships from a node's first chunk to its child nodes"""
+        return [
+            {
+                'from_chunk': first_chunk_id,
+                'to_node': child_id,
+                'relationship_type': 'PARENT_CHILD',
                 'metadata': {
-                    'source_node': node.node_id,
-                    'sequence_index': i
+                    'parent_node': node.node_id,
+                    'child_node': child_id
                 }
-            })
-        
-        # Parent-child relationships to chunks in child nodes
-        for child_id in node.children:
-            if child_id in navigation_structure.nodes:
-                relationships.append({
-                    'from_chunk': chunks[0].chunk_id if chunks else None,
-                    'to_node': child_id,
-                    'relationship_type': 'PARENT_CHILD',
-                    'metadata': {
-                        'parent_node': node.node_id,
-                        'child_node': child_id
-                    }
-                })
-        
-        return relationships
+            }
+            for child_id in node.children
+            if child_id in navigation_structure.nodes
+        ]
     
     def _create_cross_chunk_relationships(self, chunks: List[SemanticChunk]) -> List[Dict[str, Any]]:
         """Create relationships between chunks across different nodes"""
@@ -596,13 +893,37 @@ class SemanticChunker:
         
         # Find decision chunks that reference other chunks
         decision_chunks = [c for c in chunks if c.chunk_type == ChunkType.DECISION]
+        if not decision_chunks:
+            return relationships
+        
+        # Index chunk positions by the text a decision chunk must mention to
+        # reference them (see _chunks_are_related), so each distinct section
+        # number or title is checked once per decision chunk
+        positions_by_section = defaultdict(list)
+        positions_by_title = defaultdict(list)
+        for position, chunk in enumerate(chunks):
+            if chunk.context.section_number:
+                positions_by_section[chunk.context.section_number].append(position)
+            elif chunk.context.parent_section:
+                positions_by_title[chunk.context.parent_section.lower()].append(position)
+        
+        # Matchers over all section numbers and titles, built once per batch
+        find_sections = _substring_finder(positions_by_section)
+        find_titles = _substring_finder(positions_by_title)
         
         for decision_chunk in decision_chunks:
             # Look for references to other sections in decision content
-            for other_chunk in chunks:
-                if (other_chunk.chunk_id != decision_chunk.chunk_id and
-                    self._chunks_are_related(decision_chunk, other_chunk)):
-                    
+            related_positions = []
+            for section_number in find_sections(decision_chunk.content):
+                related_positions.extend(positions_by_section[section_number])
+            for title in find_titles(decision_chunk.content_lower):
+                related_positions.extend(positions_by_title[title])
+            
+            # Keep relationships in chunk order
+            related_positions.sort()
+            for position in related_positions:
+                other_chunk = chunks[position]
+                if other_chunk.chunk_id != decision_chunk.chunk_id:
                     relationships.append({
                         'from_chunk': decision_chunk.chunk_id,
                         'to_chunk': other_chunk.chunk_id,
@@ -617,14 +938,16 @@ class SemanticChunker:
     
     def _post_process_chunks(self, 
                            chunks: List[SemanticChunk],
-                           navigation_structure: NavigationStructure) -> List[SemanticChunk]:
+                           navigation_structure: NavigationStructure,
+                           chunk_ids_by_node: Optional[Dict[Optional[str], List[str]]] = None) -> List[SemanticChunk]:
         """Post-process chunks for quality and consistency"""
         
-        # Add overlap information
-        for i, chunk in enumerate(chunks):
-            # Find overlapping chunks
-            overlaps = self._find_overlapping_chunks(chunk, chunks)
-            chunk.overlap_with = overlaps
+        # Add overlap information, computed for all chunks in one sweep over
+        # the node index; create_hierarchical_chunks builds the index while
+        # streaming chunks
+        overlaps = self.compute_all_overlaps(chunks, chunk_ids_by_node)
+        for chunk in chunks:
+            chunk.overlap_with = overlaps[chunk.chunk_id]
         
         # Sort chunks by navigation order
         chunks = self._sort_chunks_by_navigation_order(chunks, navigation_structure)
@@ -635,19 +958,51 @@ class SemanticChunker:
                              node: NavigationNode,
                              navigation_structure: NavigationStructure) -> List[str]:
         """Build full navigation path for a node"""
+        nodes = navigation_structure.nodes
         path = []
         current_node = node
         
+        # Collect titles from the node up to the root, then reverse once
         while current_node:
-            path.insert(0, current_node.title)
+            path.append(current_node.title)
             
-            if current_node.parent_id and current_node.parent_id in navigation_structure.nodes:
-                current_node = navigation_structure.nodes[current_node.parent_id]
+            parent_id = current_node.parent_id
+            if parent_id and parent_id in nodes:
+                current_node = nodes[parent_id]
             else:
                 break
         
+        path.reverse()
         return path
     
+    def _build_navigation_paths(self, navigation_structure: NavigationStructure) -> Dict[str, Tuple[str, ...]]:
+        """Build the navigation path of every node in one pass
+        
+        Each node's path extends its parent's, so every parent chain is
+        walked once rather than once per chunk. Paths are tuples so they can
+        be shared between nodes; titles are interned so equal titles parsed
+        from different places share one string.
+        """
+        nodes = navigation_structure.nodes
+        paths = {}
+        
+        for node_id in nodes:
+            # Walk up to the nearest ancestor whose path is already known
+            chain = []
+            current_id = node_id
+            while current_id is not None and current_id not in paths:
+                chain.append(current_id)
+                parent_id = nodes[current_id].parent_id
+                current_id = parent_id if parent_id and parent_id in nodes else None
+            
+            # Extend that path back down the chain
+            path = paths[current_id] if current_id is not None else ()
+            for chain_id in reversed(chain):
+                path = path + (sys.intern(nodes[chain_id].title),)
+                paths[chain_id] = path
+        
+        return paths
+    
     def _calculate_chunk_quality(self, chunk: SemanticChunk, node: NavigationNode) -> float:
         """Calculate quality score for a chunk"""
         score = 0.8  # Base score
@@ -662,8 +1017,14 @@ class SemanticChunker:
         
         # Bonus for decision chunks with clear outcomes
         if chunk.chunk_type == ChunkType.DECISION:
-            decision_outcomes = ['approve', 'decline', 'refer']
-            if any(outcome in chunk.content.lower() for outcome in decision_outcomes):
+            # Any mention of an outcome, including inflections like "referral";
+            # plain substrings of the lowercased content for ASCII content
+            if chunk.content.isascii():
+                content_lower = chunk.content_lower
+                has_outcome = any(outcome in content_lower for outcome in _DECISION_OUTCOMES)
+            else:
+                has_outcome = _DECISION_OUTCOME_RE.search(chunk.content) is not None
+            if has_outcome:
                 score += 0.05
         
         return min(score, 1.0)
@@ -675,22 +1036,32 @@ class SemanticChunker:
         if not chunks:
             return {'overall_quality': 0.0}
         
-        # Size distribution
-        sizes = [len(chunk.content) for chunk in chunks]
-        avg_size = sum(sizes) / len(sizes)
-        size_variance = sum((size - avg_size) ** 2 for size in sizes) / len(sizes)
+        # Accumulate sizes, quality scores, types and covered nodes in a
+        # single pass over the chunks
+        total_size = 0
+        total_size_squared = 0
+        total_quality = 0.0
+        type_counts = Counter()
+        covered_nodes = set()
+        for chunk in chunks:
+            size = len(chunk.content)
+            total_size += size
+            total_size_squared += size * size
+            total_quality += chunk.context.quality_score
+            type_counts[chunk.chunk_type.value] += 1
+            if chunk.node_id:
+                covered_nodes.add(chunk.node_id)
         
-        # Quality scores
-        quality_scores = [chunk.context.quality_score for chunk in chunks]
-        avg_quality = sum(quality_scores) / len(quality_scores)
+        # Size distribution; sizes are integers, so the sums are exact
+        count = len(chunks)
+        avg_size = total_size / count
+        size_variance = (count * total_size_squared - total_size * total_size) / (count * count)
         
-        # Type distribution
-        type_counts = {}
-        for chunk in chunks:
-            type_counts[chunk.chunk_type.value] = type_counts.get(chunk.chunk_type.value, 0) + 1
+        # Quality scores
+        avg_quality = total_quality / count
         
         # Coverage (how many navigation nodes have chunks)
-        nodes_with_chunks = len(set(chunk.node_id for chunk in chunks if chunk.node_id))
+        nodes_with_chunks = len(covered_nodes)
         total_nodes = len(navigation_structure.nodes) - 1  # Exclude root
         coverage = nodes_with_chunks / total_nodes if total_nodes > 0 else 0
         
@@ -699,7 +1070,7 @@ class SemanticChunker:
             'average_chunk_size': avg_size,
             'size_variance': size_variance,
             'coverage': coverage,
-            'chunk_type_distribution': type_counts,
+            'chunk_type_distribution': dict(type_counts),
             'total_chunks': len(chunks),
             'nodes_covered': nodes_with_chunks,
             'total_nodes': total_nodes
@@ -709,92 +1080,107 @@ class SemanticChunker:
     
     def _clean_content(self, content: str) -> str:
         """Clean and normalize content"""
-        # Remove excessive whitespace
-        content = re.sub(r'\s+', ' ', content)
-        # Remove empty lines
-        content = re.sub(r'\n\s*\n', '\n\n', content)
-        return content.strip()
+        # Collapse every whitespace run, newlines included, to one space and
+        # trim the ends in a single pass
+        return ' '.join(content.split())
     
-    def _generate_chunk_id(self, node: NavigationNode, chunk_index: int) -> str:
-        """Generate unique chunk ID"""
-        base = f"{node.node_id}_chunk_{chunk_index:03d}"
-        return base
+    def _chunk_id_prefix(self, node: NavigationNode) -> str:
+        """Prefix shared by the IDs of a node's chunks"""
+        return f"{node.node_id}_chunk_"
     
     def _is_heading_line(self, line: str) -> bool:
         """Check if a line is a heading"""
-        return bool(re.match(r'^\d+\..*|^[A-Z]+\..*|^#+\s', line.strip()))
+        return bool(_HEADING_RE.match(line.strip()))
+    
+    def _classify_language(self, content: str) -> Dict[str, bool]:
+        """Check content for decision, matrix and reference language at once"""
+        return _classify_language(content)
     
     def _contains_decision_language(self, content: str) -> bool:
         """Check if content contains decision-making language"""
-        decision_patterns = [
-            r'\b(if|when|unless|provided that)\b',
-            r'\b(approve|decline|refer)\b',
-            r'\b(must|shall|should|may|cannot)\b'
-        ]
-        return any(re.search(pattern, content, re.IGNORECASE) for pattern in decision_patterns)
+        return _classify_language(content, ('decision',))['decision']
     
     def _contains_matrix_language(self, content: str) -> bool:
         """Check if content contains matrix/table language"""
-        matrix_patterns = [
-            r'\b(matrix|table|grid)\b',
-            r'\b(row|column|cell)\b',
-            r'\|.*\|',  # Table separator
-            r'^\s*[-+]{3,}'  # Table border
-        ]
-        return any(re.search(pattern, content, re.IGNORECASE | re.MULTILINE) for pattern in matrix_patterns)
+        return _classify_language(content, ('matrix',))['matrix']
     
     def _contains_reference_language(self, content: str) -> bool:
         """Check if content contains reference language"""
-        reference_patterns = [
-            r'\bsee\s+(section|chapter|appendix)\b',
-            r'\brefer\s+to\b',
-            r'\bas\s+defined\s+in\b',
-            r'\baccording\s+to\b'
-        ]
-        return any(re.search(pattern, content, re.IGNORECASE) for pattern in reference_patterns)
+        return _classify_language(content, ('reference',))['reference']
     
     def _is_matrix_row_complete(self, line: str) -> bool:
         """Check if a matrix row is complete"""
-        # Simple heuristic: line ends with decision outcome or separator
-        return bool(re.search(r'(approve|decline|refer|\|)$', line.strip(), re.IGNORECASE))
+        # Simple heuristic: line ends with decision outcome or separator;
+        # only the tail needs lowercasing for the outcome check
+        line = line.rstrip()
+        return line.endswith('|') or line[-7:].lower().endswith(_DECISION_OUTCOMES)
     
     def _chunks_are_related(self, chunk1: SemanticChunk, chunk2: SemanticChunk) -> bool:
         """Check if two chunks are semantically related"""
-        # Simple approach: check for section number references
-        if chunk2.context.section_number:
-            return chunk2.context.section_number in chunk1.content
+        # Simple approach: check for section number references, then for
+        # title references
+        context = chunk2.context
+        if context.section_number:
+            return context.section_number in chunk1.content
         
-        # Check for title references
-        if chunk2.context.parent_section:
-            return chunk2.context.parent_section.lower() in chunk1.content.lower()
+        if context.parent_section:
+            return context.parent_section.lower() in chunk1.content_lower
         
         return False
     
-    def _find_overlapping_chunks(self, 
-                               target_chunk: SemanticChunk,
-                               all_chunks: List[SemanticChunk]) -> List[str]:
-        """Find chunks that overlap with target chunk"""
-        overlaps = []
+    def _build_node_index(self, chunks: List[SemanticChunk]) -> Dict[Optional[str], List[str]]:
+        """Index chunk IDs by source node, in chunk order"""
+        chunk_ids_by_node = defaultdict(list)
+        for chunk in chunks:
+            chunk_ids_by_node[chunk.node_id].append(chunk.chunk_id)
+        return chunk_ids_by_node
+    
+    def compute_all_overlaps(self, 
+                             all_chunks: List[SemanticChunk],
+                             chunk_ids_by_node: Optional[Dict[Optional[str], List[str]]] = None) -> Dict[str, List[str]]:
+        """Find the overlapping chunks of every chunk in a single pass
         
-        for chunk in all_chunks:
-            if (chunk.chunk_id != target_chunk.chunk_id and
-                chunk.node_id == target_chunk.node_id):
-                overlaps.append(chunk.chunk_id)
+        Args:
+            all_chunks: Chunks with unique chunk IDs
+            chunk_ids_by_node: Index from _build_node_index, built if omitted
+            
+        Returns:
+            Dict mapping each chunk ID to the other chunk IDs of its node
+        """
+        if chunk_ids_by_node is None:
+            chunk_ids_by_node = self._build_node_index(all_chunks)
         
+        # Each chunk overlaps every other chunk of its node; slicing around
+        # its position avoids comparing IDs
+        overlaps = {}
+        for chunk_ids in chunk_ids_by_node.values():
+            for position, chunk_id in enumerate(chunk_ids):
+                overlaps[chunk_id] = chunk_ids[:position] + chunk_ids[position + 1:]
         return overlaps
     
     def _sort_chunks_by_navigation_order(self, 
                                        chunks: List[SemanticChunk],
                                        navigation_structure: NavigationStructure) -> List[SemanticChunk]:
         """Sort chunks by navigation order"""
-        def sort_key(chunk):
-            if not chunk.node_id or chunk.node_id not in navigation_structure.nodes:
-                return (999, 999)  # Put unknown chunks at end
-            
-            node = navigation_structure.nodes[chunk.node_id]
-            line_num = node.metadata.get('line_number', 999)
-            chunk_index = chunk.metadata.get('chunk_index', 0)
-            
-            return (line_num, chunk_index)
+        # Line number of every node, looked up once rather than per chunk
+        line_numbers = {
+            node_id: node.metadata.get('line_number', 999)
+            for node_id, node in navigation_structure.nodes.items()
+        }
+        
+        # (line number, chunk index) key of every chunk, computed in one pass
+        keys = []
+        for chunk in chunks:
+            node_id = chunk.node_id
+            if node_id and node_id in line_numbers:
+                keys.append((line_numbers[node_id], chunk.metadata.get('chunk_index', 0)))
+            else:
+                keys.append((999, 999))  # Put unknown chunks at end
+        
+        # Chunks are usually created in document order already
+        if all(map(le, keys, keys[1:])):
+            return list(chunks)
         
-        return sorted(chunks, key=sort_key)
\ No newline at end of file
+        # Sort on the key alone
+        decorated = sorted(zip(keys, chunks), key=itemgetter(0))
+        return [chunk for _, chunk in decorated]
\ No newline at end of file
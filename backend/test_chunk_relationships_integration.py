@@ -157,6 +157,7 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
     """Create realistic chunking result with NAA content"""
     
     semantic_chunks = []
+    total_content_length = 0
     
     # Product Overview Chunk
     overview_context = ChunkContext(
@@ -176,6 +177,7 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
         node_id="product_overview"
     )
     semantic_chunks.append(overview_chunk)
+    total_content_length += len(overview_chunk.content)
     
     # Borrower Eligibility Chunk
     eligibility_context = ChunkContext(
@@ -195,6 +197,7 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
         node_id="borrower_eligibility"
     )
     semantic_chunks.append(eligibility_chunk)
+    total_content_length += len(eligibility_chunk.content)
     
     # Income Requirements Chunk (Decision)
     income_context = ChunkContext(
@@ -215,6 +218,7 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
         node_id="income_requirements"
     )
     semantic_chunks.append(income_chunk)
+    total_content_length += len(income_chunk.content)
     
     # Credit Requirements Chunk (Decision)
     credit_context = ChunkContext(
@@ -235,6 +239,7 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
         node_id="credit_requirements"
     )
     semantic_chunks.append(credit_chunk)
+    total_content_length += len(credit_chunk.content)
     
     # Asset Requirements Chunk
     asset_context = ChunkContext(
@@ -254,6 +259,7 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
         node_id="asset_requirements"
     )
     semantic_chunks.append(asset_chunk)
+    total_content_length += len(asset_chunk.content)
     
     # Property Guidelines Chunk
     property_context = ChunkContext(
@@ -273,6 +279,7 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
         node_id="property_guidelines"
     )
     semantic_chunks.append(property_chunk)
+    total_content_length += len(property_chunk.content)
     
     # Decision Matrix Framework Chunk (Complex Decision)
     matrix_context = ChunkContext(
@@ -293,6 +300,7 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
         node_id="decision_matrix"
     )
     semantic_chunks.append(matrix_chunk)
+    total_content_length += len(matrix_chunk.content)
     
     # Basic relationships from semantic chunker
     chunk_relationships = [
@@ -316,6 +324,8 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
         }
     ]
     
+    total_chunks = len(semantic_chunks)
+    
     return ChunkingResult(
         chunks=semantic_chunks,
         chunk_relationships=chunk_relationships,
@@ -323,8 +333,8 @@ def create_realistic_naa_chunking_result() -> ChunkingResult:
             'processing_time': 2.5,
             'document_id': 'naa_guidelines_real_001',
             'document_type': 'guidelines',
-            'total_chunks': len(semantic_chunks),
-            'average_chunk_size': sum(len(c.content) for c in semantic_chunks) / len(semantic_chunks)
+            'total_chunks': total_chunks,
+            'average_chunk_size': total_content_length / total_chunks
         },
         quality_metrics={
             'overall_quality': 0.90,
@@ -0,0 +1,71 @@
+# Structured Output Schema Tests
+# Tests for the pydantic schemas matching the guidelines prompt templates
+
+import unittest
+
+from src.prompts.guidelines_prompts import GuidelinesPromptEngine, PromptType
+from src.prompts.guidelines_output_schemas import (
+    OUTPUT_SCHEMAS,
+    DecisionTrees,
+    EntityExtraction,
+    NavigationStructure,
+    get_output_schema
+)
+
+
+class TestOutputSchemas(unittest.TestCase):
+    """Test structured output schemas"""
+    
+    def test_every_prompt_type_has_schema(self):
+        """Test each template's prompt type maps to a schema"""
+        engine = GuidelinesPromptEngine()
+        
+        self.assertEqual(set(OUTPUT_SCHEMAS), set(PromptType))
+        for template in engine.templates.values():
+            self.assertIn("properties", get_output_schema(template.prompt_type).model_json_schema())
+    
+    def test_navigation_structure_nesting(self):
+        """Test navigation sections nest recursively"""
+        structure = NavigationStructure.model_validate({
+            "root_sections": [{
+                "section_id": "s1",
+                "section_number": "1.0",
+                "title": "Eligibility",
+                "level": 1,
+                "children": [{"section_id": "s1.1", "section_number": "1.1", "title": "Credit", "level": 2}]
+            }]
+        })
+        
+        self.assertEqual(structure.root_sections[0].children[0].title, "Credit")
+        self.assertEqual(structure.cross_references, [])
+    
+    def test_decision_outcomes_are_constrained(self):
+        """Test leaf outcomes are limited to APPROVE, DECLINE and REFER"""
+        tree = {
+            "tree_id": "t1",
+            "root_condition": "credit check",
+            "branches": [{"condition": "credit_score < 620", "outcome_type": "LEAF", "final_outcome": "REFER"}]
+        }
+        
+        DecisionTrees.model_validate({"decision_trees": [tree]})
+        
+        tree["branches"][0]["final_outcome"] = "MAYBE"
+        with self.assertRaises(ValueError):
+            DecisionTrees.model_validate({"decision_trees": [tree]})
+    
+    def test_entity_confidence_range(self):
+        """Test entity confidence must be between 0 and 1"""
+        entity = {
+            "entity_id": "e1",
+            "entity_type": "NUMERIC_THRESHOLD",
+            "value": "620",
+            "confidence": 1.5,
+            "navigation_path": "Credit Requirements"
+        }
+        
+        with self.assertRaises(ValueError):
+            EntityExtraction.model_validate({"extracted_entities": [entity]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ from unittest.mock import Mock, patch
 import json
 from datetime import datetime
 
+import src.prompts.guidelines_prompts as guidelines_prompts
 from src.prompts.guidelines_prompts import (
     GuidelinesPromptEngine,
     PromptTemplate,
@@ -46,6 +47,32 @@ class TestPromptTemplate(unittest.TestCase):
         self.assertEqual(len(template.examples), 2)
         self.assertEqual(len(template.validation_criteria), 1)
     
+    def test_dataclasses_use_slots(self):
+        """Test prompt dataclasses are slotted"""
+        template = PromptTemplate(
+            template_id="test-template",
+            prompt_type=PromptType.NAVIGATION,
+            mortgage_category=MortgageCategory.UNIVERSAL,
+            base_template="Extract navigation from {content}",
+            context_variables=["content"]
+        )
+        context = PromptContext(document_type="guidelines", mortgage_category=MortgageCategory.NQM)
+        metrics = PromptMetrics("test", 100, 0.9, 0.9, 0.9, 0.9)
+        
+        for instance in (template, context, metrics):
+            self.assertFalse(hasattr(instance, "__dict__"))
+    
+    def test_unset_optional_fields_share_empty_defaults(self):
+        """Test unset optional fields default to shared immutable empties"""
+        first = PromptTemplate("first", PromptType.NAVIGATION, MortgageCategory.UNIVERSAL, "A {content}", ["content"])
+        second = PromptTemplate("second", PromptType.NAVIGATION, MortgageCategory.UNIVERSAL, "B {content}", ["content"])
+        
+        self.assertEqual(first.examples, ())
+        self.assertIs(first.examples, second.examples)
+        self.assertIs(first.validation_criteria, second.validation_criteria)
+        self.assertIs(first.domain_specific_instructions, second.domain_specific_instructions)
+        self.assertEqual(len(first.domain_specific_instructions), 0)
+    
     def test_generate_prompt_basic(self):
         """Test basic prompt generation"""
         template = PromptTemplate(
@@ -124,6 +151,36 @@ class TestPromptTemplate(unittest.TestCase):
         self.assertIn("Validation Criteria:", prompt)
         self.assertIn("All decision paths must be complete", prompt)
         self.assertIn("Entities must have confidence scores", prompt)
+    
+    def test_generate_prompt_substitution(self):
+        """Test only context variables are substituted, in a single pass"""
+        template = PromptTemplate(
+            template_id="test-template",
+            prompt_type=PromptType.ENTITY_EXTRACTION,
+            mortgage_category=MortgageCategory.UNIVERSAL,
+            base_template='Content: {content}\nContext: {navigation_context}\n{{"entities": []}} {other}',
+            context_variables=["content", "navigation_context"]
+        )
+        
+        prompt = template.generate_prompt({"content": "see {navigation_context}", "other": "x"})
+        
+        self.assertEqual(
+            prompt,
+            'Content: see {navigation_context}\nContext: {navigation_context}\n{{"entities": []}} {other}'
+        )
+    
+    def test_generate_prompt_blocks(self):
+        """Test cacheable content blocks reproduce the prompt"""
+        template = GuidelinesPromptEngine().templates["entity_universal"]
+        context = {"content": "Credit score 620 minimum", "navigation_context": "Eligibility"}
+        
+        blocks = template.generate_prompt_blocks(context)
+        
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0]["cache_control"], {"type": "ephemeral"})
+        self.assertNotIn("cache_control", blocks[1])
+        self.assertNotIn("Credit score 620", blocks[0]["text"])
+        self.assertEqual("".join(block["text"] for block in blocks), template.generate_prompt(context))
 
 
 class TestPromptContext(unittest.TestCase):
@@ -224,6 +281,29 @@ class TestGuidelinesPromptEngine(unittest.TestCase):
         self.assertIn("nqm_focus", template.domain_specific_instructions)
         self.assertIn("Bank Statement Program", template.examples[0])
     
+    def test_output_schemas_are_static(self):
+        """Test JSON output schemas sit in the static prefix, outside the per-call format body"""
+        for template_id, template in self.engine.templates.items():
+            self.assertIn("{", template._static_prefix, template_id)
+            self.assertNotIn("{{", template._compiled, template_id)
+    
+    def test_navigation_templates_share_module(self):
+        """Test category templates share the universal module as a common prefix"""
+        universal = self.engine.templates["nav_universal"]
+        nqm = self.engine.templates["nav_nqm"]
+        context = {"document_type": "guidelines", "content": "Bank statement program"}
+        
+        self.assertIs(nqm.base_template, self.engine.module_registry["navigation"])
+        self.assertIs(universal.base_template, nqm.base_template)
+        self.assertEqual(
+            universal.generate_prompt_blocks(context)[0],
+            nqm.generate_prompt_blocks(context)[0]
+        )
+        
+        # Inputs follow the static instructions and output format
+        prompt = nqm.generate_prompt(context)
+        self.assertLess(prompt.index('"root_sections"'), prompt.index("Bank statement program"))
+    
     def test_decision_tree_template(self):
         """Test decision tree template"""
         template = self.engine.templates["decision_universal"]
@@ -271,6 +351,16 @@ class TestGuidelinesPromptEngine(unittest.TestCase):
         self.assertIn("Non-QM specific sections", prompt)
         self.assertIn("Bank Statement programs", prompt)
     
+    def test_navigation_templates_by_category(self):
+        """Test every category resolves to its navigation template or the universal one"""
+        for category in MortgageCategory:
+            expected = self.engine.templates.get(
+                f"nav_{guidelines_prompts._category_suffix(category)}", self.engine.templates["nav_universal"]
+            )
+            self.assertIs(self.engine._nav_by_category[category], expected)
+        
+        self.assertIs(self.engine._nav_by_category[MortgageCategory.RTL], self.engine.templates["nav_universal"])
+    
     def test_generate_decision_prompt(self):
         """Test decision tree prompt generation"""
         context = PromptContext(
@@ -303,6 +393,69 @@ class TestGuidelinesPromptEngine(unittest.TestCase):
         self.assertIn(content, prompt)
         self.assertIn(navigation_context, prompt)
     
+    def test_generate_entity_prompts_batch(self):
+        """Test batch entity prompts match single-call prompts"""
+        context = PromptContext(
+            document_type="guidelines",
+            mortgage_category=MortgageCategory.UNIVERSAL
+        )
+        pairs = [
+            ("Credit score requirements and DTI ratios", "Borrower Eligibility > Credit Requirements"),
+            ("Reserve requirements of {months} months", "Assets > Reserves"),
+        ]
+        
+        prompts = self.engine.generate_entity_prompts_batch(pairs)
+        
+        self.assertEqual(prompts, [
+            self.engine.generate_entity_prompt(content, navigation_context, context)
+            for content, navigation_context in pairs
+        ])
+        self.assertEqual(self.engine.generate_entity_prompts_batch([]), [])
+    
+    def test_generate_structured_prompt(self):
+        """Test structured prompts drop the JSON example but keep instructions and inputs"""
+        inputs = {"content": "Credit score of 620", "navigation_context": "Credit Requirements"}
+        
+        prompt = self.engine.generate_structured_prompt("entity_universal", inputs)
+        full_prompt = self.engine.templates["entity_universal"].generate_prompt(inputs)
+        
+        self.assertNotIn('"extracted_entities"', prompt)
+        self.assertIn("Return the result in the provided output schema.", prompt)
+        self.assertIn("NUMERIC_THRESHOLD", prompt)
+        self.assertIn("Content: Credit score of 620", prompt)
+        self.assertLess(len(prompt), len(full_prompt))
+        
+        for template_id, template in self.engine.templates.items():
+            self.assertNotIn("{{", template._structured_prefix, template_id)
+    
+    def test_should_cache(self):
+        """Test cache decisions follow the template prefix token count"""
+        template = self.engine.templates["entity_universal"]
+        
+        self.assertGreater(template.prefix_token_count, 0)
+        self.assertEqual(
+            self.engine.should_cache("entity_universal"),
+            template.prefix_token_count >= self.engine.MIN_CACHEABLE_TOKENS
+        )
+        
+        self.engine.MIN_CACHEABLE_TOKENS = template.prefix_token_count
+        self.assertTrue(self.engine.should_cache("entity_universal"))
+    
+    def test_prefix_tokens_counted_lazily(self):
+        """Test templates are not tokenized until a cache decision is needed"""
+        with patch.object(guidelines_prompts, "_count_tokens", return_value=2048) as count_tokens:
+            engine = GuidelinesPromptEngine()
+            count_tokens.assert_not_called()
+            
+            self.assertTrue(engine.should_cache("entity_universal"))
+            self.assertTrue(engine.should_cache("entity_universal"))
+            count_tokens.assert_called_once()
+    
+    def test_count_tokens_without_tiktoken(self):
+        """Test token counts fall back to a length estimate"""
+        with patch.object(guidelines_prompts, "tiktoken", None):
+            self.assertEqual(guidelines_prompts._count_tokens("a" * 40), 10)
+    
     def test_generate_relationship_prompt(self):
         """Test relationship extraction prompt generation"""
         context = PromptContext(
@@ -323,6 +476,32 @@ class TestGuidelinesPromptEngine(unittest.TestCase):
         self.assertIn("DECISION_DEPENDENCY", prompt)
         self.assertIn(content, prompt)
     
+    def test_generate_relationship_messages(self):
+        """Test relationship messages keep inputs out of the system prompt"""
+        context = PromptContext(
+            document_type="guidelines",
+            mortgage_category=MortgageCategory.UNIVERSAL
+        )
+        extracted_entities = ["credit_score_620", "dti_ratio_43"]
+        
+        messages = self.engine.generate_relationship_messages(
+            "Loan approval criteria", extracted_entities, "Approval Criteria", context
+        )
+        other = self.engine.generate_relationship_messages(
+            "Other content", [], "Other Section", context
+        )
+        
+        self.assertEqual([message["role"] for message in messages], ["system", "user"])
+        self.assertIn("ENTITY_DEPENDENCY", messages[0]["content"])
+        self.assertIn("Validation Criteria:", messages[0]["content"])
+        self.assertNotIn("Loan approval criteria", messages[0]["content"])
+        self.assertEqual(messages[0], other[0])
+        self.assertEqual(json.loads(messages[1]["content"]), {
+            "content": "Loan approval criteria",
+            "extracted_entities": extracted_entities,
+            "navigation_context": "Approval Criteria"
+        })
+    
     def test_generate_validation_prompt(self):
         """Test validation prompt generation"""
         extracted_data = {"entities": ["entity1"], "decisions": ["decision1"]}
@@ -337,6 +516,27 @@ class TestGuidelinesPromptEngine(unittest.TestCase):
         self.assertIn("Navigation structure completeness", prompt)
         self.assertIn("Decision tree completeness", prompt)
     
+    def test_prompt_json_with_and_without_orjson(self):
+        """Test prompt inputs serialize to the same data with either JSON encoder"""
+        value = {"entities": ["credit_score"], "thresholds": {"dti": 0.43}, "count": 2}
+        
+        fast = guidelines_prompts._dumps_json(value)
+        with patch.object(guidelines_prompts, "orjson", None):
+            fallback = guidelines_prompts._dumps_json(value)
+        
+        self.assertIsInstance(fast, str)
+        self.assertEqual(json.loads(fast), value)
+        self.assertEqual(json.loads(fallback), value)
+    
+    def test_category_suffix(self):
+        """Test category template key suffixes are lowercase and cached"""
+        self.assertEqual(guidelines_prompts._category_suffix(MortgageCategory.NQM), "nqm")
+        self.assertEqual(guidelines_prompts._category_suffix(MortgageCategory.UNIVERSAL), "universal")
+        self.assertIs(
+            guidelines_prompts._category_suffix(MortgageCategory.CONV),
+            guidelines_prompts._category_suffix(MortgageCategory.CONV)
+        )
+    
     def test_generate_quality_prompt(self):
         """Test quality assessment prompt generation"""
         processing_results = {"accuracy": 0.92, "completeness": 0.89}
@@ -402,6 +602,17 @@ class TestGuidelinesPromptEngine(unittest.TestCase):
         self.assertEqual(updated_metrics.extraction_accuracy, 0.93)
         self.assertEqual(updated_metrics.usage_count, 1)
     
+    def test_update_prompt_metrics_evicts_least_recent(self):
+        """Test tracked metrics are capped with least-recently-updated eviction"""
+        self.engine.MAX_TRACKED_METRICS = 2
+        
+        self.engine.update_prompt_metrics("prompt1", 100, 0.9, 0.9)
+        self.engine.update_prompt_metrics("prompt2", 100, 0.9, 0.9)
+        self.engine.update_prompt_metrics("prompt1", 90, 0.9, 0.9)
+        self.engine.update_prompt_metrics("prompt3", 100, 0.9, 0.9)
+        
+        self.assertEqual(list(self.engine.metrics), ["prompt1", "prompt3"])
+    
     def test_get_prompt_performance(self):
         """Test getting prompt performance metrics"""
         prompt_id = "test-prompt"
@@ -443,6 +654,13 @@ class TestConvenienceFunctions(unittest.TestCase):
         self.assertIn("Non-QM specific sections", prompt)
         self.assertIn("Bank Statement programs", prompt)
     
+    def test_create_navigation_prompt_invalid_category(self):
+        """Test unknown mortgage categories are still rejected"""
+        with self.assertRaises(ValueError):
+            create_navigation_prompt("content", "guidelines", "UNKNOWN")
+        
+        self.assertIs(guidelines_prompts._to_category("NQM"), MortgageCategory.NQM)
+    
     def test_create_decision_prompt(self):
         """Test decision tree prompt convenience function"""
         content = "Credit approval decision criteria"
@@ -478,6 +696,24 @@ class TestConvenienceFunctions(unittest.TestCase):
         self.assertIn("Validate the completeness and consistency", prompt)
         self.assertIn("Navigation structure completeness", prompt)
         self.assertIn("Decision tree completeness", prompt)
+    
+    def test_convenience_functions_reuse_engine(self):
+        """Test convenience functions do not rebuild the prompt engine"""
+        with patch("src.prompts.guidelines_prompts.GuidelinesPromptEngine") as engine_class:
+            create_navigation_prompt("content", "guidelines")
+            create_entity_prompt("content", "navigation")
+        
+        engine_class.assert_not_called()
+    
+    def test_convenience_functions_build_fresh_contexts(self):
+        """Test each convenience call gets its own PromptContext"""
+        with patch("src.prompts.guidelines_prompts._ENGINE") as engine:
+            create_entity_prompt("content", "navigation")
+            create_entity_prompt("content", "navigation")
+        
+        first, second = (call.args[2] for call in engine.generate_entity_prompt.call_args_list)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
 
 
 class TestEnumTypes(unittest.TestCase):
@@ -1,6 +1,8 @@
 # Task 3: Unit tests for Package Templates
 # This file contains comprehensive tests for the MortgagePackageTemplates class
 
+import copy
+import json
 import pytest
 import sys
 import os
@@ -106,6 +108,11 @@ class TestMortgagePackageTemplates:
             }
             templates[None]  # This should raise KeyError
     
+    def test_get_template_unknown_category_error(self):
+        """Test the error raised for a category without a template"""
+        with pytest.raises(ValueError, match=r"Valid categories: \['NQM', 'RTL', 'SBC', 'CONV'\]"):
+            MortgagePackageTemplates.get_template("UNKNOWN")
+    
     def test_template_immutability(self):
         """Test that templates are returned as copies (immutable)"""
         template1 = MortgagePackageTemplates.get_template(PackageCategory.NQM)
@@ -121,6 +128,71 @@ class TestMortgagePackageTemplates:
         original = MortgagePackageTemplates.NQM_TEMPLATE
         assert "modified" not in original
     
+    def test_template_clone_matches_deepcopy(self):
+        """Test that cloned templates equal the originals without sharing containers"""
+        def assert_no_shared_containers(original, clone):
+            if isinstance(original, (dict, list)):
+                assert original is not clone
+                items = original.items() if isinstance(original, dict) else enumerate(original)
+                for key, value in items:
+                    assert_no_shared_containers(value, clone[key])
+            else:
+                # Every other node in a template must be an immutable scalar
+                assert isinstance(original, (str, int, float, bool, type(None)))
+        
+        for category in PackageCategory:
+            original = MortgagePackageTemplates._load_template(category)
+            clone = MortgagePackageTemplates.get_template(category)
+            
+            assert clone == copy.deepcopy(original)
+            assert_no_shared_containers(original, clone)
+    
+    def test_template_attributes_hold_dicts(self):
+        """Test that the public template attributes keep the plain dict form"""
+        template = MortgagePackageTemplates.NQM_TEMPLATE
+        
+        assert template["documents"][0]["document_type"] == "guidelines"
+        assert template == MortgagePackageTemplates.get_template(PackageCategory.NQM)
+    
+    def test_templates_built_lazily_and_cached(self):
+        """Test that templates are built on first access and then reused"""
+        MortgagePackageTemplates._TEMPLATE_CACHE.pop(PackageCategory.SBC, None)
+        
+        template = MortgagePackageTemplates.SBC_TEMPLATE
+        
+        assert MortgagePackageTemplates._TEMPLATE_CACHE[PackageCategory.SBC] is template
+        assert MortgagePackageTemplates.SBC_TEMPLATE is template
+        assert template["category"] == "SBC"
+    
+    def test_get_template_json(self):
+        """Test that template JSON matches the template and is reused"""
+        blob = MortgagePackageTemplates.get_template_json(PackageCategory.RTL)
+        
+        assert json.loads(blob) == MortgagePackageTemplates.get_template(PackageCategory.RTL)
+        assert MortgagePackageTemplates.get_template_json(PackageCategory.RTL) is blob
+    
+    def test_warmup_populates_caches(self):
+        """Test that warmup builds every cached template artifact"""
+        MortgagePackageTemplates._TEMPLATE_CACHE.clear()
+        MortgagePackageTemplates._TEMPLATE_JSON.clear()
+        MortgagePackageTemplates._PACKAGE_BUILDERS.clear()
+        
+        MortgagePackageTemplates.warmup()
+        
+        for category in PackageCategory:
+            assert category in MortgagePackageTemplates._TEMPLATE_CACHE
+            assert category in MortgagePackageTemplates._TEMPLATE_JSON
+            assert category in MortgagePackageTemplates._PACKAGE_BUILDERS
+    
+    def test_warmup_rejects_invalid_template(self):
+        """Test that warmup fails when a category template does not validate"""
+        MortgagePackageTemplates._TEMPLATE_CACHE[PackageCategory.SBC] = {"category": "SBC"}
+        try:
+            with pytest.raises(ValueError, match="Template SBC is invalid"):
+                MortgagePackageTemplates.warmup()
+        finally:
+            MortgagePackageTemplates._TEMPLATE_CACHE.pop(PackageCategory.SBC, None)
+    
     def test_create_package_from_template_basic(self):
         """Test creating package configuration from template"""
         package_config = MortgagePackageTemplates.create_package_from_template(
@@ -137,6 +209,23 @@ class TestMortgagePackageTemplates:
         assert "relationships" in package_config
         assert len(package_config["documents"]) == 2
     
+    def test_create_package_from_template_matches_template(self):
+        """Test that generated package builders reproduce every template"""
+        for category in PackageCategory:
+            template = MortgagePackageTemplates.get_template(category)
+            
+            first = MortgagePackageTemplates.create_package_from_template(category, "Package", "tenant_001")
+            second = MortgagePackageTemplates.create_package_from_template(category, "Package", "tenant_001")
+            
+            assert first["category"] == category.value
+            assert first["template"] == template["template_name"]
+            assert first["documents"] == template["documents"]
+            assert first["relationships"] == template["relationships"]
+            
+            # Each call must return independent containers
+            assert first["documents"] is not second["documents"]
+            assert first["documents"][0] is not second["documents"][0]
+    
     def test_create_package_from_template_with_customizations(self):
         """Test creating package with customizations"""
         customizations = {
@@ -170,6 +259,31 @@ class TestMortgagePackageTemplates:
         # Quality thresholds should be updated
         assert guidelines["quality_thresholds"]["custom_metric"] == 0.85
     
+    def test_create_package_customizations_deduplicated(self):
+        """Test that repeated sections and entity types are only added once"""
+        customizations = {
+            "additional_sections": ["Specialty Programs", "Custom Section", "Custom Section"],
+            "additional_entity_types": ["LOAN_PROGRAM", "CUSTOM_ENTITY"]
+        }
+        
+        package_config = MortgagePackageTemplates.create_package_from_template(
+            category=PackageCategory.NQM,
+            package_name="Deduplicated Package",
+            tenant_id="tenant_001",
+            customizations=customizations
+        )
+        
+        guidelines = next(doc for doc in package_config["documents"] if doc["document_type"] == "guidelines")
+        
+        assert guidelines["optional_sections"] == [
+            "Foreign National Requirements",
+            "Specialty Programs",
+            "Exception Guidelines",
+            "Custom Section"
+        ]
+        assert guidelines["entity_types"].count("LOAN_PROGRAM") == 1
+        assert guidelines["entity_types"][-1] == "CUSTOM_ENTITY"
+    
     def test_create_package_investor_specific_customizations(self):
         """Test investor-specific customizations"""
         customizations = {
@@ -231,6 +345,18 @@ class TestMortgagePackageTemplates:
         assert nqm_template["template_name"] == "Non-QM Standard Template"
         assert "description" in nqm_template
     
+    def test_get_available_templates_returns_copies(self):
+        """Test that available template entries are JSON-serializable copies"""
+        first = MortgagePackageTemplates.get_available_templates()
+        second = MortgagePackageTemplates.get_available_templates()
+        
+        assert json.loads(json.dumps(first)) == first
+        
+        # Modifying one caller's entries does not affect later calls
+        first[0]["category"] = "MODIFIED"
+        assert second[0]["category"] == "NQM"
+        assert MortgagePackageTemplates.get_available_templates()[0]["category"] == "NQM"
+    
     def test_validate_template_valid(self):
         """Test template validation with valid template"""
         template = MortgagePackageTemplates.get_template(PackageCategory.NQM)
@@ -338,6 +464,19 @@ class TestTemplateIntegration:
             errors = MortgagePackageTemplates.validate_template(template)
             assert len(errors) == 0, f"Template {category} has validation errors: {errors}"
     
+    def test_raw_templates_valid(self):
+        """Test that the template attributes themselves pass validation"""
+        templates = [
+            MortgagePackageTemplates.NQM_TEMPLATE,
+            MortgagePackageTemplates.RTL_TEMPLATE,
+            MortgagePackageTemplates.SBC_TEMPLATE,
+            MortgagePackageTemplates.CONV_TEMPLATE
+        ]
+        
+        for template in templates:
+            errors = MortgagePackageTemplates.validate_template(template)
+            assert errors == [], f"Template {template['category']} has validation errors: {errors}"
+    
     def test_template_document_structures(self):
         """Test that all templates have proper document structures"""
         categories = [PackageCategory.NQM, PackageCategory.RTL, PackageCategory.SBC, PackageCategory.CONV]
@@ -10,6 +10,7 @@ import os
 # Add the parent directory to the path to import backend modules
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+import src.package_versioning as package_versioning
 from src.package_versioning import (
     PackageVersionManager,
     ChangeType,
@@ -102,6 +103,18 @@ class TestVersionDiff:
         assert "doc_old" in diff.removed_documents
         assert len(diff.modified_documents) == 1
     
+    def test_version_diff_to_dict(self):
+        """Test that to_dict matches the dataclass fields"""
+        from dataclasses import asdict
+        
+        diff = VersionDiff(
+            "1.0.0", "1.1.0", ["doc_new"], [], [{"document_id": "doc_mod", "changes": ["Updated"]}], [], []
+        )
+        
+        data = diff.to_dict()
+        assert data == asdict(diff)
+        assert data["added_documents"] is not diff.added_documents
+    
     def test_has_changes(self):
         """Test has_changes method"""
         # No changes
@@ -142,8 +155,7 @@ class TestPackageVersionManager:
     def test_create_version_patch(self):
         """Test creating patch version"""
         # Mock database methods
-        self.version_manager._store_version_record = Mock()
-        self.version_manager._store_package_snapshot = Mock()
+        self.version_manager._store_version_with_snapshot = Mock()
         
         changes = ["Fixed validation bug"]
         new_version = self.version_manager.create_version(
@@ -153,14 +165,51 @@ class TestPackageVersionManager:
         assert new_version == "1.0.1"
         assert self.test_package.version == "1.0.1"
         
-        # Verify database methods were called
-        self.version_manager._store_version_record.assert_called_once()
-        self.version_manager._store_package_snapshot.assert_called_once()
+        # Verify version and snapshot were stored in one write
+        self.version_manager._store_version_with_snapshot.assert_called_once()
+    
+    def test_store_version_record_includes_version_parts(self):
+        """Test version parts are stored for database-side ordering"""
+        record = VersionRecord(
+            version="1.10.2",
+            change_type=ChangeType.PATCH,
+            changes=["Fix"],
+            created_at=datetime.now(),
+            created_by="user1",
+            metadata={}
+        )
+        
+        self.version_manager._store_version_record("pkg_test_001", record)
+        
+        _, version_data = self.mock_graph_db.create_version_record.call_args[0]
+        assert (version_data["major"], version_data["minor"], version_data["patch"]) == (1, 10, 2)
+    
+    def test_store_version_with_snapshot(self):
+        """Test version record and snapshot are written in a single call"""
+        record = VersionRecord(
+            version="1.0.1",
+            change_type=ChangeType.PATCH,
+            changes=["Fix"],
+            created_at=datetime.now(),
+            created_by="user1",
+            metadata={}
+        )
+        payload = package_versioning._encode_snapshot({"package_id": "pkg_test_001"})
+        
+        self.version_manager._store_version_with_snapshot("pkg_test_001", record, payload, "2024-01-01T00:00:00")
+        
+        self.mock_graph_db.create_version_with_snapshot.assert_called_once()
+        package_id, version_data, stored_payload, created_at = self.mock_graph_db.create_version_with_snapshot.call_args[0]
+        assert package_id == "pkg_test_001"
+        assert version_data["version"] == "1.0.1"
+        assert stored_payload == payload
+        assert created_at == "2024-01-01T00:00:00"
+        self.mock_graph_db.create_version_record.assert_not_called()
+        self.mock_graph_db.create_package_snapshot.assert_not_called()
     
     def test_create_version_minor(self):
         """Test creating minor version"""
-        self.version_manager._store_version_record = Mock()
-        self.version_manager._store_package_snapshot = Mock()
+        self.version_manager._store_version_with_snapshot = Mock()
         
         changes = ["Added new document type"]
         new_version = self.version_manager.create_version(
@@ -172,8 +221,7 @@ class TestPackageVersionManager:
     
     def test_create_version_major(self):
         """Test creating major version"""
-        self.version_manager._store_version_record = Mock()
-        self.version_manager._store_package_snapshot = Mock()
+        self.version_manager._store_version_with_snapshot = Mock()
         
         changes = ["Restructured package format"]
         new_version = self.version_manager.create_version(
@@ -194,16 +242,8 @@ class TestPackageVersionManager:
     
     def test_get_version_history(self):
         """Test getting version history"""
-        # Mock version history data
+        # Mock version history data, ordered newest first by the database
         mock_history = [
-            {
-                "version": "1.0.0",
-                "change_type": "PATCH",
-                "changes": ["Initial version"],
-                "created_at": datetime.now().isoformat(),
-                "created_by": "user1",
-                "metadata": {}
-            },
             {
                 "version": "1.1.0", 
                 "change_type": "MINOR",
@@ -211,6 +251,14 @@ class TestPackageVersionManager:
                 "created_at": datetime.now().isoformat(),
                 "created_by": "user2",
                 "metadata": {}
+            },
+            {
+                "version": "1.0.0",
+                "change_type": "PATCH",
+                "changes": ["Initial version"],
+                "created_at": datetime.now().isoformat(),
+                "created_by": "user1",
+                "metadata": {}
             }
         ]
         
@@ -270,21 +318,11 @@ class TestPackageVersionManager:
             "relationships": []
         }
         
-        # Mock current package
-        current_package = DocumentPackage(
-            package_id="pkg_test_001",
-            package_name="Test Package",
-            tenant_id="tenant_001",
-            category=PackageCategory.NQM,
-            version="1.2.0"
-        )
-        
         # Set up mocks
         self.version_manager.get_version_by_number = Mock(return_value=target_record)
         self.version_manager._retrieve_package_snapshot = Mock(return_value=mock_snapshot)
-        self.version_manager._load_current_package = Mock(return_value=current_package)
-        self.version_manager._store_version_record = Mock()
-        self.version_manager._store_package_snapshot = Mock()
+        self.version_manager._load_current_version = Mock(return_value="1.2.0")
+        self.version_manager._store_version_with_snapshot = Mock()
         
         # Perform rollback
         restored_package = self.version_manager.rollback_version(
@@ -295,8 +333,12 @@ class TestPackageVersionManager:
         assert restored_package.version == "2.0.0"  # New major version for rollback
         
         # Verify database operations
-        self.version_manager._store_version_record.assert_called_once()
-        self.version_manager._store_package_snapshot.assert_called_once()
+        self.version_manager._store_version_with_snapshot.assert_called_once()
+        
+        # The target snapshot is stored for the rollback version as-is
+        _, record, payload, snapshot_created = self.version_manager._store_version_with_snapshot.call_args[0]
+        assert record.version == "2.0.0"
+        assert package_versioning._decode_snapshot(payload) == dict(mock_snapshot, snapshot_created=snapshot_created)
     
     def test_rollback_version_not_found(self):
         """Test rollback with version not found"""
@@ -341,7 +383,7 @@ class TestPackageVersionManager:
             "relationships": []
         }
         
-        self.version_manager._retrieve_package_snapshot = Mock(side_effect=[snapshot1, snapshot2])
+        self.version_manager._retrieve_package_snapshots = Mock(return_value={"1.0.0": snapshot1, "1.1.0": snapshot2})
         
         diff = self.version_manager.diff_versions("pkg_test_001", "1.0.0", "1.1.0")
         
@@ -352,6 +394,24 @@ class TestPackageVersionManager:
         assert diff.modified_documents[0]["document_id"] == "doc1"
         assert "Status changed" in diff.structural_changes
     
+    def test_diff_versions_fetches_snapshots_once(self):
+        """Test both snapshots are fetched in a single database call"""
+        snapshot = {"category": "NQM", "status": "DRAFT", "documents": [], "relationships": []}
+        self.mock_graph_db.get_package_snapshots.return_value = {
+            "1.0.0": package_versioning._encode_snapshot(snapshot),
+            "1.0.1": package_versioning._encode_snapshot(dict(snapshot, status="ACTIVE"))
+        }
+        
+        diff = self.version_manager.diff_versions("pkg_test_001", "1.0.0", "1.0.1")
+        
+        self.mock_graph_db.get_package_snapshots.assert_called_once_with("pkg_test_001", ["1.0.0", "1.0.1"])
+        self.mock_graph_db.get_package_snapshot.assert_not_called()
+        assert diff.structural_changes == ["Status changed from DRAFT to ACTIVE"]
+        
+        self.mock_graph_db.get_package_snapshots.return_value = {"1.0.0": package_versioning._encode_snapshot(snapshot)}
+        with pytest.raises(ValueError, match="Version 1.0.1 not found"):
+            self.version_manager.diff_versions("pkg_test_001", "1.0.0", "1.0.1")
+    
     def test_validate_version_sequence(self):
         """Test version sequence validation"""
         # Mock valid version history
@@ -447,6 +507,16 @@ class TestVersionManagerHelpers:
         assert self.version_manager._version_to_tuple("2.10.5") == (2, 10, 5)
         assert self.version_manager._version_to_tuple("0.0.1") == (0, 0, 1)
     
+    def test_parse_version(self):
+        """Test cached version parsing"""
+        assert package_versioning._parse_version("2.10.5") == (2, 10, 5)
+        assert package_versioning._parse_version("1.-1.0") is None
+        assert package_versioning._parse_version("1.0") is None
+        
+        hits = package_versioning._parse_version.cache_info().hits
+        package_versioning._parse_version("2.10.5")
+        assert package_versioning._parse_version.cache_info().hits == hits + 1
+    
     def test_is_valid_version_increment(self):
         """Test version increment validation"""
         # Valid increments
@@ -503,6 +573,54 @@ class TestVersionManagerHelpers:
         assert snapshot["documents"][0]["document_id"] == "doc_001"
         assert "snapshot_created" in snapshot
     
+    def test_create_package_snapshot_bytes(self):
+        """Test encoded snapshots match encoding the snapshot dict"""
+        package = DocumentPackage(
+            package_id="pkg_test_001",
+            package_name="Test Package",
+            tenant_id="tenant_001", 
+            category=PackageCategory.NQM,
+            version="1.0.0"
+        )
+        package.add_document(DocumentDefinition(
+            document_id="doc_001",
+            document_type="guidelines",
+            document_name="Test Guidelines"
+        ))
+        package.add_document(DocumentDefinition(
+            document_id="doc_002",
+            document_type="matrix",
+            document_name="Test Matrix"
+        ))
+        package.relationships.append(PackageRelationship("doc_002", "doc_001", "ELABORATES"))
+        
+        for msgpack_module in (package_versioning.msgpack, None):
+            with patch.object(package_versioning, "msgpack", msgpack_module):
+                payload, snapshot_created = self.version_manager._create_package_snapshot_bytes(package)
+                snapshot = self.version_manager._create_package_snapshot(package)
+                snapshot["snapshot_created"] = snapshot_created
+                
+                assert payload == package_versioning._encode_snapshot(snapshot)
+    
+    def test_restore_package_interns_categorical_strings(self):
+        """Test restored documents share interned categorical strings"""
+        # Build equal but distinct strings, as a decoder would
+        snapshot = {
+            "package_id": "pkg_test_001",
+            "package_name": "Test Package",
+            "tenant_id": "tenant_001",
+            "category": "NQM",
+            "documents": [
+                {"document_id": "doc_1", "document_type": "".join(["guide", "lines"]), "document_name": "Doc 1"},
+                {"document_id": "doc_2", "document_type": "".join(["guide", "lines"]), "document_name": "Doc 2"}
+            ],
+            "relationships": []
+        }
+        
+        package = self.version_manager._restore_package_from_snapshot(snapshot)
+        
+        assert package.documents[0].document_type is package.documents[1].document_type
+    
     def test_serialize_document(self):
         """Test document serialization"""
         doc = DocumentDefinition(
@@ -544,6 +662,34 @@ class TestVersionManagerHelpers:
         assert any("Added required_sections" in change for change in changes)
         assert any("Added entity_types" in change for change in changes)
     
+    def test_compare_documents_unchanged(self):
+        """Test that unchanged and reordered documents report no changes"""
+        doc1 = {
+            "document_name": "Guidelines",
+            "required_sections": ["Section 1", "Section 2"],
+            "quality_thresholds": {"navigation_accuracy": 0.9}
+        }
+        doc2 = dict(doc1, required_sections=["Section 2", "Section 1"])
+        
+        assert self.version_manager._compare_documents(doc1, dict(doc1)) == []
+        assert self.version_manager._compare_documents(doc1, doc2) == []
+    
+    def test_relationship_key_precomputed(self):
+        """Test serialized relationships carry the key used by diffs"""
+        rel = PackageRelationship("doc_002", "doc_001", "ELABORATES")
+        serialized = self.version_manager._serialize_relationship(rel)
+        legacy = {key: value for key, value in serialized.items() if key != "_key"}
+        
+        assert serialized["_key"] == self.version_manager._relationship_key(legacy)
+        
+        # Snapshots written before _key existed still diff against new ones
+        self.version_manager._retrieve_package_snapshots = Mock(return_value={
+            "1.0.0": {"documents": [], "relationships": [legacy]},
+            "1.0.1": {"documents": [], "relationships": [serialized]}
+        })
+        diff = self.version_manager.diff_versions("pkg_test_001", "1.0.0", "1.0.1")
+        assert diff.relationship_changes == []
+    
     def test_detect_structural_changes(self):
         """Test structural change detection"""
         snapshot1 = {
@@ -566,4 +712,89 @@ class TestVersionManagerHelpers:
         assert any("Category changed" in change for change in changes)
         assert any("Status changed" in change for change in changes)
         assert any("Document count changed" in change for change in changes)
-        assert any("Relationship count changed" in change for change in changes)
\ No newline at end of file
+        assert any("Relationship count changed" in change for change in changes)
+
+
+class TestSnapshotEncoding:
+    """Test snapshot storage encoding"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.snapshot = {
+            "package_id": "pkg_test_001",
+            "category": "NQM",
+            "documents": [
+                {
+                    "document_id": "doc1",
+                    "required_sections": ["Section 1"],
+                    "matrix_configuration": None,
+                    "quality_thresholds": {"navigation_accuracy": 0.95}
+                }
+            ],
+            "relationships": [],
+            "snapshot_created": datetime.now().isoformat()
+        }
+    
+    def test_encode_decode_round_trip(self):
+        """Test that encoded snapshots decode to the original dict"""
+        payload = package_versioning._encode_snapshot(self.snapshot)
+        
+        assert isinstance(payload, bytes)
+        assert package_versioning._decode_snapshot(payload) == self.snapshot
+    
+    def test_json_fallback_without_msgpack(self):
+        """Test that snapshots fall back to JSON when msgpack is unavailable"""
+        with patch.object(package_versioning, "msgpack", None):
+            payload = package_versioning._encode_snapshot(self.snapshot)
+            
+            assert payload.startswith(b"{")
+            assert package_versioning._decode_snapshot(payload) == self.snapshot
+    
+    def test_json_helpers_match_with_and_without_orjson(self):
+        """Test that the orjson and stdlib JSON paths produce the same data"""
+        value = {
+            "created_at": datetime(2024, 1, 2, 3, 4, 5),
+            "change_type": ChangeType.MINOR,
+            "changes": ["Added feature"]
+        }
+        
+        fast = package_versioning._loads(package_versioning._dumps(value))
+        with patch.object(package_versioning, "orjson", None):
+            fallback = package_versioning._loads(package_versioning._dumps(value))
+        
+        assert fast == fallback
+        assert fallback["created_at"] == "2024-01-02T03:04:05"
+        assert fallback["change_type"] == "MINOR"
+    
+    def test_decode_legacy_json_string(self):
+        """Test that snapshots stored as JSON strings still decode"""
+        import json
+        
+        assert package_versioning._decode_snapshot(json.dumps(self.snapshot)) == self.snapshot
+    
+    def test_store_and_retrieve_snapshot(self):
+        """Test that snapshots are stored encoded and decoded on retrieval"""
+        graph_db = Mock()
+        version_manager = PackageVersionManager(graph_db)
+        
+        version_manager._store_package_snapshot("pkg_test_001", "1.0.1", self.snapshot)
+        
+        args = graph_db.create_package_snapshot.call_args[0]
+        assert args[:2] == ("pkg_test_001", "1.0.1")
+        assert isinstance(args[2], bytes)
+        assert args[3] == self.snapshot["snapshot_created"]
+        
+        graph_db.get_package_snapshot.return_value = args[2]
+        assert version_manager._retrieve_package_snapshot("pkg_test_001", "1.0.1") == self.snapshot
+    
+    def test_decode_selected_fields(self):
+        """Test that only the requested snapshot fields are decoded"""
+        fields = ("category", "documents")
+        expected = {"category": "NQM", "documents": self.snapshot["documents"]}
+        
+        payload = package_versioning._encode_snapshot(self.snapshot)
+        assert package_versioning._decode_snapshot(payload, fields) == expected
+        
+        with patch.object(package_versioning, "msgpack", None):
+            payload = package_versioning._encode_snapshot(self.snapshot)
+            assert package_versioning._decode_snapshot(payload, fields) == expected
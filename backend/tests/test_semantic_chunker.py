@@ -16,7 +16,8 @@ from src.semantic_chunker import (
     SemanticChunk, 
     ChunkType, 
     ChunkContext, 
-    ChunkingResult
+    ChunkingResult,
+    _pack_ranges
 )
 from src.navigation_extractor import (
     NavigationStructure, 
@@ -172,6 +173,32 @@ class TestSemanticChunker:
             assert isinstance(chunk.chunk_type, ChunkType)
             assert isinstance(chunk.context, ChunkContext)
 
+    def test_chunking_metadata_counts(self):
+        """Test chunking metadata counts every non-root navigation node"""
+        structure = self.mock_navigation_structure
+        
+        result = self.chunker.create_hierarchical_chunks(structure, "", document_type="guidelines")
+        
+        assert result.chunking_metadata['navigation_nodes_processed'] == len(structure.nodes) - 1
+        assert result.chunking_metadata['total_chunks'] == len(result.chunks)
+        
+        chunk_types = result.chunking_metadata['chunk_types']
+        assert list(chunk_types) == [chunk_type.value for chunk_type in ChunkType]
+        for chunk_type in ChunkType:
+            assert chunk_types[chunk_type.value] == sum(1 for c in result.chunks if c.chunk_type == chunk_type)
+        
+        empty = self.chunker.create_hierarchical_chunks(
+            NavigationStructure(
+                document_id="empty",
+                document_format=DocumentFormat.TEXT,
+                root_node=structure.root_node,
+                nodes={structure.root_node.node_id: structure.root_node}
+            ),
+            "",
+            document_type="guidelines"
+        )
+        assert empty.chunking_metadata['chunk_types'] == {chunk_type.value: 0 for chunk_type in ChunkType}
+
     def test_chunk_type_determination(self):
         """Test chunk type determination based on content and node characteristics"""
         # Test decision chunk detection
@@ -198,6 +225,26 @@ class TestSemanticChunker:
         assert len(content_chunks) > 0
         assert content_chunks[0].chunk_type == ChunkType.CONTENT
 
+    def test_chunk_type_language_priority(self):
+        """Test decision language outranks matrix and reference language wherever it appears"""
+        node = NavigationNode(
+            node_id="plain",
+            title="Reserves",
+            level=NavigationLevel.SUBSECTION,
+            content=""
+        )
+        filler = " Reserves are verified from bank statements." * 4
+        
+        def chunk_type(content, document_type="guidelines"):
+            return self.chunker._determine_chunk_type(node, content, document_type)
+        
+        assert chunk_type("| 620 | 80% |" + filler + " Borrowers SHALL qualify.") == ChunkType.DECISION
+        assert chunk_type("| 620 | Refer |") == ChunkType.DECISION
+        assert chunk_type("See Section 4." + filler + " | 620 | 80% |") == ChunkType.MATRIX
+        assert chunk_type("See Section 4." + filler, "matrix") == ChunkType.MATRIX
+        assert chunk_type("See Section 4." + filler) == ChunkType.REFERENCE
+        assert chunk_type(filler) == ChunkType.CONTENT
+
     def test_hierarchical_context_addition(self):
         """Test adding hierarchical context to chunks"""
         node = self.mock_navigation_structure.nodes["income_requirements"]
@@ -249,6 +296,34 @@ class TestSemanticChunker:
         paragraph_chunks = self.chunker._split_by_paragraphs(paragraph_content)
         assert len(paragraph_chunks) >= 1
 
+    def test_decision_splitting_on_mixed_keywords(self):
+        """Test decision content splits before every decision keyword, in order"""
+        content = "Overview of rules. If FICO >= 620 approve. When DTI > 43% refer. Unless reserves exist decline."
+        
+        parts = self.chunker._split_decision_content(content)
+        
+        assert parts == [
+            "Overview of rules.",
+            "If FICO >= 620 approve.",
+            "When DTI > 43% refer.",
+            "Unless reserves exist decline."
+        ]
+
+    def test_matrix_splitting_by_rows_and_size(self):
+        """Test matrix content splits at completed rows and at the target size"""
+        chunker = SemanticChunker(target_chunk_size=12)
+        
+        assert chunker._split_matrix_content("a | b |\nc | d |") == ["a | b |", "c | d |"]
+        assert chunker._split_matrix_content("abcde\nfghijk\nl") == ["abcde\nfghijk", "l"]
+        assert chunker._split_matrix_content("abcde\nfghij\nk") == ["abcde\nfghij\nk"]
+
+    def test_pack_ranges(self):
+        """Test greedy packing of piece sizes into bounded groups"""
+        assert _pack_ranges([], 10) == []
+        assert _pack_ranges([4, 4, 4], 10) == [(0, 2), (2, 3)]
+        assert _pack_ranges([15, 3, 3], 10) == [(0, 1), (1, 3)]
+        assert _pack_ranges([5, 5], 10) == [(0, 2)]
+
     def test_chunk_size_management(self):
         """Test chunk size adjustment and management"""
         # Test with oversized content
@@ -272,28 +347,44 @@ class TestSemanticChunker:
         """Test creation of chunk relationships"""
         node = self.mock_navigation_structure.nodes["borrower_eligibility"]
         
-        chunks = self.chunker._create_node_chunks(
-            node,
-            node.content,
-            self.mock_navigation_structure,
-            "guidelines"
-        )
-        
-        relationships = self.chunker._create_node_relationships(
-            chunks,
-            node,
-            self.mock_navigation_structure
-        )
+        result = self.chunker.create_hierarchical_chunks(self.mock_navigation_structure, "", "guidelines")
+        chunks = [c for c in result.chunks if c.node_id == node.node_id]
+        relationships = result.chunk_relationships
         
         # Should have sequential relationships between chunks if multiple
         if len(chunks) > 1:
-            sequential_rels = [r for r in relationships if r['relationship_type'] == 'SEQUENTIAL']
+            sequential_rels = [r for r in relationships if r['relationship_type'] == 'SEQUENTIAL'
+                               and r['metadata']['source_node'] == node.node_id]
             assert len(sequential_rels) == len(chunks) - 1
         
         # Should have parent-child relationships to child nodes
-        parent_child_rels = [r for r in relationships if r['relationship_type'] == 'PARENT_CHILD']
+        parent_child_rels = [r for r in relationships if r['relationship_type'] == 'PARENT_CHILD'
+                             and r['metadata']['parent_node'] == node.node_id]
         assert len(parent_child_rels) == len(node.children)
 
+    def test_streamed_relationships_match_node_relationships(self):
+        """Test relationships built while streaming link each node's chunks and children"""
+        chunker = SemanticChunker(min_chunk_size=20, max_chunk_size=120, target_chunk_size=60)
+        structure = self.mock_navigation_structure
+        
+        result = chunker.create_hierarchical_chunks(structure, "", document_type="guidelines")
+        
+        expected = []
+        for node_id, node in structure.nodes.items():
+            if node_id != structure.root_node.node_id:
+                node_chunks = chunker._create_node_chunks(node, node.content, structure, "guidelines")
+                expected.extend(
+                    chunker._sequential_relationship(first.chunk_id, second.chunk_id, node, i)
+                    for i, (first, second) in enumerate(zip(node_chunks, node_chunks[1:]))
+                )
+                expected.extend(chunker._create_parent_child_relationships(
+                    node_chunks[0].chunk_id if node_chunks else None, node, structure
+                ))
+        
+        within_node = [r for r in result.chunk_relationships if r['relationship_type'] != 'REFERENCES']
+        assert within_node == expected
+        assert any(r['relationship_type'] == 'SEQUENTIAL' for r in within_node)
+
     def test_cross_chunk_relationships(self):
         """Test creation of cross-chunk relationships"""
         # Create chunks from different nodes
@@ -315,6 +406,94 @@ class TestSemanticChunker:
         decision_refs = [r for r in cross_relationships if r['relationship_type'] == 'REFERENCES']
         assert len(decision_refs) >= 0  # May or may not find references depending on content
 
+    def test_cross_chunk_references_by_section_and_title(self):
+        """Test decision chunks reference chunks whose section number or parent title they mention"""
+        def make_chunk(chunk_id, content, chunk_type=ChunkType.CONTENT, **context):
+            return SemanticChunk(chunk_id=chunk_id, content=content, chunk_type=chunk_type,
+                                 context=ChunkContext(navigation_path=[], **context))
+        
+        chunks = [
+            make_chunk("income", "Income rules", section_number="2.1"),
+            make_chunk("decision", "If income fails per 2.1, review Credit Requirements.",
+                       ChunkType.DECISION, section_number="5"),
+            make_chunk("credit", "Credit rules", parent_section="Credit Requirements"),
+            make_chunk("assets", "Asset rules", section_number="3.4"),
+            make_chunk("reserves", "Reserve rules", parent_section="Reserves")
+        ]
+        expected = [("decision", "income"), ("decision", "credit")]
+        
+        relationships = self.chunker._create_cross_chunk_relationships(chunks)
+        assert [(r['from_chunk'], r['to_chunk']) for r in relationships] == expected
+        
+        # Same references with plain substring checks instead of pyahocorasick
+        import src.semantic_chunker as semantic_chunker
+        with patch.object(semantic_chunker, 'ahocorasick', None):
+            relationships = self.chunker._create_cross_chunk_relationships(chunks)
+        assert [(r['from_chunk'], r['to_chunk']) for r in relationships] == expected
+
+    def test_chunks_are_related(self):
+        """Test chunk relatedness by section number or title, cached by the compared text"""
+        def make_chunk(content, section_number=None, parent_section=None):
+            context = ChunkContext(navigation_path=[], section_number=section_number, parent_section=parent_section)
+            return SemanticChunk(chunk_id="c1", content=content, chunk_type=ChunkType.DECISION, context=context)
+        
+        by_number = make_chunk("Credit", section_number="2.2")
+        by_title = make_chunk("Credit", parent_section="Credit Requirements")
+        
+        assert self.chunker._chunks_are_related(make_chunk("See 2.2 for limits."), by_number)
+        assert self.chunker._chunks_are_related(make_chunk("per CREDIT REQUIREMENTS"), by_title)
+        assert not self.chunker._chunks_are_related(make_chunk("per CREDIT REQUIREMENTS"), by_number)
+        assert not self.chunker._chunks_are_related(make_chunk("No references."), make_chunk("Credit"))
+        
+        # Same chunk ID with different content must not reuse the cached answer
+        assert not self.chunker._chunks_are_related(make_chunk("See 3.1 for limits."), by_number)
+
+    def test_overlaps_limited_to_same_node(self):
+        """Test overlap information links only chunks of the same node"""
+        chunks = [
+            SemanticChunk(chunk_id=chunk_id, content="Content", chunk_type=ChunkType.CONTENT,
+                          context=ChunkContext(navigation_path=[]), node_id=node_id)
+            for chunk_id, node_id in [("a_0", "income_requirements"), ("b_0", "credit_requirements"),
+                                      ("a_1", "income_requirements")]
+        ]
+        
+        processed = self.chunker._post_process_chunks(chunks, self.mock_navigation_structure)
+        overlaps = {chunk.chunk_id: chunk.overlap_with for chunk in processed}
+        
+        assert overlaps == {"a_0": ["a_1"], "a_1": ["a_0"], "b_0": []}
+        
+        index = self.chunker._build_node_index(chunks)
+        assert index == {"income_requirements": ["a_0", "a_1"], "credit_requirements": ["b_0"]}
+        
+        all_overlaps = self.chunker.compute_all_overlaps(chunks, index)
+        assert all_overlaps == overlaps
+        assert all_overlaps["a_0"] is not all_overlaps["a_1"]
+
+    def test_sort_chunks_by_navigation_order(self):
+        """Test chunks sort by node line number then chunk index, with unknown nodes last"""
+        def make_chunk(chunk_id, node_id, chunk_index):
+            return SemanticChunk(chunk_id=chunk_id, content="Content", chunk_type=ChunkType.CONTENT,
+                                 context=ChunkContext(navigation_path=[]), node_id=node_id,
+                                 metadata={'chunk_index': chunk_index})
+        
+        chunks = [
+            make_chunk("orphan", "missing_node", 0),
+            make_chunk("income_1", "income_requirements", 1),
+            make_chunk("no_node", None, 0),
+            make_chunk("eligibility_0", "borrower_eligibility", 0),
+            make_chunk("income_0", "income_requirements", 0)
+        ]
+        
+        ordered = self.chunker._sort_chunks_by_navigation_order(chunks, self.mock_navigation_structure)
+        
+        assert [chunk.chunk_id for chunk in ordered] == [
+            "eligibility_0", "income_0", "income_1", "orphan", "no_node"
+        ]
+        
+        # Already ordered input comes back in the same order, as a new list
+        reordered = self.chunker._sort_chunks_by_navigation_order(ordered, self.mock_navigation_structure)
+        assert reordered == ordered and reordered is not ordered
+
     def test_quality_metrics_calculation(self):
         """Test quality metrics calculation"""
         document_content = "Test document content"
@@ -338,6 +517,49 @@ class TestSemanticChunker:
         assert 0.0 <= metrics['coverage'] <= 1.0
         assert metrics['total_chunks'] == len(result.chunks)
 
+    def test_quality_metrics_size_statistics(self):
+        """Test size statistics, type distribution and coverage from known chunks"""
+        chunks = [
+            SemanticChunk(chunk_id=f"c{i}", content="x" * size, chunk_type=chunk_type,
+                          context=ChunkContext(navigation_path=[], quality_score=score), node_id=node_id)
+            for i, (size, chunk_type, score, node_id) in enumerate([
+                (2, ChunkType.CONTENT, 0.8, "income_requirements"),
+                (4, ChunkType.DECISION, 1.0, "income_requirements"),
+                (6, ChunkType.CONTENT, 0.9, None)
+            ])
+        ]
+        
+        metrics = self.chunker._calculate_quality_metrics(chunks, self.mock_navigation_structure)
+        
+        assert metrics['average_chunk_size'] == 4
+        assert metrics['size_variance'] == pytest.approx(8 / 3)
+        assert metrics['overall_quality'] == pytest.approx(0.9)
+        assert metrics['chunk_type_distribution'] == {'content': 2, 'decision': 1}
+        assert metrics['nodes_covered'] == 1
+
+    def test_content_mapping_by_line_number(self):
+        """Test nodes without content take the lines up to the next heading"""
+        document = "1. Overview\nIntro text\n2. Credit\nMinimum FICO 620\nMore detail\n3. Assets\nReserves"
+        nodes = {
+            "root": self.mock_navigation_structure.root_node,
+            "credit": NavigationNode(node_id="credit", title="Credit", level=NavigationLevel.SECTION,
+                                     metadata={'line_number': 3}),
+            "assets": NavigationNode(node_id="assets", title="Assets", level=NavigationLevel.SECTION,
+                                     metadata={'line_number': 6}),
+            "missing": NavigationNode(node_id="missing", title="Missing", level=NavigationLevel.SECTION,
+                                      metadata={'line_number': 40})
+        }
+        structure = NavigationStructure(
+            document_id="doc", document_format=DocumentFormat.TEXT,
+            root_node=self.mock_navigation_structure.root_node, nodes=nodes
+        )
+        
+        content_map = self.chunker._map_content_to_nodes(structure, document)
+        
+        assert content_map["credit"] == "2. Credit\nMinimum FICO 620\nMore detail"
+        assert content_map["assets"] == "3. Assets\nReserves"
+        assert content_map["missing"] == ""
+
     def test_navigation_path_building(self):
         """Test navigation path building for hierarchical context"""
         income_node = self.mock_navigation_structure.nodes["income_requirements"]
@@ -350,6 +572,48 @@ class TestSemanticChunker:
         expected_path = ["NAA Product Guidelines", "Borrower Eligibility", "Income Requirements"]
         assert path == expected_path
 
+    def test_navigation_paths_precomputed_for_all_nodes(self):
+        """Test precomputed navigation paths match per-node path building"""
+        structure = self.mock_navigation_structure
+        
+        paths = self.chunker._build_navigation_paths(structure)
+        
+        assert set(paths) == set(structure.nodes)
+        for node_id, node in structure.nodes.items():
+            assert list(paths[node_id]) == self.chunker._build_navigation_path(node, structure)
+        assert paths["income_requirements"] == ("NAA Product Guidelines", "Borrower Eligibility", "Income Requirements")
+    
+    def test_precomputed_navigation_paths_not_shared_between_chunks(self):
+        """Test chunks of one node get their own navigation path lists"""
+        structure = self.mock_navigation_structure
+        paths = self.chunker._build_navigation_paths(structure)
+        chunks = [
+            SemanticChunk(chunk_id=f"chunk_{index}", content="Income content", chunk_type=ChunkType.CONTENT,
+                          context=ChunkContext(navigation_path=[]), node_id="income_requirements")
+            for index in range(2)
+        ]
+        
+        first, second = (self.chunker.add_hierarchical_context(chunk, structure, paths) for chunk in chunks)
+        first.context.navigation_path.append("Changed")
+        
+        assert second.context.navigation_path == ["NAA Product Guidelines", "Borrower Eligibility", "Income Requirements"]
+        assert paths["income_requirements"][-1] == "Income Requirements"
+
+    def test_navigation_path_titles_are_shared(self):
+        """Test equal titles from different nodes end up as one string object"""
+        root = self.mock_navigation_structure.root_node
+        nodes = {"naa_root": root}
+        for node_id in ("first", "second"):
+            nodes[node_id] = NavigationNode(node_id=node_id, title="".join(["Credit ", "Requirements"]),
+                                            level=NavigationLevel.SECTION, parent_id="naa_root")
+        structure = NavigationStructure(document_id="doc", document_format=DocumentFormat.TEXT,
+                                        root_node=root, nodes=nodes)
+        assert nodes["first"].title is not nodes["second"].title
+        
+        paths = self.chunker._build_navigation_paths(structure)
+        
+        assert paths["first"][-1] is paths["second"][-1]
+
     def test_chunk_quality_scoring(self):
         """Test individual chunk quality scoring"""
         node = self.mock_navigation_structure.nodes["income_requirements"]
@@ -367,6 +631,18 @@ class TestSemanticChunker:
         assert 0.0 <= quality_score <= 1.0
         assert quality_score > 0.8  # Should be high quality
 
+    def test_decision_chunk_outcome_bonus(self):
+        """Test decision chunks mentioning an outcome score higher, in any case"""
+        node = self.mock_navigation_structure.nodes["decision_matrix"]
+        
+        def score(content):
+            chunk = SemanticChunk(chunk_id="d", content=content, chunk_type=ChunkType.DECISION,
+                                  context=ChunkContext(navigation_path=[]))
+            return self.chunker._calculate_chunk_quality(chunk, node)
+        
+        assert score("If FICO is low, DECLINE") == pytest.approx(score("If FICO is low, stop") + 0.05)
+        assert score("Send for Referral") == pytest.approx(score("Send for review") + 0.05)
+
     def test_utility_methods(self):
         """Test utility helper methods"""
         # Test content cleaning
@@ -393,6 +669,71 @@ class TestSemanticChunker:
         matrix_text = "The following matrix shows qualification criteria."
         assert self.chunker._contains_matrix_language(matrix_text)
 
+    def test_clean_content_normalizes_all_whitespace(self):
+        """Test cleaning collapses tabs, newlines and unicode spaces to single spaces"""
+        assert self.chunker._clean_content("\t A\u00a0\u00a0b \r\n\n c  ") == "A b c"
+        assert self.chunker._clean_content("Already clean.") == "Already clean."
+        assert self.chunker._clean_content(" \n ") == ""
+
+    def test_classify_language_matches_individual_checks(self):
+        """Test the single-scan classifier agrees with each language check"""
+        samples = [
+            "Refer to the matrix below.",
+            "| 620 | 80% |\nSee Section 4 for reserves.",
+            "Borrowers SHALL provide statements.",
+            "As defined in the glossary.",
+            "Plain text about loans.",
+            ""
+        ]
+        
+        for content in samples:
+            assert self.chunker._classify_language(content) == {
+                'decision': self.chunker._contains_decision_language(content),
+                'matrix': self.chunker._contains_matrix_language(content),
+                'reference': self.chunker._contains_reference_language(content)
+            }
+        
+        assert self.chunker._classify_language("Refer to section 4.") == {
+            'decision': True, 'matrix': False, 'reference': True
+        }
+        
+        # The regex fallback agrees with the hyperscan database, when installed
+        import src.semantic_chunker as semantic_chunker
+        node = self.mock_navigation_structure.nodes["borrower_eligibility"]
+        with_database = [(self.chunker._classify_language(content),
+                          self.chunker._determine_chunk_type(node, content, "guidelines")) for content in samples]
+        with patch.object(semantic_chunker, '_LANGUAGE_DATABASE', None):
+            without_database = [(self.chunker._classify_language(content),
+                                 self.chunker._determine_chunk_type(node, content, "guidelines")) for content in samples]
+        assert with_database == without_database
+
+    def test_matrix_row_completion(self):
+        """Test matrix rows complete on a trailing outcome or separator, ignoring case and whitespace"""
+        assert self.chunker._is_matrix_row_complete("| 620 | 80% | APPROVE  \n")
+        assert self.chunker._is_matrix_row_complete("700 / 90% / Refer")
+        assert self.chunker._is_matrix_row_complete("| 620 | 80% |\t")
+        assert not self.chunker._is_matrix_row_complete("Refer to section 4 for limits")
+        assert not self.chunker._is_matrix_row_complete("")
+
+    def test_language_detection_alternatives(self):
+        """Test each alternative of the combined language patterns is detected"""
+        assert self.chunker._contains_decision_language("Borrowers SHALL provide statements.")
+        assert self.chunker._contains_decision_language("Provided that reserves are verified.")
+        
+        assert self.chunker._contains_matrix_language("| 620 | 80% |")
+        assert self.chunker._contains_matrix_language("Header\n  +---+---+")
+        assert not self.chunker._contains_matrix_language("Plain text about loans.")
+        assert not self.chunker._contains_matrix_language("Borrowers with one | pipe.")
+        assert self.chunker._contains_matrix_language("See the ROW below.")
+        assert self.chunker._contains_matrix_language("Eligibility Matrix é")
+        assert self.chunker._contains_matrix_language("Notes\n \t-+-+-")
+        assert not self.chunker._contains_matrix_language("Notes\r---")
+        assert self.chunker._classify_language("Header\n  +---+---+")['matrix']
+        
+        assert self.chunker._contains_reference_language("See Section 4 for details.")
+        assert self.chunker._contains_reference_language("As defined in the glossary.")
+        assert not self.chunker._contains_reference_language("Reserves are required.")
+
     def test_chunk_serialization(self):
         """Test chunk and result serialization to dictionary"""
         document_content = "Test content for serialization"
@@ -418,6 +759,66 @@ class TestSemanticChunker:
             assert 'chunk_type' in chunk_dict
             assert 'context' in chunk_dict
 
+    def test_chunk_content_lower_cached(self):
+        """Test lowercased chunk content is computed once and refreshed when content changes"""
+        chunk = SemanticChunk(chunk_id="c1", content="Credit RULES", chunk_type=ChunkType.CONTENT,
+                              context=ChunkContext(navigation_path=[]))
+        
+        assert chunk.content_lower == "credit rules"
+        assert chunk.content_lower is chunk.content_lower
+        
+        chunk.content = "Income RULES"
+        assert chunk.content_lower == "income rules"
+        assert 'content_lower' not in chunk.to_dict()
+    
+    def test_chunk_dataclasses_use_slots(self):
+        """Test chunk dataclasses carry no per-instance __dict__"""
+        context = ChunkContext(navigation_path=[])
+        chunk = SemanticChunk(chunk_id="c1", content="Content", chunk_type=ChunkType.CONTENT, context=context)
+        result = ChunkingResult(chunks=[chunk], chunk_relationships=[], chunking_metadata={}, quality_metrics={})
+        
+        for instance in (context, chunk, result):
+            assert not hasattr(instance, "__dict__")
+
+    def test_chunk_to_dict_matches_fields(self):
+        """Test chunk serialization covers every field and copies mutable values"""
+        from dataclasses import asdict
+        
+        context = ChunkContext(navigation_path=["Root", "Credit"], section_number="2.2", quality_score=0.9)
+        chunk = SemanticChunk(chunk_id="c1", content="Credit rules", chunk_type=ChunkType.DECISION,
+                              context=context, node_id="credit", overlap_with=["c2"], metadata={'chunk_index': 0})
+        
+        chunk_dict = chunk.to_dict()
+        expected = asdict(chunk)
+        expected['chunk_type'] = 'decision'
+        del expected['_content_lower']
+        
+        assert chunk_dict == expected
+        assert list(chunk_dict) == list(expected)
+        
+        chunk_dict['context']['navigation_path'].append("Changed")
+        chunk_dict['metadata']['chunk_index'] = 5
+        assert context.navigation_path == ["Root", "Credit"]
+        assert chunk.metadata == {'chunk_index': 0}
+
+    def test_chunking_result_to_bytes(self):
+        """Test byte serialization matches the JSON encoding of to_dict, with and without orjson"""
+        import json
+        import src.semantic_chunker as semantic_chunker
+        
+        context = ChunkContext(navigation_path=["Root", "Credit"], section_number="2.2")
+        chunk = SemanticChunk(chunk_id="c1", content="Crédit rules", chunk_type=ChunkType.DECISION,
+                              context=context, node_id="credit", metadata={'chunk_index': 0})
+        result = ChunkingResult(chunks=[chunk],
+                                chunk_relationships=[{'type': 'SEQUENTIAL', 'strength': 0.8}],
+                                chunking_metadata={'total_chunks': 1},
+                                quality_metrics={'average_quality': 0.5})
+        expected = json.loads(json.dumps(result.to_dict()))
+        
+        assert json.loads(result.to_bytes()) == expected
+        with patch.object(semantic_chunker, 'orjson', None):
+            assert json.loads(result.to_bytes()) == expected
+
     def test_error_handling(self):
         """Test error handling and edge cases"""
         # Test with invalid navigation structure